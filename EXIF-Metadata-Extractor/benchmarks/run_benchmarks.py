@@ -0,0 +1,365 @@
+"""
+Benchmark suite over a deterministic synthetic corpus.
+
+Each benchmark runs in a fresh interpreter so peak RSS is measured
+per benchmark. Results can be saved as a named baseline and later
+runs compared against it.
+
+Usage:
+  python benchmarks/run_benchmarks.py [--count N] [--seed S] [--max-mp M]
+                                      [--only NAME,...] [--save NAME] [--compare NAME]
+                                      [--tolerance 0.2]
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(HERE, "..", "src")
+CORPUS_ROOT = os.path.join(HERE, "corpus")
+BASELINE_DIR = os.path.join(HERE, "baselines")
+
+sys.path.insert(0, SRC)
+
+# Repeat cheap in-memory benchmarks until at least this many calls
+MIN_CALLS = 100_000
+# Repeat file benchmarks until they have run at least this long
+MIN_SECONDS = 1.0
+
+
+def _peak_rss_mb():
+    """
+    Peak RSS of this process and its (pool) children, in MB.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # Linux reports KB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _corpus_files(corpus):
+    with open(os.path.join(corpus, "manifest.json"), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    return [
+        (os.path.join(corpus, item["file"]), item["bytes"])
+        for item in manifest["files"]
+    ]
+
+
+def _warm(files):
+    # Read everything once so timings measure parsing, not cold disk
+    for path, _ in files:
+        with open(path, "rb") as f:
+            while f.read(1 << 20):
+                pass
+
+
+def _repeat(run_pass):
+    """
+    Run run_pass() until MIN_SECONDS have elapsed → (passes, seconds).
+    """
+    passes = 0
+    start = time.perf_counter()
+    while True:
+        run_pass()
+        passes += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_SECONDS:
+            return passes, elapsed
+
+
+def _gps_records(files):
+    from extractor import extract_exif, GPS_FIELDS
+    from gps_utils import extract_gps
+
+    records = []
+    for path, _ in files:
+        gps = extract_gps(extract_exif(path, fields=GPS_FIELDS))
+        if gps:
+            records.append(gps)
+    return records
+
+
+# -------------------------------------------------
+# BENCHMARKS
+# Each returns (items processed, bytes processed, seconds)
+# -------------------------------------------------
+def bench_extract_exif(files):
+    from extractor import extract_exif
+
+    def run_pass():
+        for path, _ in files:
+            extract_exif(path, skip_blobs=True)
+
+    _warm(files)
+    passes, elapsed = _repeat(run_pass)
+    return passes * len(files), passes * sum(size for _, size in files), elapsed
+
+
+def bench_get_lat_long(files):
+    from gps_utils import get_lat_long
+
+    records = _gps_records(files)
+    if not records:
+        return 0, 0, 0.0
+    rounds = max(1, MIN_CALLS // len(records))
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for gps in records:
+            try:
+                get_lat_long(gps)
+            except (TypeError, ValueError, IndexError):
+                pass
+    elapsed = time.perf_counter() - start
+    return rounds * len(records), 0, elapsed
+
+
+def bench_get_lat_long_batch(files):
+    from gps_utils import get_lat_long_batch
+
+    records = _gps_records(files)
+    if not records:
+        return 0, 0, 0.0
+    rounds = max(1, MIN_CALLS // len(records))
+    batch = records * rounds
+
+    # numpy is imported on first use; keep that out of the timing
+    get_lat_long_batch(records)
+
+    passes, elapsed = _repeat(lambda: get_lat_long_batch(batch))
+    return passes * len(batch), 0, elapsed
+
+
+def bench_risk_score(files):
+    from extractor import extract_exif, RISK_FIELDS
+    from privacy_risk import DEFAULT_ENGINE
+
+    exifs = [extract_exif(path, fields=RISK_FIELDS) for path, _ in files]
+    rounds = max(1, MIN_CALLS // max(len(exifs), 1))
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for exif in exifs:
+            DEFAULT_ENGINE.score(exif)
+    elapsed = time.perf_counter() - start
+    return rounds * len(exifs), 0, elapsed
+
+
+def bench_risk_score_batch(files):
+    from extractor import extract_exif, RISK_FIELDS
+    from privacy_risk import DEFAULT_ENGINE
+
+    exifs = [extract_exif(path, fields=RISK_FIELDS) for path, _ in files]
+    rounds = max(1, MIN_CALLS // max(len(exifs), 1))
+    batch = exifs * rounds
+
+    start = time.perf_counter()
+    DEFAULT_ENGINE.score_batch(batch, [False] * len(batch))
+    elapsed = time.perf_counter() - start
+    return len(batch), 0, elapsed
+
+
+def bench_bulk_folder(files):
+    from bulk_engine import run_bulk
+    from scanner import scan_images
+    from create_gps_image import CORPUS_EXTENSIONS
+
+    corpus = os.path.dirname(files[0][0])
+    _warm(files)
+
+    start = time.perf_counter()
+    count = 0
+    for _ in run_bulk(scan_images(corpus, extensions=CORPUS_EXTENSIONS), ordered=False):
+        count += 1
+    elapsed = time.perf_counter() - start
+    return count, sum(size for _, size in files), elapsed
+
+
+def bench_strip(files):
+    from exif_strip import strip_metadata
+
+    jpegs = [(path, size) for path, size in files if path.endswith(".jpg")]
+    _warm(jpegs)
+    if not jpegs:
+        return 0, 0, 0.0
+    out_dir = tempfile.mkdtemp(prefix="exif-bench-")
+
+    def run_pass():
+        for i, (path, _) in enumerate(jpegs):
+            strip_metadata(path, os.path.join(out_dir, f"{i}.jpg"))
+
+    try:
+        passes, elapsed = _repeat(run_pass)
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+    return passes * len(jpegs), passes * sum(size for _, size in jpegs), elapsed
+
+
+BENCHMARKS = {
+    "extract_exif": bench_extract_exif,
+    "get_lat_long": bench_get_lat_long,
+    "get_lat_long_batch": bench_get_lat_long_batch,
+    "risk_score": bench_risk_score,
+    "risk_score_batch": bench_risk_score_batch,
+    "bulk_folder": bench_bulk_folder,
+    "strip": bench_strip,
+}
+
+# Batch benchmark → the per-item benchmark it is compared with
+BATCH_OF = {
+    "get_lat_long_batch": "get_lat_long",
+    "risk_score_batch": "risk_score",
+}
+# Speedup over the scalar loop below which a batch path is flagged.
+# Report only: single runs on a busy machine vary by more than 10%
+BATCH_MIN_SPEEDUP = 1.2
+
+
+# -------------------------------------------------
+# DRIVER
+# -------------------------------------------------
+def ensure_corpus(count, seed, max_mp):
+    corpus = os.path.join(CORPUS_ROOT, f"seed{seed}_n{count}_mp{max_mp:g}")
+    if not os.path.exists(os.path.join(corpus, "manifest.json")):
+        print(f"Generating corpus → {corpus}", file=sys.stderr)
+        # Separate process: Linux keeps peak RSS across fork/exec, so
+        # generating here would inflate every benchmark's figure
+        subprocess.run(
+            [sys.executable, os.path.join(SRC, "create_gps_image.py"),
+             corpus, str(count), str(seed), "jpeg,png,heic,tiff", f"{max_mp:g}"],
+            check=True, stdout=subprocess.DEVNULL
+        )
+    return corpus
+
+
+def run_one(name, corpus):
+    """
+    Child mode: run a single benchmark, print its result as JSON.
+    """
+    items, nbytes, seconds = BENCHMARKS[name](_corpus_files(corpus))
+    seconds = max(seconds, 1e-9)
+    print(json.dumps({
+        "items": items,
+        "seconds": round(seconds, 4),
+        "items_per_sec": round(items / seconds, 1),
+        "mb_per_sec": round(nbytes / seconds / 1e6, 2) if nbytes else None,
+        "peak_rss_mb": _peak_rss_mb(),
+    }))
+
+
+def run_all(names, corpus):
+    results = {}
+    for name in names:
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", name, "--corpus", corpus],
+            capture_output=True, text=True, check=True
+        )
+        results[name] = json.loads(out.stdout.strip().splitlines()[-1])
+    return results
+
+
+def print_results(results, baseline=None):
+    print(f"{'benchmark':<20} {'items/s':>12} {'MB/s':>9} {'peak RSS':>10} {'vs base':>9}")
+    for name, r in results.items():
+        mb = f"{r['mb_per_sec']:.1f}" if r["mb_per_sec"] is not None else "-"
+        rss = f"{r['peak_rss_mb']:.0f} MB" if r["peak_rss_mb"] is not None else "-"
+        delta = ""
+        if baseline and name in baseline and baseline[name]["items_per_sec"]:
+            change = r["items_per_sec"] / baseline[name]["items_per_sec"] - 1
+            delta = f"{change:+.0%}"
+        print(f"{name:<20} {r['items_per_sec']:>12,.0f} {mb:>9} {rss:>10} {delta:>9}")
+
+
+def batch_speedups(results):
+    """
+    {batch benchmark: items/s relative to its scalar loop}.
+    """
+    return {
+        batch: results[batch]["items_per_sec"] / results[scalar]["items_per_sec"]
+        for batch, scalar in BATCH_OF.items()
+        if batch in results and scalar in results and results[scalar]["items_per_sec"]
+    }
+
+
+def regressions(results, baseline, tolerance):
+    return [
+        name for name, r in results.items()
+        if name in baseline
+        and r["items_per_sec"] < baseline[name]["items_per_sec"] * (1 - tolerance)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXIF extractor benchmark suite")
+    parser.add_argument("--count", type=int, default=200, help="corpus size")
+    parser.add_argument("--seed", type=int, default=0, help="corpus seed")
+    parser.add_argument("--max-mp", type=float, default=12, help="largest image size (MP)")
+    parser.add_argument("--only", help="comma-separated benchmark names")
+    parser.add_argument("--save", metavar="NAME", help="save results as baseline NAME")
+    parser.add_argument("--compare", metavar="NAME", help="compare against baseline NAME")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed slowdown vs baseline before failing (default 0.2)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--corpus", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_one(args.child, args.corpus)
+        return 0
+
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        print(f"Unknown benchmark(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    corpus = ensure_corpus(args.count, args.seed, args.max_mp)
+    results = run_all(names, corpus)
+
+    baseline = None
+    if args.compare:
+        with open(os.path.join(BASELINE_DIR, f"{args.compare}.json"), "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    print_results(results, baseline)
+
+    if args.save:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        path = os.path.join(BASELINE_DIR, f"{args.save}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "corpus": {"count": args.count, "seed": args.seed, "max_mp": args.max_mp},
+                "python": sys.version.split()[0],
+                "results": results,
+            }, f, indent=4)
+        print(f"Baseline saved → {path}")
+
+    for name, speedup in batch_speedups(results).items():
+        if speedup < BATCH_MIN_SPEEDUP:
+            print(f"Note: {name} is only {speedup:.2f}x its scalar loop "
+                  f"(target {BATCH_MIN_SPEEDUP:.1f}x)")
+
+    if baseline:
+        slower = regressions(results, baseline, args.tolerance)
+        if slower:
+            print(f"Regressed more than {args.tolerance:.0%}: {', '.join(slower)}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
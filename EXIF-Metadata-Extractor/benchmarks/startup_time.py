@@ -0,0 +1,81 @@
+"""
+Startup-time guard.
+
+Imports each headless module in a fresh interpreter with
+`python -X importtime`, compares the median cumulative import time
+against a budget, and checks that heavy optional libraries are not
+pulled in. Exits 1 on any regression.
+
+Usage: python benchmarks/startup_time.py [--runs N] [--scale X]
+  --scale multiplies every budget (slow CI machines)
+"""
+import os
+import subprocess
+import sys
+from statistics import median
+
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+# module → import budget in milliseconds
+BUDGETS_MS = {
+    "extractor": 60,
+    "bulk_engine": 150,
+    "bulk_cleaner": 150,
+    "incremental": 200,
+}
+
+# Must only load on demand (first HEIC file / first PDF export / preview)
+HEAVY_MODULES = ("pillow_heif", "PIL", "numpy", "pyarrow")
+
+
+def import_time_ms(module):
+    """
+    Cumulative import time of module in a fresh interpreter.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC, capture_output=True, text=True, check=True
+    )
+    for line in reversed(result.stderr.splitlines()):
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1000.0
+    raise RuntimeError(f"No importtime entry for {module}")
+
+
+def heavy_imports(module):
+    code = (
+        f"import sys, {module}; "
+        f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=SRC, capture_output=True, text=True, check=True
+    )
+    return result.stdout.split()
+
+
+def main(runs=5, scale=1.0):
+    failed = False
+
+    for module, budget in BUDGETS_MS.items():
+        budget *= scale
+        ms = median(import_time_ms(module) for _ in range(runs))
+        heavy = heavy_imports(module)
+
+        ok = ms <= budget and not heavy
+        failed |= not ok
+
+        status = "OK  " if ok else "FAIL"
+        extra = f"  loads {', '.join(heavy)}" if heavy else ""
+        print(f"{status} {module:<14} {ms:8.1f} ms  (budget {budget:.0f} ms){extra}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    runs = int(args[args.index("--runs") + 1]) if "--runs" in args else 5
+    scale = float(args[args.index("--scale") + 1]) if "--scale" in args else 1.0
+    sys.exit(main(runs, scale))
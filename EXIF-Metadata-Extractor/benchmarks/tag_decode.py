@@ -0,0 +1,109 @@
+"""
+Per-tag decode micro-benchmark.
+
+Times the tag name lookup + value normalization step of extraction
+over deterministic random EXIF blocks (see create_gps_image.random_exif):
+
+  before: piexif.TAGS[ifd][tag_id] lookup + the old shape-based
+          normalize_value from bulk_engine
+  after:  tag_table lookup (per-IFD view of TAG_TABLE) + the per-type normalizer
+
+Usage: python benchmarks/tag_decode.py [--blocks N] [--seed S]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC)
+
+import piexif  # noqa: E402
+
+from create_gps_image import random_exif  # noqa: E402
+from tag_table import IFD_TAGS, TYPE_UNDEFINED  # noqa: E402
+
+IFDS = ("0th", "Exif", "GPS", "1st")
+
+# Repeat until at least this long
+MIN_SECONDS = 1.0
+
+
+def old_normalize_value(val):
+    """
+    bulk_engine.normalize_value before the tag table.
+    """
+    if isinstance(val, bytes):
+        val = val.decode(errors="ignore")
+    if isinstance(val, tuple) and len(val) == 2 and val[1] != 0:
+        val = val[0] / val[1]
+    return val
+
+
+def decode_before(exif_dicts):
+    for exif_dict in exif_dicts:
+        out = {}
+        for ifd in IFDS:
+            for tag_id, value in exif_dict[ifd].items():
+                tag_info = piexif.TAGS[ifd][tag_id]
+                if tag_info["type"] == piexif.TYPES.Undefined and len(value) > 256:
+                    continue
+                out[tag_info["name"]] = old_normalize_value(value)
+
+
+def decode_after(exif_dicts):
+    for exif_dict in exif_dicts:
+        out = {}
+        for ifd in IFDS:
+            table = IFD_TAGS[ifd]
+            for tag_id, value in exif_dict[ifd].items():
+                name, tag_type, normalize = table[tag_id]
+                if tag_type == TYPE_UNDEFINED and len(value) > 256:
+                    continue
+                out[name] = normalize(value)
+
+
+def sample_blocks(count, seed):
+    """
+    Raw piexif dicts, round-tripped through dump/load like real files.
+    """
+    blocks = []
+    for i in range(count):
+        exif_dict, _ = random_exif(random.Random(f"{seed}:{i}"))
+        blocks.append(piexif.load(piexif.dump(exif_dict)))
+    return blocks
+
+
+def time_per_tag(func, blocks, tags):
+    passes = 0
+    start = time.perf_counter()
+    while True:
+        func(blocks)
+        passes += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_SECONDS:
+            return elapsed / (passes * tags) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-tag EXIF decode micro-benchmark")
+    parser.add_argument("--blocks", type=int, default=1000, help="EXIF blocks to decode")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    blocks = sample_blocks(args.blocks, args.seed)
+    tags = sum(len(block[ifd]) for block in blocks for ifd in IFDS)
+
+    before = time_per_tag(decode_before, blocks, tags)
+    after = time_per_tag(decode_after, blocks, tags)
+
+    print(f"{tags} tags in {len(blocks)} blocks")
+    print(f"before  {before:7.1f} ns/tag")
+    print(f"after   {after:7.1f} ns/tag  ({before / after:.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from extractor import extract_exif
+
+
+DEFAULT_CONCURRENCY = 64
+
+
+def _read(path, fields, ifds, skip_blobs):
+    """
+    Blocking part (runs on the read thread pool).
+    Opening first turns missing / unreadable files into errors instead
+    of an empty result.
+    """
+    with open(path, "rb"):
+        pass
+    return extract_exif(path, fields, ifds, skip_blobs)
+
+
+async def _extract_one(loop, executor, semaphore, path, timeout, options):
+    """
+    One bounded, timed read → {"path", "exif", "error"}.
+    """
+    await semaphore.acquire()
+    try:
+        future = loop.run_in_executor(executor, _read, path, *options)
+    except BaseException:
+        semaphore.release()
+        raise
+    # A read thread cannot be interrupted, so the slot is held until the
+    # thread actually returns, not until we stop waiting for it; otherwise
+    # hung reads would pile up in the pool and later files would spend
+    # their timeout queued behind them
+    future.add_done_callback(lambda _: semaphore.release())
+
+    try:
+        # shield: timing out / cancelling abandons the read, it does not
+        # pretend to stop it (and so release its slot early)
+        exif = await asyncio.wait_for(asyncio.shield(future), timeout)
+        return {"path": path, "exif": exif, "error": None}
+    except asyncio.TimeoutError:
+        return {"path": path, "exif": None, "error": f"Timed out after {timeout}s"}
+    except Exception as e:
+        return {"path": path, "exif": None, "error": str(e)}
+
+
+async def _iter_paths(paths):
+    if hasattr(paths, "__aiter__"):
+        async for path in paths:
+            yield path
+    else:
+        for path in paths:
+            yield path
+
+
+async def extract_many(paths, concurrency=DEFAULT_CONCURRENCY, timeout=None,
+                       fields=None, ifds=None, skip_blobs=False, executor=None):
+    """
+    Async EXIF extraction for high-latency storage (NFS / SMB):
+
+        async for record in extract_many(paths, concurrency=64, timeout=10):
+            ...
+
+    paths:       iterable or async iterable of file paths (consumed lazily)
+    concurrency: max reads in flight (semaphore + thread pool size)
+    timeout:     per-file seconds; expired reads yield an error record
+    fields / ifds / skip_blobs: passed through to extract_exif
+    executor:    reuse an existing thread pool instead of creating one
+                 (give it at least `concurrency` threads, or time spent
+                 queued in it counts toward the timeout)
+
+    Records ({"path", "exif", "error"}) are yielded as reads complete,
+    not in input order. Breaking out of the loop or cancelling the
+    consuming task cancels every read not yet started.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    options = (fields, ifds, skip_blobs)
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="exif-read"
+        )
+
+    pending = set()
+    source = _iter_paths(paths).__aiter__()
+    exhausted = False
+
+    try:
+        while pending or not exhausted:
+            # Keep at most `concurrency` reads queued behind the semaphore,
+            # so a huge path list is never materialized as tasks
+            while not exhausted and len(pending) < concurrency:
+                try:
+                    path = await source.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                pending.add(asyncio.ensure_future(
+                    _extract_one(loop, executor, semaphore, path, timeout, options)
+                ))
+
+            if not pending:
+                break
+
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        if own_executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def extract_all(paths, **options):
+    """
+    Convenience wrapper: {path: exif} for every readable file.
+    """
+    results = {}
+    async for record in extract_many(paths, **options):
+        if record["error"] is None:
+            results[record["path"]] = record["exif"]
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+    import json
+
+    if len(sys.argv) < 2:
+        print("Usage: python async_extract.py <image> [<image> ...]")
+        sys.exit(1)
+
+    async def main():
+        async for record in extract_many(sys.argv[1:], skip_blobs=True):
+            print(json.dumps(record, default=str))
+
+    asyncio.run(main())
@@ -0,0 +1,220 @@
+import os
+import time
+import shutil
+from functools import partial
+
+from exif_reader import IFD_NAMES, JPEG_SOI, load_exif
+from exif_strip import find_metadata_segments, strip_metadata
+from bulk_engine import DEFAULT_CHUNK_SIZE, run_chunked
+from scanner import scan_images
+
+
+# Only JPEG segments can be spliced out; other formats are copied
+# through unchanged if they carry no EXIF and skipped otherwise
+CLEANABLE_EXTENSIONS = (".jpg", ".jpeg")
+UNSUPPORTED_REASON = "Unsupported format (EXIF cannot be stripped)"
+
+
+# -------------------------------------------------
+# PER-FILE WORK (runs inside worker processes)
+# -------------------------------------------------
+def verify_clean(path, xmp=False, iptc=False):
+    """
+    True if path has no EXIF left, re-read with the EXIF reader rather
+    than the marker walker that did the stripping. XMP / IPTC, which
+    that reader ignores, are re-checked on the JPEG markers.
+    """
+    try:
+        exif_dict = load_exif(path)
+    except Exception:
+        # Corrupt EXIF is still EXIF
+        return False
+    # None: a format with no EXIF container (e.g. BMP)
+    if exif_dict is not None and (
+        exif_dict["thumbnail"] or any(exif_dict[ifd] for ifd in IFD_NAMES)
+    ):
+        return False
+
+    if xmp or iptc:
+        with open(path, "rb") as f:
+            if f.read(2) == JPEG_SOI:
+                return not find_metadata_segments(path, xmp, iptc)
+    return True
+
+
+def clean_one(src, dst, xmp=False, iptc=False):
+    """
+    Strip one image into dst (parent folders are created).
+    The output is written to a temporary name and only renamed into
+    place once the re-read confirms no EXIF is left. Formats that
+    cannot be stripped are copied as-is when they carry no EXIF and
+    skipped (nothing written, reason given) otherwise, so the output
+    tree never silently misses a file.
+
+    Returns {"path", "output", "status": cleaned|copied|skipped|failed,
+             "bytes_in", "bytes_out", "reason"}
+    """
+    record = {
+        "path": src,
+        "output": dst,
+        "status": "cleaned",
+        "bytes_in": 0,
+        "bytes_out": 0,
+        "reason": "",
+    }
+
+    tmp = dst + ".part"
+    try:
+        record["bytes_in"] = os.path.getsize(src)
+        os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+
+        if src.lower().endswith(CLEANABLE_EXTENSIONS):
+            strip_metadata(src, tmp, xmp, iptc)
+            if not verify_clean(tmp, xmp, iptc):
+                raise ValueError("Metadata still present after cleaning")
+        else:
+            if not verify_clean(src, xmp, iptc):
+                record["status"] = "skipped"
+                record["output"] = ""
+                record["reason"] = UNSUPPORTED_REASON
+                return record
+            shutil.copyfile(src, tmp)
+            record["status"] = "copied"
+
+        os.replace(tmp, dst)
+        record["bytes_out"] = os.path.getsize(dst)
+    except Exception as e:
+        record["status"] = "failed"
+        record["reason"] = str(e)
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    return record
+
+
+def clean_chunk(jobs, xmp=False, iptc=False):
+    """
+    Worker entry point: jobs is a list of (src, dst) pairs.
+    """
+    return [clean_one(src, dst, xmp, iptc) for src, dst in jobs]
+
+
+# -------------------------------------------------
+# ENGINE
+# -------------------------------------------------
+class CleanStats:
+    """
+    Running totals for a bulk clean; feed it every record.
+    """
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.cleaned = 0
+        self.copied = 0
+        self.skipped = 0
+        self.failed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def add(self, record):
+        status = record["status"]
+        if status == "failed":
+            self.failed += 1
+            return
+        if status == "skipped":
+            self.skipped += 1
+            return
+
+        if status == "cleaned":
+            self.cleaned += 1
+        else:
+            self.copied += 1
+        self.bytes_in += record["bytes_in"]
+        self.bytes_out += record["bytes_out"]
+
+    def summary(self):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return {
+            "cleaned": self.cleaned,
+            "copied": self.copied,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "bytes_saved": self.bytes_in - self.bytes_out,
+            "seconds": round(elapsed, 3),
+            "files_per_sec": round((self.cleaned + self.copied) / elapsed, 1),
+            "mb_per_sec": round(self.bytes_in / elapsed / 1e6, 2),
+        }
+
+
+def _jobs(src_root, dst_root, paths):
+    for path in paths:
+        rel = os.path.relpath(path, src_root)
+        yield path, os.path.join(dst_root, rel)
+
+
+def run_clean(src_root, dst_root, paths=None, workers=None,
+              chunk_size=DEFAULT_CHUNK_SIZE, xmp=False, iptc=False, **scan_options):
+    """
+    Mirror src_root into dst_root with metadata stripped, yielding one
+    record per image as chunks complete (see clean_one).
+
+    paths:        images to clean (default: scan_images(src_root, **scan_options))
+    workers:      process pool size (default: os.cpu_count())
+    xmp / iptc:   also strip XMP (APP1) / IPTC (APP13) segments
+
+    Originals are never modified; dst_root must lie outside src_root.
+    """
+    src_root = os.path.abspath(src_root)
+    dst_root = os.path.abspath(dst_root)
+
+    try:
+        nested = os.path.commonpath([src_root, dst_root]) == src_root
+    except ValueError:
+        # Different drives (Windows)
+        nested = False
+    if nested:
+        raise ValueError("Output folder must be outside the source folder")
+
+    if paths is None:
+        paths = scan_images(src_root, **scan_options)
+
+    return run_chunked(
+        partial(clean_chunk, xmp=xmp, iptc=iptc),
+        _jobs(src_root, dst_root, paths), workers, chunk_size,
+        ordered=False
+    )
+
+
+def clean_folder(src_root, dst_root, workers=None, xmp=False, iptc=False, **scan_options):
+    """
+    Headless bulk clean. Returns the summary dict from CleanStats.
+    """
+    stats = CleanStats()
+    records = run_clean(
+        src_root, dst_root, workers=workers, xmp=xmp, iptc=iptc, **scan_options
+    )
+    for record in records:
+        stats.add(record)
+        if record["status"] == "failed":
+            print(f"[ERROR] {record['path']}: {record['reason']}")
+        elif record["status"] == "skipped":
+            print(f"[SKIPPED] {record['path']}: {record['reason']}")
+    return stats.summary()
+
+
+if __name__ == "__main__":
+    import sys
+    import json
+
+    flags = {arg for arg in sys.argv[1:] if arg.startswith("--")}
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+
+    if len(args) != 2 or flags - {"--xmp", "--iptc"}:
+        print("Usage: python bulk_cleaner.py <source_folder> <output_folder> [--xmp] [--iptc]")
+        sys.exit(1)
+
+    summary = clean_folder(
+        args[0], args[1], xmp="--xmp" in flags, iptc="--iptc" in flags
+    )
+    print(json.dumps(summary, indent=4))
+    sys.exit(1 if summary["failed"] else 0)
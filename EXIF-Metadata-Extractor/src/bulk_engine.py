@@ -0,0 +1,236 @@
+import os
+import json
+from collections import deque
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import extractor
+import metrics
+from extractor import extract_exif
+from gps_utils import extract_gps, get_lat_long
+from privacy_risk import DEFAULT_ENGINE as RISK_ENGINE
+from records import ImageRecord
+from tag_table import normalize_metadata
+from metadata_cache import default_cache_path
+from report_writers import open_report_writer
+from scanner import IMAGE_EXTENSIONS, scan_images
+
+
+DEFAULT_CHUNK_SIZE = 32
+
+
+# -------------------------------------------------
+# PER-FILE WORK (runs inside worker processes)
+# -------------------------------------------------
+def _extract_one(path):
+    """
+    Extract EXIF + GPS for one image.
+    Returns (record, exif); exif is None for error records.
+    """
+    cache = extractor.get_cache()
+    hits_before = cache.hits if cache else 0
+
+    try:
+        exif = extract_exif(path, skip_blobs=True)
+    except Exception as e:
+        metrics.error(e)
+        return ImageRecord(path, error=str(e)), None
+
+    cached = cache is not None and cache.hits > hits_before
+
+    if not exif:
+        return ImageRecord(path, cached, error="No EXIF metadata found"), None
+
+    # ---- FULL EXIF ----
+    record = ImageRecord.from_metadata(
+        path, normalize_metadata(exif), cached
+    )
+
+    # ---- GPS ----
+    with metrics.stage("gps"):
+        gps = extract_gps(exif)
+        try:
+            record.lat, record.lon = get_lat_long(gps) if gps else (None, None)
+        except (TypeError, ValueError, IndexError) as e:
+            metrics.error(e)
+
+    return record, exif
+
+
+def process_chunk(paths):
+    """
+    Worker entry point: one task per chunk keeps IPC overhead low.
+    Privacy risk for the whole chunk is scored in one vectorized pass.
+    """
+    items = [metrics.track_file(path, _extract_one, path) for path in paths]
+
+    scored = [(record, exif) for record, exif in items if exif]
+    if scored:
+        with metrics.stage("risk"):
+            scores, levels = RISK_ENGINE.score_batch(
+                [exif for _, exif in scored],
+                [record.lat is not None and record.lon is not None for record, _ in scored]
+            )
+        for (record, _), score, level in zip(scored, scores, levels):
+            record.set_risk(score, level)
+
+    return [record for record, _ in items]
+
+
+def process_image(path):
+    """
+    Extract EXIF + GPS + privacy risk for one image.
+    Returns a picklable ImageRecord (see records.py).
+    """
+    return process_chunk([path])[0]
+
+
+def _init_worker(cache_path):
+    if cache_path and extractor.get_cache() is None:
+        extractor.enable_cache(cache_path)
+
+
+# -------------------------------------------------
+# ENGINE
+# -------------------------------------------------
+def report_key(folder, path):
+    """
+    Report entry name: path relative to the scanned folder.
+    """
+    return os.path.relpath(path, folder).replace(os.sep, "/")
+
+
+def _chunks(paths, size):
+    chunk = []
+    for path in paths:
+        chunk.append(path)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_chunked(func, items, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, ordered=True,
+                initializer=None, initargs=()):
+    """
+    Run func(chunk) → list over chunks of items in a process pool and
+    yield the individual results.
+
+    items:       any iterable (consumed lazily)
+    workers:     pool size (default: os.cpu_count()); 1 runs in-process
+    chunk_size:  items per submitted task
+    ordered:     yield in input order, otherwise as chunks complete
+    initializer: called once per worker process with initargs
+
+    At most 2 × workers chunks are in flight, so memory stays bounded
+    even for very large inputs. When metrics are enabled, each worker's
+    timings are sent back with its chunk and merged here.
+    """
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        if initializer:
+            initializer(*initargs)
+        for chunk in _chunks(items, chunk_size):
+            yield from func(chunk)
+        return
+
+    max_pending = workers * 2
+    chunks = _chunks(items, chunk_size)
+
+    collector = metrics.get_metrics()
+    if collector is not None:
+        func = partial(metrics.collect, func)
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=initializer,
+        initargs=initargs
+    ) as pool:
+        pending = deque()
+
+        def submit_next():
+            chunk = next(chunks, None)
+            if chunk is None:
+                return False
+            pending.append(pool.submit(func, chunk))
+            return True
+
+        while len(pending) < max_pending and submit_next():
+            pass
+
+        try:
+            while pending:
+                if ordered:
+                    future = pending.popleft()
+                    done = [future]
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pending.remove(future)
+
+                for future in done:
+                    results = future.result()
+                    if collector is not None:
+                        results, snapshot = results
+                        collector.merge(snapshot)
+                    for result in results:
+                        yield result
+                    submit_next()
+        finally:
+            # Consumer stopped early (cancel): drop chunks not yet started
+            for future in pending:
+                future.cancel()
+
+
+def run_bulk(paths, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, ordered=True,
+             cache_path=None):
+    """
+    Process many images in a process pool and yield records.
+
+    paths:      any iterable of file paths (consumed lazily)
+    workers:    pool size (default: os.cpu_count()); 1 runs in-process
+    chunk_size: paths per submitted task
+    ordered:    yield in input order, otherwise as chunks complete
+    cache_path: metadata cache database used by every worker
+    """
+    return run_chunked(
+        process_chunk, paths, workers, chunk_size, ordered,
+        initializer=_init_worker, initargs=(cache_path,)
+    )
+
+
+def process_folder(folder, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, cache_path=None,
+                   **scan_options):
+    """
+    Headless bulk run over a folder tree (scan_options go to scan_images).
+    Returns {relative_path: ImageRecord}; records read like the GUI
+    report's per-image dicts (record.as_dict() for a plain copy).
+    """
+    report = {}
+    paths = scan_images(folder, **scan_options)
+    for record in run_bulk(paths, workers, chunk_size, cache_path=cache_path):
+        report[report_key(folder, record.path)] = record
+    return report
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python bulk_engine.py <folder> [report.json|report.ndjson|report.csv|report.pdf]")
+        sys.exit(1)
+
+    folder = sys.argv[1]
+
+    if len(sys.argv) > 2:
+        # Stream records to disk as they complete (.json / .ndjson / .csv / .pdf)
+        with open_report_writer(sys.argv[2]) as writer:
+            records = run_bulk(scan_images(folder), cache_path=default_cache_path())
+            for record in records:
+                writer.write(report_key(folder, record.path), record)
+        print(f"Processed {writer.count} images → {sys.argv[2]}")
+    else:
+        report = process_folder(folder, cache_path=default_cache_path())
+        print(json.dumps({name: record.as_dict() for name, record in report.items()}, indent=4))
@@ -0,0 +1,275 @@
+import os
+import sys
+import json
+import glob
+import argparse
+from functools import partial
+from itertools import chain
+
+import extractor
+import metrics
+from extractor import DISPLAY_FIELDS, extract_exif
+from gps_utils import extract_gps, get_lat_long
+from bulk_engine import DEFAULT_CHUNK_SIZE, run_chunked
+from metadata_cache import default_cache_path
+from report_writers import NDJSONWriter, JSONStreamWriter, CSVStreamWriter
+from scanner import scan_images
+from tag_table import normalize_value
+
+
+# Exit codes
+EXIT_OK = 0
+EXIT_FILE_ERRORS = 1
+EXIT_USAGE = 2
+
+GLOB_CHARS = ("*", "?", "[")
+
+READ_SIZE = 64 * 1024
+
+# Always read so GPSLatitude / GPSLongitude can be decoded
+COORD_FIELDS = ("GPSLatitude", "GPSLatitudeRef", "GPSLongitude", "GPSLongitudeRef")
+
+# Fixed CSV header without --fields (other tags go to the Extra column),
+# so it does not depend on which file happens to come first
+CSV_COLUMNS = DISPLAY_FIELDS + ("GPSLatitude", "GPSLongitude", "Error")
+
+
+# -------------------------------------------------
+# INPUTS
+# -------------------------------------------------
+def read_path_list(stream, null=False):
+    """
+    Yield paths from a newline- or NUL-separated list, as it arrives.
+    """
+    sep = "\0" if null else "\n"
+    pending = ""
+
+    while True:
+        data = stream.read(READ_SIZE)
+        if not data:
+            break
+        pending += data
+        *paths, pending = pending.split(sep)
+        for path in paths:
+            path = path if null else path.rstrip("\r")
+            if path:
+                yield path
+
+    if pending.strip("\r\n"):
+        yield pending if null else pending.rstrip("\r\n")
+
+
+def expand_inputs(inputs, missing):
+    """
+    Files pass through, directories are scanned recursively for images,
+    glob patterns are expanded. Inputs that match nothing are appended
+    to missing.
+    """
+    for item in inputs:
+        if os.path.isdir(item):
+            yield from scan_images(item)
+        elif os.path.exists(item):
+            yield item
+        elif any(ch in item for ch in GLOB_CHARS):
+            matched = False
+            for path in glob.iglob(item, recursive=True):
+                matched = True
+                if os.path.isdir(path):
+                    yield from scan_images(path)
+                else:
+                    yield path
+            if not matched:
+                missing.append(item)
+        else:
+            # Reported per file by the worker (No such file ...)
+            yield item
+
+
+# -------------------------------------------------
+# PER-FILE WORK (runs inside worker processes)
+# -------------------------------------------------
+def extract_record(path, fields=None):
+    """
+    EXIF + GPS for one file → (path, data, ok).
+    fields limits the output to these tags (plus decimal coordinates).
+    ok is False when the file could not be read at all.
+    """
+    read_fields = None if fields is None else set(fields).union(COORD_FIELDS)
+    try:
+        # Surface missing / unreadable files as failures;
+        # extract_exif itself treats them as "no metadata"
+        with open(path, "rb"):
+            pass
+        exif = extract_exif(path, fields=read_fields, skip_blobs=True)
+    except Exception as e:
+        metrics.error(e)
+        return path, {"Error": str(e)}, False
+
+    data = {
+        key: normalize_value(val, key) for key, val in exif.items()
+        if fields is None or key in fields
+    }
+
+    with metrics.stage("gps"):
+        gps = extract_gps(exif)
+        try:
+            lat, lon = get_lat_long(gps) if gps else (None, None)
+        except (TypeError, ValueError, IndexError) as e:
+            metrics.error(e)
+            lat, lon = None, None
+    data["GPSLatitude"] = lat
+    data["GPSLongitude"] = lon
+
+    return path, data, True
+
+
+def extract_chunk(paths, fields=None):
+    return [metrics.track_file(path, extract_record, path, fields) for path in paths]
+
+
+def _init_worker(cache_path):
+    if cache_path and extractor.get_cache() is None:
+        extractor.enable_cache(cache_path)
+
+
+# -------------------------------------------------
+# MAIN
+# -------------------------------------------------
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="exif-extract",
+        description="Extract EXIF metadata from many images and stream it to stdout.",
+        epilog="Examples:\n"
+               "  python cli.py photos/ --format csv > report.csv\n"
+               "  find /evidence -name '*.jpg' -print0 | python cli.py -0 --jobs 32",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "inputs", nargs="*",
+        help="files, directories or glob patterns; '-' (or none) reads paths from stdin"
+    )
+    parser.add_argument(
+        "-0", "--null", action="store_true",
+        help="stdin paths are NUL-separated (find -print0)"
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=os.cpu_count() or 1,
+        help="worker processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--fields",
+        help="comma-separated tag names to extract (default: all)"
+    )
+    parser.add_argument(
+        "--format", choices=("json", "ndjson", "csv"), default="ndjson",
+        help="output format (default: ndjson)"
+    )
+    parser.add_argument(
+        "--ordered", action="store_true",
+        help="keep input order instead of emitting records as they complete"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+        help="paths per worker task"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="bypass the persistent metadata cache"
+    )
+    parser.add_argument(
+        "--stats", metavar="FILE",
+        help="write per-stage timings / counters as JSON to FILE ('-' = stderr)"
+    )
+    parser.add_argument(
+        "--prometheus", metavar="FILE",
+        help="write the same numbers in Prometheus text format to FILE"
+    )
+    return parser
+
+
+def write_stats(args):
+    snapshot = metrics.get_metrics().snapshot()
+    if args.stats == "-":
+        print(json.dumps(snapshot, indent=4), file=sys.stderr)
+    elif args.stats:
+        with open(args.stats, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, indent=4)
+    if args.prometheus:
+        metrics.write_prometheus(args.prometheus, snapshot)
+
+
+def open_stdout_writer(fmt, fields=None):
+    if fmt == "json":
+        return JSONStreamWriter(sys.stdout)
+    if fmt == "csv":
+        if not fields:
+            return CSVStreamWriter(sys.stdout, CSV_COLUMNS, extra=True)
+        columns = [f for f in fields if f not in ("GPSLatitude", "GPSLongitude", "Error")]
+        columns += ["GPSLatitude", "GPSLongitude", "Error"]
+        return CSVStreamWriter(sys.stdout, columns)
+    return NDJSONWriter(sys.stdout)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.jobs < 1 or args.chunk_size < 1:
+        print("[ERROR] --jobs and --chunk-size must be at least 1", file=sys.stderr)
+        return EXIT_USAGE
+
+    fields = None
+    if args.fields:
+        fields = [f.strip() for f in args.fields.split(",") if f.strip()]
+
+    inputs = [item for item in args.inputs if item != "-"]
+    read_stdin = not args.inputs or "-" in args.inputs
+    if read_stdin and sys.stdin.isatty():
+        build_parser().print_usage(sys.stderr)
+        return EXIT_USAGE
+
+    missing = []
+    paths = expand_inputs(inputs, missing)
+    if read_stdin:
+        paths = chain(paths, read_path_list(sys.stdin, args.null))
+
+    cache_path = None if args.no_cache else default_cache_path()
+    failures = 0
+
+    if args.stats or args.prometheus:
+        metrics.enable()
+
+    records = run_chunked(
+        partial(extract_chunk, fields=fields), paths, args.jobs, args.chunk_size,
+        ordered=args.ordered, initializer=_init_worker, initargs=(cache_path,)
+    )
+
+    with open_stdout_writer(args.format, fields) as writer:
+        try:
+            for path, data, ok in records:
+                with metrics.stage("write"):
+                    writer.write(path, data)
+                if not ok:
+                    failures += 1
+                    print(f"[ERROR] {path}: {data['Error']}", file=sys.stderr)
+        except BrokenPipeError:
+            # Downstream closed early (e.g. | head): discard the rest
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, sys.stdout.fileno())
+            return EXIT_OK
+        except KeyboardInterrupt:
+            return 130
+        finally:
+            records.close()
+            # Also after an early exit (closed pipe, Ctrl+C)
+            if metrics.enabled():
+                write_stats(args)
+
+    for item in missing:
+        failures += 1
+        print(f"[ERROR] No match: {item}", file=sys.stderr)
+
+    return EXIT_FILE_ERRORS if failures else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
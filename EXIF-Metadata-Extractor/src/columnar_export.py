@@ -0,0 +1,199 @@
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: only needed for Parquet / Arrow export
+    pa = None
+    pq = None
+
+
+DEFAULT_ROW_GROUP_SIZE = 50_000
+
+# ---- Column typing (by tag name; everything else is a string) ----
+FLOAT_COLUMNS = {
+    "GPSLatitude", "GPSLongitude", "GPSAltitude",
+    "ExposureTime", "FNumber", "FocalLength",
+    "ApertureValue", "MaxApertureValue", "ShutterSpeedValue",
+    "BrightnessValue", "ExposureBiasValue", "SubjectDistance",
+    "DigitalZoomRatio", "XResolution", "YResolution",
+}
+INT_COLUMNS = {
+    "ISOSpeedRatings", "PrivacyRiskScore",
+    "ImageWidth", "ImageLength", "PixelXDimension", "PixelYDimension",
+    "Orientation", "ResolutionUnit", "Flash", "WhiteBalance",
+    "ExposureProgram", "MeteringMode", "FocalLengthIn35mmFilm",
+}
+TIMESTAMP_COLUMNS = {"DateTimeOriginal", "DateTimeDigitized", "DateTime"}
+
+EXIF_DATETIME_FORMAT = "%Y:%m:%d %H:%M:%S"
+
+
+def _to_float(v):
+    if isinstance(v, bool):
+        return None
+    if isinstance(v, (int, float)):
+        return float(v)
+    if isinstance(v, tuple) and len(v) == 2 and v[1]:
+        return v[0] / v[1]
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(v):
+    if isinstance(v, (tuple, list)) and v:
+        v = v[0]
+    if isinstance(v, bool):
+        return None
+    if isinstance(v, int):
+        return v
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    try:
+        return int(v)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_timestamp(v):
+    if isinstance(v, bytes):
+        v = v.decode(errors="ignore")
+    if not isinstance(v, str):
+        return None
+    try:
+        return datetime.strptime(v.strip("\x00 ")[:19], EXIF_DATETIME_FORMAT)
+    except ValueError:
+        return None
+
+
+def _to_str(v):
+    if isinstance(v, bytes):
+        return v.decode(errors="ignore")
+    return str(v)
+
+
+def column_type(name):
+    """
+    Arrow type and value converter for a report column.
+    """
+    if name in FLOAT_COLUMNS:
+        return pa.float64(), _to_float
+    if name in INT_COLUMNS:
+        return pa.int64(), _to_int
+    if name in TIMESTAMP_COLUMNS:
+        return pa.timestamp("s"), _to_timestamp
+    return pa.string(), _to_str
+
+
+class ColumnarWriter:
+    """
+    Typed columnar export of bulk records (Parquet or Arrow IPC).
+
+    Records are buffered one row group at a time and spilled to a
+    temporary Arrow file. On close the schema is the union of every
+    column seen; each row group is padded with nulls and copied into
+    the final file, so memory stays bounded by one row group.
+
+    Same write()/close() interface as the report_writers classes.
+    """
+
+    def __init__(self, path, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+        if pa is None:
+            raise RuntimeError(
+                "Parquet / Arrow export needs pyarrow (pip install pyarrow)"
+            )
+
+        self.path = path
+        self.format = "parquet" if path.lower().endswith(".parquet") else "arrow"
+        self.row_group_size = row_group_size
+        self.count = 0
+
+        # Columns in first-seen order → (arrow type, converter)
+        self.columns = {"Image": (pa.string(), _to_str)}
+        self.buffer = {"Image": []}
+        self.buffered = 0
+
+        self.spill_dir = tempfile.mkdtemp(
+            prefix=".exif-columnar-", dir=os.path.dirname(os.path.abspath(path))
+        )
+        self.spills = []
+
+    def write(self, image, data):
+        row = {"Image": image, **data}
+
+        for name, value in row.items():
+            if name not in self.columns:
+                self.columns[name] = column_type(name)
+                self.buffer[name] = [None] * self.buffered
+
+            converter = self.columns[name][1]
+            self.buffer[name].append(None if value is None else converter(value))
+
+        self.buffered += 1
+        self.count += 1
+
+        # Pad columns this record did not have
+        for values in self.buffer.values():
+            if len(values) < self.buffered:
+                values.append(None)
+
+        if self.buffered >= self.row_group_size:
+            self._spill()
+
+    def _spill(self):
+        if not self.buffered:
+            return
+
+        schema = pa.schema([(name, self.columns[name][0]) for name in self.buffer])
+        table = pa.table(self.buffer, schema=schema)
+
+        spill_path = os.path.join(self.spill_dir, f"{len(self.spills):06d}.arrow")
+        with pa.ipc.new_file(spill_path, table.schema) as writer:
+            writer.write_table(table)
+        self.spills.append(spill_path)
+
+        self.buffer = {name: [] for name in self.columns}
+        self.buffered = 0
+
+    def close(self):
+        if self.spill_dir is None:
+            return
+        try:
+            self._spill()
+            self._finalize()
+        finally:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+            self.spill_dir = None
+
+    def _finalize(self):
+        schema = pa.schema([(name, col[0]) for name, col in self.columns.items()])
+
+        if self.format == "parquet":
+            writer = pq.ParquetWriter(self.path, schema)
+        else:
+            writer = pa.ipc.new_file(self.path, schema)
+
+        with writer:
+            for spill_path in self.spills:
+                with pa.memory_map(spill_path) as source:
+                    table = pa.ipc.open_file(source).read_all()
+
+                for name in schema.names:
+                    if name not in table.column_names:
+                        table = table.append_column(
+                            pa.field(name, schema.field(name).type),
+                            pa.nulls(table.num_rows, schema.field(name).type)
+                        )
+
+                writer.write_table(table.select(schema.names))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
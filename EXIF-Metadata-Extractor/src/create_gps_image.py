@@ -1,29 +1,289 @@
+import os
+import re
+import json
+import random
+
 from PIL import Image
 import piexif
 
-# Create a simple image
-img = Image.new("RGB", (600, 400), color=(255, 200, 100))
-img.save("samples/gps_sample.jpg")
-
-# GPS coordinates (Example: New York City)
-gps_lat_deg = (40, 1)
-gps_lat_min = (42, 1)
-gps_lat_sec = (51, 1)
-
-gps_lon_deg = (74, 1)
-gps_lon_min = (0, 1)
-gps_lon_sec = (21, 1)
-
-exif_dict = {
-    "GPS": {
-        piexif.GPSIFD.GPSLatitudeRef: b"N",
-        piexif.GPSIFD.GPSLatitude: [gps_lat_deg, gps_lat_min, gps_lat_sec],
-        piexif.GPSIFD.GPSLongitudeRef: b"W",
-        piexif.GPSIFD.GPSLongitude: [gps_lon_deg, gps_lon_min, gps_lon_sec],
+
+# -------------------------------------------------
+# SINGLE GPS SAMPLE
+# -------------------------------------------------
+def create_gps_sample(path="samples/gps_sample.jpg"):
+    """
+    600×400 JPEG with fixed New York City GPS coordinates.
+    """
+    # Create a simple image
+    img = Image.new("RGB", (600, 400), color=(255, 200, 100))
+    img.save(path)
+
+    # GPS coordinates (Example: New York City)
+    gps_lat_deg = (40, 1)
+    gps_lat_min = (42, 1)
+    gps_lat_sec = (51, 1)
+
+    gps_lon_deg = (74, 1)
+    gps_lon_min = (0, 1)
+    gps_lon_sec = (21, 1)
+
+    exif_dict = {
+        "GPS": {
+            piexif.GPSIFD.GPSLatitudeRef: b"N",
+            piexif.GPSIFD.GPSLatitude: [gps_lat_deg, gps_lat_min, gps_lat_sec],
+            piexif.GPSIFD.GPSLongitudeRef: b"W",
+            piexif.GPSIFD.GPSLongitude: [gps_lon_deg, gps_lon_min, gps_lon_sec],
+        }
     }
+
+    exif_bytes = piexif.dump(exif_dict)
+    piexif.insert(exif_bytes, path)
+
+
+def create_short_scene_type_sample(path="samples/short_scene_type.jpg"):
+    """
+    JPEG whose SceneType (UNDEFINED in the tag table) is stored as a
+    single SHORT, as some cameras write it: the value reads back as an
+    int, not bytes.
+    """
+    img = Image.new("RGB", (320, 240), color=(90, 140, 200))
+    img.save(path)
+
+    exif_dict = {
+        "0th": {piexif.ImageIFD.Make: b"Regression", piexif.ImageIFD.Model: b"ShortSceneType"},
+        "Exif": {piexif.ExifIFD.SceneType: b"\x01"},
+    }
+    exif_bytes = piexif.dump(exif_dict)
+
+    # piexif always writes UNDEFINED; retype the entry to SHORT count 1
+    entry = re.compile(rb"\xa3\x01\x00\x07\x00\x00\x00\x01\x01\x00\x00\x00")
+    exif_bytes, found = entry.subn(b"\xa3\x01\x00\x03\x00\x00\x00\x01\x00\x01\x00\x00", exif_bytes)
+    if found != 1:
+        raise ValueError("SceneType entry not found in the EXIF block")
+    piexif.insert(exif_bytes, path)
+
+
+# -------------------------------------------------
+# SYNTHETIC CORPUS
+# -------------------------------------------------
+# format → (file extension, Pillow format name)
+CORPUS_FORMATS = {
+    "jpeg": (".jpg", "JPEG"),
+    "png": (".png", "PNG"),
+    "heic": (".heic", "HEIF"),
+    "tiff": (".tif", "TIFF"),
 }
+CORPUS_EXTENSIONS = tuple(ext for ext, _ in CORPUS_FORMATS.values())
+
+# (name, width, height, relative weight)
+SIZE_CLASSES = (
+    ("thumb", 160, 120, 30),
+    ("small", 640, 480, 35),
+    ("3mp", 2048, 1536, 20),
+    ("12mp", 4000, 3000, 10),
+    ("50mp", 8660, 5773, 5),
+)
+
+CAMERAS = (
+    (b"Canon", b"Canon EOS R5"),
+    (b"NIKON CORPORATION", b"NIKON Z 6_2"),
+    (b"SONY", b"ILCE-7M4"),
+    (b"Apple", b"iPhone 14 Pro"),
+    (b"samsung", b"SM-S918B"),
+    (b"FUJIFILM", b"X-T5"),
+)
+SOFTWARE = (b"Adobe Photoshop 24.1", b"GIMP 2.10.34", b"17.1.1", b"Lightroom Classic")
+ARTISTS = (b"Jane Doe", b"J. Smith", b"Studio 42")
+
+# Probabilities of the optional parts of the EXIF block
+P_NO_EXIF = 0.10
+P_GPS = 0.60
+P_PARTIAL_GPS = 0.10
+P_MAKERNOTE = 0.30
+P_CORRUPT_RATIONAL = 0.10
+P_SENSITIVE = 0.25
+
+# JPEG APP1 segments are limited to 64 KB
+MAX_MAKERNOTE = 16 * 1024
+
+# HEIC encoding (x265) takes seconds per frame above a few megapixels,
+# so HEIC files stop at the 3 MP class
+HEIC_MAX_MP = 4
+
+
+def _dms(value):
+    """
+    Decimal degrees → piexif DMS rationals (seconds with 1/100 precision).
+    """
+    value = abs(value)
+    deg = int(value)
+    minutes = int((value - deg) * 60)
+    seconds = round(((value - deg) * 60 - minutes) * 60 * 100)
+    return ((deg, 1), (minutes, 1), (seconds, 100))
+
+
+def random_exif(rng):
+    """
+    Random piexif dict: camera tags, optional GPS, MakerNote blobs,
+    corrupt rationals (zero denominators) and missing tags.
+    Returns (exif_dict, facts) where facts describes what was written.
+    """
+    facts = {"gps": False, "makernote": 0, "corrupt": False, "partial_gps": False}
+    zeroth, exif, gps = {}, {}, {}
+
+    make, model = rng.choice(CAMERAS)
+    if rng.random() > 0.05:
+        zeroth[piexif.ImageIFD.Make] = make
+    if rng.random() > 0.05:
+        zeroth[piexif.ImageIFD.Model] = model
+    if rng.random() < 0.3:
+        zeroth[piexif.ImageIFD.Software] = rng.choice(SOFTWARE)
+    if rng.random() < P_SENSITIVE:
+        zeroth[piexif.ImageIFD.Artist] = rng.choice(ARTISTS)
+    if rng.random() < P_SENSITIVE:
+        exif[piexif.ExifIFD.BodySerialNumber] = str(rng.randrange(10**9)).encode()
+
+    when = (
+        f"{rng.randint(2005, 2025)}:{rng.randint(1, 12):02d}:{rng.randint(1, 28):02d} "
+        f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}"
+    ).encode()
+    if rng.random() > 0.1:
+        exif[piexif.ExifIFD.DateTimeOriginal] = when
+
+    exif[piexif.ExifIFD.ExposureTime] = (1, rng.choice((30, 60, 125, 250, 1000)))
+    exif[piexif.ExifIFD.FNumber] = (rng.choice((14, 18, 28, 40, 56, 80)), 10)
+    exif[piexif.ExifIFD.ISOSpeedRatings] = rng.choice((100, 200, 400, 800, 3200))
+    exif[piexif.ExifIFD.FocalLength] = (rng.randint(14, 200) * 10, 10)
+
+    if rng.random() < P_MAKERNOTE:
+        size = rng.randint(256, MAX_MAKERNOTE)
+        exif[piexif.ExifIFD.MakerNote] = rng.randbytes(size)
+        facts["makernote"] = size
+
+    if rng.random() < P_GPS:
+        lat = rng.uniform(-89.9, 89.9)
+        lon = rng.uniform(-179.9, 179.9)
+        gps[piexif.GPSIFD.GPSLatitude] = _dms(lat)
+        gps[piexif.GPSIFD.GPSLongitude] = _dms(lon)
+        gps[piexif.GPSIFD.GPSLatitudeRef] = b"N" if lat >= 0 else b"S"
+        gps[piexif.GPSIFD.GPSLongitudeRef] = b"E" if lon >= 0 else b"W"
+        gps[piexif.GPSIFD.GPSAltitude] = (rng.randint(0, 400000), 100)
+        gps[piexif.GPSIFD.GPSAltitudeRef] = 0
+        gps[piexif.GPSIFD.GPSTimeStamp] = ((rng.randint(0, 23), 1), (rng.randint(0, 59), 1), (0, 1))
+        gps[piexif.GPSIFD.GPSDateStamp] = when[:10]
+        facts["gps"] = True
+
+        if rng.random() < P_PARTIAL_GPS:
+            del gps[rng.choice((piexif.GPSIFD.GPSLatitudeRef, piexif.GPSIFD.GPSLongitude))]
+            facts["partial_gps"] = True
+
+    if rng.random() < P_CORRUPT_RATIONAL:
+        if gps and piexif.GPSIFD.GPSLatitude in gps:
+            gps[piexif.GPSIFD.GPSLatitude] = ((40, 0), (0, 0), (0, 0))
+        else:
+            exif[piexif.ExifIFD.ExposureTime] = (1, 0)
+        facts["corrupt"] = True
+
+    return {"0th": zeroth, "Exif": exif, "GPS": gps}, facts
+
+
+def _pixels(rng, width, height):
+    """
+    Cheap but compressible content: a small seeded noise tile blended
+    over a random base colour and scaled up.
+    """
+    tile = Image.frombytes("RGB", (64, 64), rng.randbytes(64 * 64 * 3))
+    base = Image.new("RGB", (64, 64), tuple(rng.randrange(256) for _ in range(3)))
+    return Image.blend(base, tile, 0.3).resize((width, height), Image.BILINEAR)
+
+
+def generate_corpus(out_dir, count=100, seed=0, formats=tuple(CORPUS_FORMATS), max_mp=12):
+    """
+    Write `count` synthetic images to out_dir and a manifest.json
+    describing each one. The same seed always produces the same files.
+
+    formats: subset of CORPUS_FORMATS
+    max_mp:  skip size classes above this many megapixels (50 MP needs ~50)
+    """
+    sizes = [s for s in SIZE_CLASSES if s[1] * s[2] <= max_mp * 1_000_000]
+    if not sizes:
+        raise ValueError("max_mp excludes every size class")
+
+    if "heic" in formats:
+        from pillow_heif import register_heif_opener
+        register_heif_opener()
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = []
+
+    for i in range(count):
+        # Per-image RNG: file i is identical regardless of count / formats order
+        rng = random.Random(f"{seed}:{i}")
+
+        fmt = rng.choice(sorted(formats))
+        allowed = sizes
+        if fmt == "heic":
+            allowed = [s for s in sizes if s[1] * s[2] <= HEIC_MAX_MP * 1_000_000]
+        size_name, width, height, _ = rng.choices(allowed, weights=[s[3] for s in allowed])[0]
+        ext, pil_format = CORPUS_FORMATS[fmt]
+
+        name = f"img_{i:06d}_{size_name}{ext}"
+        path = os.path.join(out_dir, name)
+
+        img = _pixels(rng, width, height)
+
+        if rng.random() < P_NO_EXIF:
+            exif_dict, facts = None, {"gps": False}
+        else:
+            exif_dict, facts = random_exif(rng)
+
+        options = {}
+        if exif_dict:
+            options["exif"] = piexif.dump(exif_dict)
+        if fmt in ("jpeg", "heic"):
+            options["quality"] = rng.choice((75, 85, 92))
+
+        img.save(path, pil_format, **options)
+
+        manifest.append({
+            "file": name,
+            "format": fmt,
+            "size": size_name,
+            "width": width,
+            "height": height,
+            "bytes": os.path.getsize(path),
+            "exif": exif_dict is not None,
+            **facts,
+        })
+
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"seed": seed, "count": count, "files": manifest}, f, indent=4)
+
+    return manifest
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) == 1:
+        create_gps_sample()
+        create_short_scene_type_sample()
+        print("GPS-enabled sample image created: samples/gps_sample.jpg")
+        print("Regression sample created: samples/short_scene_type.jpg")
+        sys.exit(0)
+
+    if len(sys.argv) < 3:
+        print("Usage:\n"
+              "  python create_gps_image.py\n"
+              "  python create_gps_image.py <out_dir> <count> [seed] [formats] [max_mp]\n"
+              "      formats: comma list of jpeg,png,heic,tiff (default: all)")
+        sys.exit(1)
 
-exif_bytes = piexif.dump(exif_dict)
-piexif.insert(exif_bytes, "samples/gps_sample.jpg")
+    out_dir, count = sys.argv[1], int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    formats = tuple(sys.argv[4].split(",")) if len(sys.argv) > 4 else tuple(CORPUS_FORMATS)
+    max_mp = float(sys.argv[5]) if len(sys.argv) > 5 else 12
 
-print("GPS-enabled sample image created: samples/gps_sample.jpg")
+    files = generate_corpus(out_dir, count, seed, formats, max_mp)
+    total = sum(f["bytes"] for f in files)
+    print(f"Generated {len(files)} images ({total / 1e6:.1f} MB) → {out_dir}")
@@ -0,0 +1,556 @@
+import mmap
+import struct
+
+import piexif
+
+from metrics import stage
+
+
+JPEG_SOI = b"\xff\xd8"
+TIFF_MAGIC = (b"II*\x00", b"MM\x00*")
+EXIF_HEADER = b"Exif\x00\x00"
+
+# JPEG markers that carry no length field
+STANDALONE_MARKERS = {0x01} | set(range(0xD0, 0xD8))
+MARKER_SOS = 0xDA
+MARKER_EOI = 0xD9
+MARKER_APP1 = 0xE1
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_CHUNK_EXIF = b"eXIf"
+PNG_CHUNK_END = b"IEND"
+
+# ISOBMFF brands of HEIF / AVIF still images (ftyp major or compatible)
+HEIF_BRANDS = {
+    b"heic", b"heix", b"heim", b"heis", b"hevc", b"hevx",
+    b"mif1", b"msf1", b"avif", b"avis",
+}
+# Give up on corrupt HEIF files with more sibling boxes than this
+HEIF_MAX_BOXES = 4096
+
+# Bytes read up front to sniff the container (covers the ftyp brands)
+HEAD_PEEK = 64
+
+# TIFF value types → (struct format, size in bytes)
+NUMERIC_TYPES = {
+    1: ("B", 1),   # BYTE
+    3: ("H", 2),   # SHORT
+    4: ("L", 4),   # LONG
+    6: ("b", 1),   # SBYTE
+    8: ("h", 2),   # SSHORT
+    9: ("l", 4),   # SLONG
+    11: ("f", 4),  # FLOAT
+    12: ("d", 8),  # DOUBLE
+}
+TYPE_ASCII = 2
+TYPE_RATIONAL = 5
+TYPE_UNDEFINED = 7
+TYPE_SRATIONAL = 10
+
+IFD_NAMES = ("0th", "Exif", "GPS", "Interop", "1st")
+
+# UNDEFINED values larger than this (MakerNote, UserComment, ...) are
+# dropped when skip_blobs is set
+BLOB_LIMIT = 256
+
+# Tags that must always be decoded so the reader can follow sub-IFDs
+POINTER_TAGS = {
+    "0th": {piexif.ImageIFD.ExifTag, piexif.ImageIFD.GPSTag},
+    "Exif": {piexif.ExifIFD.InteroperabilityTag},
+    "GPS": set(),
+    "Interop": set(),
+    "1st": {
+        piexif.ImageIFD.JPEGInterchangeFormat,
+        piexif.ImageIFD.JPEGInterchangeFormatLength,
+    },
+}
+
+# Tag name → tag id, per IFD (built once)
+TAG_IDS = {
+    ifd: {info["name"]: tag for tag, info in piexif.TAGS[ifd].items()}
+    for ifd in IFD_NAMES
+}
+
+
+def ifds_for_fields(fields):
+    """
+    Returns the IFD names that can contain at least one of the given tag names.
+    """
+    return tuple(
+        ifd for ifd in IFD_NAMES
+        if any(name in TAG_IDS[ifd] for name in fields)
+    )
+
+
+def read_jpeg_app1(path):
+    """
+    Walk JPEG markers with small reads and return the TIFF block
+    inside the first Exif APP1 segment.
+    Stops at the first SOS marker, so pixel data is never read.
+    Returns None if the file has no EXIF segment.
+    """
+    with open(path, "rb") as f:
+        if f.read(2) != JPEG_SOI:
+            return None
+
+        while True:
+            byte = f.read(1)
+            if not byte:
+                return None
+            if byte != b"\xff":
+                # Garbage between segments → give up like piexif does
+                return None
+
+            # Skip fill bytes (0xFF padding)
+            marker = f.read(1)
+            while marker == b"\xff":
+                marker = f.read(1)
+            if not marker:
+                return None
+
+            code = marker[0]
+            if code in (MARKER_SOS, MARKER_EOI):
+                return None
+            if code in STANDALONE_MARKERS:
+                continue
+
+            head = f.read(2)
+            if len(head) != 2:
+                return None
+            length = struct.unpack(">H", head)[0]
+            if length < 2:
+                return None
+
+            if code == MARKER_APP1:
+                segment = f.read(length - 2)
+                if segment[:6] == EXIF_HEADER:
+                    return segment[6:]
+            else:
+                f.seek(length - 2, 1)
+
+
+def read_png_exif(path):
+    """
+    Walk PNG chunk headers with seeks and return the TIFF block of
+    the eXIf chunk. IDAT (pixel) chunks are skipped, never read.
+    Returns None if the file has no eXIf chunk.
+    """
+    with open(path, "rb") as f:
+        if f.read(8) != PNG_SIGNATURE:
+            return None
+
+        while True:
+            head = f.read(8)
+            if len(head) != 8:
+                return None
+            length, kind = struct.unpack(">L4s", head)
+
+            if kind == PNG_CHUNK_EXIF:
+                data = f.read(length)
+                if len(data) != length:
+                    raise ValueError("Truncated PNG eXIf chunk")
+                # Some writers keep the JPEG "Exif\0\0" prefix
+                if data[:6] == EXIF_HEADER:
+                    data = data[6:]
+                return data
+            if kind == PNG_CHUNK_END:
+                return None
+
+            # Chunk data + CRC
+            f.seek(length + 4, 1)
+
+
+def _boxes(buf, start, end):
+    """
+    Yield (type, payload start, box end) for the ISOBMFF boxes in buf[start:end].
+    """
+    pos = start
+    count = 0
+    while pos + 8 <= end:
+        size, kind = struct.unpack_from(">L4s", buf, pos)
+        header = 8
+        if size == 1:
+            size = struct.unpack_from(">Q", buf, pos + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header or pos + size > end:
+            raise ValueError(f"Corrupt HEIF box {kind!r}")
+
+        yield kind, pos + header, pos + size
+        pos += size
+
+        count += 1
+        if count > HEIF_MAX_BOXES:
+            raise ValueError("Too many HEIF boxes")
+
+
+def _find_box(buf, start, end, kind):
+    for box_kind, payload, box_end in _boxes(buf, start, end):
+        if box_kind == kind:
+            return payload, box_end
+    return None
+
+
+def _uint(buf, pos, size):
+    """
+    Big-endian unsigned int of 0, 4 or 8 bytes (iloc field sizes).
+    """
+    if size == 0:
+        return 0, pos
+    if size == 4:
+        return struct.unpack_from(">L", buf, pos)[0], pos + 4
+    if size == 8:
+        return struct.unpack_from(">Q", buf, pos)[0], pos + 8
+    raise ValueError(f"Unsupported iloc field size: {size}")
+
+
+def _heif_exif_item(buf, start, end):
+    """
+    Item ID of the 'Exif' item listed in the iinf box, or None.
+    """
+    version = buf[start]
+    pos = start + 4
+    if version == 0:
+        pos += 2
+    else:
+        pos += 4
+
+    for kind, payload, box_end in _boxes(buf, pos, end):
+        if kind != b"infe":
+            continue
+        infe_version = buf[payload]
+        if infe_version < 2:
+            continue
+        if infe_version == 2:
+            item_id = struct.unpack_from(">H", buf, payload + 4)[0]
+            type_pos = payload + 8
+        else:
+            item_id = struct.unpack_from(">L", buf, payload + 4)[0]
+            type_pos = payload + 10
+        if buf[type_pos:type_pos + 4] == b"Exif":
+            return item_id
+    return None
+
+
+def _heif_item_extents(buf, start, item_id):
+    """
+    (construction method, [(offset, length), ...]) of item_id from the iloc box.
+    """
+    version = buf[start]
+    pos = start + 4
+    sizes = struct.unpack_from(">H", buf, pos)[0]
+    pos += 2
+    offset_size = sizes >> 12
+    length_size = (sizes >> 8) & 0xF
+    base_offset_size = (sizes >> 4) & 0xF
+    index_size = sizes & 0xF if version in (1, 2) else 0
+
+    if version < 2:
+        item_count = struct.unpack_from(">H", buf, pos)[0]
+        pos += 2
+    else:
+        item_count = struct.unpack_from(">L", buf, pos)[0]
+        pos += 4
+
+    for _ in range(item_count):
+        if version < 2:
+            current = struct.unpack_from(">H", buf, pos)[0]
+            pos += 2
+        else:
+            current = struct.unpack_from(">L", buf, pos)[0]
+            pos += 4
+
+        method = 0
+        if version in (1, 2):
+            method = struct.unpack_from(">H", buf, pos)[0] & 0xF
+            pos += 2
+        pos += 2  # data_reference_index
+
+        base_offset, pos = _uint(buf, pos, base_offset_size)
+        extent_count = struct.unpack_from(">H", buf, pos)[0]
+        pos += 2
+
+        extents = []
+        for _ in range(extent_count):
+            _, pos = _uint(buf, pos, index_size)
+            offset, pos = _uint(buf, pos, offset_size)
+            length, pos = _uint(buf, pos, length_size)
+            extents.append((base_offset + offset, length))
+
+        if current == item_id:
+            return method, extents
+
+    return None
+
+
+def read_heif_exif(buf):
+    """
+    Locate the Exif item of a HEIF / AVIF file through the top-level
+    meta box (iinf → item ID, iloc → extents) and return its TIFF
+    block. Only box headers and the item itself are touched, so no
+    image data is decoded or read.
+    Returns None if there is no Exif item; raises on unsupported layouts.
+    """
+    size = len(buf)
+
+    meta = _find_box(buf, 0, size, b"meta")
+    if meta is None:
+        return None
+    # meta is a FullBox: skip version + flags
+    meta_start, meta_end = meta[0] + 4, meta[1]
+
+    iinf = _find_box(buf, meta_start, meta_end, b"iinf")
+    iloc = _find_box(buf, meta_start, meta_end, b"iloc")
+    if iinf is None or iloc is None:
+        return None
+
+    item_id = _heif_exif_item(buf, *iinf)
+    if item_id is None:
+        return None
+    location = _heif_item_extents(buf, iloc[0], item_id)
+    if location is None:
+        return None
+    method, extents = location
+
+    if method == 0:
+        base = 0           # offsets into the file
+    elif method == 1:
+        idat = _find_box(buf, meta_start, meta_end, b"idat")
+        if idat is None:
+            raise ValueError("HEIF Exif item refers to a missing idat box")
+        base = idat[0]     # offsets into the meta idat box
+    else:
+        raise ValueError(f"Unsupported HEIF iloc construction method: {method}")
+
+    item = b"".join(
+        buf[base + offset:(base + offset + length) if length else size]
+        for offset, length in extents
+    )
+
+    # Exif item payload: 4-byte offset to the TIFF header, then the block
+    if len(item) < 4:
+        raise ValueError("Truncated HEIF Exif item")
+    tiff_start = 4 + struct.unpack_from(">L", item, 0)[0]
+    return item[tiff_start:]
+
+
+def _is_heif(head):
+    """
+    head: first HEAD_PEEK bytes of the file; checks the ftyp brands.
+    """
+    if head[4:8] != b"ftyp":
+        return False
+    ftyp_end = min(struct.unpack_from(">L", head, 0)[0], len(head))
+    return head[8:12] in HEIF_BRANDS or any(
+        head[pos:pos + 4] in HEIF_BRANDS for pos in range(16, ftyp_end - 3, 4)
+    )
+
+
+class _IFDReader:
+    """
+    Decodes TIFF IFD tables from a bytes-like buffer (bytes or mmap).
+    Values are converted exactly like piexif.load, so the resulting
+    dict is a drop-in replacement for piexif output.
+    """
+
+    def __init__(self, buf, ifds=None, fields=None, skip_blobs=False):
+        self.buf = buf
+        self.endian = "<" if buf[0:2] == b"II" else ">"
+        self.skip_blobs = skip_blobs
+
+        # Per-IFD set of tag ids to decode (None → every known tag)
+        self.wanted = {}
+        for ifd in IFD_NAMES:
+            if ifds is not None and ifd not in ifds:
+                self.wanted[ifd] = POINTER_TAGS[ifd]
+            elif fields is not None:
+                ids = {TAG_IDS[ifd][n] for n in fields if n in TAG_IDS[ifd]}
+                self.wanted[ifd] = ids | POINTER_TAGS[ifd]
+            else:
+                self.wanted[ifd] = None
+
+    def first_ifd_offset(self):
+        return struct.unpack_from(self.endian + "L", self.buf, 4)[0]
+
+    def read_ifd(self, pointer, ifd_name):
+        """
+        Returns (tags, raw 4-byte next-IFD pointer) for the IFD at pointer.
+        Only tags known to piexif.TAGS (and requested, if filtering) are kept.
+        """
+        buf = self.buf
+        endian = self.endian
+        known = self.wanted[ifd_name]
+        if known is None:
+            known = piexif.TAGS[ifd_name]
+
+        count = struct.unpack_from(endian + "H", buf, pointer)[0]
+        entries = struct.unpack_from(endian + "HHL4s" * count, buf, pointer + 2)
+
+        tags = {}
+        for i in range(0, len(entries), 4):
+            tag = entries[i]
+            if tag not in known:
+                continue
+            if (
+                self.skip_blobs
+                and entries[i + 1] == TYPE_UNDEFINED
+                and entries[i + 2] > BLOB_LIMIT
+            ):
+                continue
+            tags[tag] = self.convert_value(
+                entries[i + 1], entries[i + 2], entries[i + 3]
+            )
+
+        next_pos = pointer + 2 + 12 * count
+        next_raw = buf[next_pos:next_pos + 4]
+        return tags, next_raw
+
+    def convert_value(self, value_type, length, raw):
+        buf = self.buf
+        endian = self.endian
+
+        if value_type in NUMERIC_TYPES:
+            fmt, size = NUMERIC_TYPES[value_type]
+            if size * length > 4 or value_type == 12:
+                pointer = struct.unpack(endian + "L", raw)[0]
+                data = struct.unpack_from(endian + fmt * length, buf, pointer)
+            else:
+                data = struct.unpack_from(endian + fmt * length, raw)
+
+        elif value_type == TYPE_ASCII:
+            if length > 4:
+                pointer = struct.unpack(endian + "L", raw)[0]
+                data = buf[pointer:pointer + length - 1]
+            else:
+                data = raw[0:length - 1]
+
+        elif value_type == TYPE_UNDEFINED:
+            if length > 4:
+                pointer = struct.unpack(endian + "L", raw)[0]
+                data = buf[pointer:pointer + length]
+            else:
+                data = raw[0:length]
+
+        elif value_type in (TYPE_RATIONAL, TYPE_SRATIONAL):
+            fmt = "L" if value_type == TYPE_RATIONAL else "l"
+            pointer = struct.unpack(endian + "L", raw)[0]
+            if length > 1:
+                flat = struct.unpack_from(endian + fmt * (2 * length), buf, pointer)
+                data = tuple(zip(flat[0::2], flat[1::2]))
+            else:
+                data = struct.unpack_from(endian + fmt * 2, buf, pointer)
+
+        else:
+            raise ValueError(f"Unknown EXIF value type: {value_type}")
+
+        if isinstance(data, tuple) and len(data) == 1:
+            return data[0]
+        return data
+
+
+def empty_exif_dict():
+    return {
+        "0th": {},
+        "Exif": {},
+        "GPS": {},
+        "Interop": {},
+        "1st": {},
+        "thumbnail": None,
+    }
+
+
+def parse_tiff(buf, ifds=None, fields=None, skip_blobs=False):
+    """
+    Decode IFD0 / Exif / GPS / Interop / IFD1 from a TIFF block.
+    Returns a dict shaped like piexif.load output.
+
+    ifds:       only decode these IFDs (others are walked for pointers only)
+    fields:     only decode these tag names
+    skip_blobs: drop large UNDEFINED values and the IFD1 thumbnail
+    """
+    exif_dict = empty_exif_dict()
+    reader = _IFDReader(buf, ifds, fields, skip_blobs)
+
+    def wanted(*names):
+        return ifds is None or any(name in ifds for name in names)
+
+    zeroth, next_raw = reader.read_ifd(reader.first_ifd_offset(), "0th")
+    exif_dict["0th"] = zeroth
+
+    if piexif.ImageIFD.ExifTag in zeroth and wanted("Exif", "Interop"):
+        exif_dict["Exif"], _ = reader.read_ifd(zeroth[piexif.ImageIFD.ExifTag], "Exif")
+
+    if piexif.ImageIFD.GPSTag in zeroth and wanted("GPS"):
+        exif_dict["GPS"], _ = reader.read_ifd(zeroth[piexif.ImageIFD.GPSTag], "GPS")
+
+    if piexif.ExifIFD.InteroperabilityTag in exif_dict["Exif"] and wanted("Interop"):
+        exif_dict["Interop"], _ = reader.read_ifd(
+            exif_dict["Exif"][piexif.ExifIFD.InteroperabilityTag], "Interop"
+        )
+
+    if next_raw != b"\x00\x00\x00\x00" and wanted("1st"):
+        pointer = struct.unpack(reader.endian + "L", next_raw)[0]
+        first, _ = reader.read_ifd(pointer, "1st")
+        exif_dict["1st"] = first
+
+        start = first.get(piexif.ImageIFD.JPEGInterchangeFormat)
+        size = first.get(piexif.ImageIFD.JPEGInterchangeFormatLength)
+        if start is not None and size is not None and not skip_blobs:
+            exif_dict["thumbnail"] = buf[start:start + size]
+
+    # Sub-IFDs walked only to reach others are not part of the result
+    if ifds is not None:
+        for ifd in IFD_NAMES:
+            if ifd not in ifds:
+                exif_dict[ifd] = {}
+
+    return exif_dict
+
+
+def load_exif(path, ifds=None, fields=None, skip_blobs=False):
+    """
+    Header-only replacement for piexif.load on JPEG, TIFF, PNG and
+    HEIF / HEIC files.
+    JPEG: only the APP1 segment is read.
+    TIFF: the file is memory-mapped so only the IFD pages are touched.
+    PNG:  chunk headers are skipped with seeks up to the eXIf chunk.
+    HEIF: the file is memory-mapped and the Exif item located through
+          the meta / iinf / iloc boxes.
+    Returns None for formats this reader does not handle.
+    Raises on corrupt EXIF so callers can fall back to piexif.
+    See parse_tiff for ifds / fields / skip_blobs.
+    """
+    with open(path, "rb") as f:
+        with stage("io"):
+            head = f.read(HEAD_PEEK)
+        magic = head[:4]
+
+        if magic in TIFF_MAGIC:
+            # IFD pages fault in while parsing, so I/O counts as parse here
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, stage("parse"):
+                return parse_tiff(mm, ifds, fields, skip_blobs)
+
+        if _is_heif(head):
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, stage("io"):
+                tiff = read_heif_exif(mm)
+            return _parse_block(tiff, ifds, fields, skip_blobs)
+
+    if magic[:2] == JPEG_SOI:
+        with stage("io"):
+            tiff = read_jpeg_app1(path)
+        return _parse_block(tiff, ifds, fields, skip_blobs)
+
+    if head[:8] == PNG_SIGNATURE:
+        with stage("io"):
+            tiff = read_png_exif(path)
+        return _parse_block(tiff, ifds, fields, skip_blobs)
+
+    return None
+
+
+def _parse_block(tiff, ifds, fields, skip_blobs):
+    if not tiff:
+        return empty_exif_dict()
+    with stage("parse"):
+        return parse_tiff(tiff, ifds, fields, skip_blobs)
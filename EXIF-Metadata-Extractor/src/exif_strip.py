@@ -0,0 +1,162 @@
+import os
+import struct
+
+from exif_reader import (
+    JPEG_SOI, EXIF_HEADER, STANDALONE_MARKERS, MARKER_SOS, MARKER_EOI, MARKER_APP1
+)
+
+
+MARKER_APP13 = 0xED
+
+XMP_HEADERS = (
+    b"http://ns.adobe.com/xap/1.0/\x00",
+    b"http://ns.adobe.com/xmp/extension/\x00",
+)
+IPTC_HEADER = b"Photoshop 3.0\x00"
+
+# Longest segment header we need to look at
+HEADER_PEEK = max(len(h) for h in XMP_HEADERS + (EXIF_HEADER, IPTC_HEADER))
+
+COPY_BUFFER = 1024 * 1024
+
+
+# -------------------------------------------------
+# MARKER LAYOUT
+# -------------------------------------------------
+def find_metadata_segments(path, xmp=False, iptc=False):
+    """
+    Walk the JPEG markers up to SOS and return [(start, end)] byte ranges
+    of every EXIF APP1 segment (plus XMP APP1 / IPTC APP13 if asked).
+    Only segment headers are read; pixel data is never touched.
+    Raises ValueError if the file is not a well-formed JPEG header.
+    """
+    ranges = []
+
+    with open(path, "rb") as f:
+        if f.read(2) != JPEG_SOI:
+            raise ValueError("Not a JPEG file")
+
+        while True:
+            start = f.tell()
+            byte = f.read(1)
+            if byte != b"\xff":
+                raise ValueError("Wrong JPEG data")
+
+            marker = f.read(1)
+            while marker == b"\xff":
+                marker = f.read(1)
+            if not marker:
+                raise ValueError("Wrong JPEG data")
+
+            code = marker[0]
+            if code in (MARKER_SOS, MARKER_EOI):
+                return ranges
+            if code in STANDALONE_MARKERS:
+                continue
+
+            head = f.read(2)
+            if len(head) != 2:
+                raise ValueError("Wrong JPEG data")
+            length = struct.unpack(">H", head)[0]
+            if length < 2:
+                raise ValueError("Wrong JPEG data")
+
+            body_start = f.tell()
+            end = body_start + length - 2
+
+            if code == MARKER_APP1 or (iptc and code == MARKER_APP13):
+                peek = f.read(min(HEADER_PEEK, length - 2))
+                if (
+                    (code == MARKER_APP1 and peek.startswith(EXIF_HEADER))
+                    or (xmp and code == MARKER_APP1 and peek.startswith(XMP_HEADERS))
+                    or (code == MARKER_APP13 and peek.startswith(IPTC_HEADER))
+                ):
+                    ranges.append((start, end))
+
+            f.seek(end)
+
+
+def keep_ranges(size, removed):
+    """
+    Complement of the removed ranges within [0, size).
+    """
+    keep = []
+    pos = 0
+    for start, end in removed:
+        if start > pos:
+            keep.append((pos, start))
+        pos = end
+    if pos < size:
+        keep.append((pos, size))
+    return keep
+
+
+# -------------------------------------------------
+# RANGE COPY
+# -------------------------------------------------
+def _copy_buffered(src_fd, dst_fd, offset, count):
+    os.lseek(src_fd, offset, os.SEEK_SET)
+    while count > 0:
+        chunk = os.read(src_fd, min(COPY_BUFFER, count))
+        if not chunk:
+            raise ValueError("Unexpected end of file")
+        view = memoryview(chunk)
+        while view:
+            view = view[os.write(dst_fd, view):]
+        count -= len(chunk)
+
+
+def copy_range(src_fd, dst_fd, offset, count):
+    """
+    Append src[offset:offset + count] to dst in the kernel
+    (copy_file_range, then sendfile), falling back to a buffered copy.
+    """
+    copiers = []
+    if hasattr(os, "copy_file_range"):
+        copiers.append(lambda n: os.copy_file_range(src_fd, dst_fd, n, offset))
+    if hasattr(os, "sendfile"):
+        copiers.append(lambda n: os.sendfile(dst_fd, src_fd, offset, n))
+
+    for copier in copiers:
+        try:
+            while count > 0:
+                sent = copier(count)
+                if sent == 0:
+                    break
+                offset += sent
+                count -= sent
+        except OSError:
+            # Not supported for this pair of files: try the next method
+            continue
+        if count == 0:
+            return
+
+    _copy_buffered(src_fd, dst_fd, offset, count)
+
+
+def strip_metadata(src, dst, xmp=False, iptc=False):
+    """
+    Write src to dst without its EXIF segments (and XMP / IPTC if asked)
+    by copying the remaining byte ranges. Nothing is decoded or
+    re-encoded; for EXIF only the output matches piexif.remove.
+    Returns the number of bytes removed.
+    """
+    removed = find_metadata_segments(src, xmp, iptc)
+
+    src_fd = os.open(src, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        size = os.fstat(src_fd).st_size
+        dst_fd = os.open(
+            dst,
+            os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0),
+            0o666
+        )
+        try:
+            for start, end in keep_ranges(size, removed):
+                copy_range(src_fd, dst_fd, start, end - start)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+    return sum(end - start for start, end in removed)
@@ -1,29 +1,137 @@
+import sys
+
 import piexif
-from pillow_heif import register_heif_opener
-from PIL import Image
 
-# Enable HEIC support
-register_heif_opener()
+import metrics
+from exif_reader import BLOB_LIMIT, ifds_for_fields, load_exif
+from metadata_cache import MetadataCache, file_key
+from privacy_risk import RISK_FIELDS
+from tag_table import IFD_TAGS, TYPE_UNDEFINED
+
+# IFDs that make up the flat metadata dict
+METADATA_IFDS = ("0th", "Exif", "GPS", "1st")
+
+# Common field projections
+DISPLAY_FIELDS = (
+    "Make", "Model", "DateTimeOriginal",
+    "ExposureTime", "FNumber",
+    "ISOSpeedRatings", "FocalLength",
+    "Software",
+)
+GPS_FIELDS = (
+    "GPSLatitude", "GPSLatitudeRef",
+    "GPSLongitude", "GPSLongitudeRef",
+    "GPSAltitude", "GPSAltitudeRef",
+    "GPSTimeStamp", "GPSDateStamp",
+)
+# RISK_FIELDS comes from the privacy risk rule table
+
+
+# Process-wide metadata cache (None → disabled)
+_cache = None
+
+
+def enable_cache(db_path=None, **options):
+    """
+    Route every extract_exif call through a persistent MetadataCache.
+    """
+    global _cache
+    _cache = MetadataCache(db_path, **options)
+    return _cache
+
+
+def get_cache():
+    return _cache
+
 
-def extract_exif(image_path):
+def extract_exif(image_path, fields=None, ifds=None, skip_blobs=False):
     """
-    Extract EXIF metadata using piexif for accurate GPS reading.
+    Extract EXIF metadata, served from the metadata cache when enabled.
+    Same arguments and result as _extract_exif.
     """
+    if _cache is None:
+        return _extract_exif(image_path, fields, ifds, skip_blobs)
+
+    try:
+        key = file_key(image_path, _cache.strict)
+    except OSError:
+        return _extract_exif(image_path, fields, ifds, skip_blobs)
+
+    # Different projections of the same file are cached separately
+    variant = repr((
+        sorted(fields) if fields is not None else None,
+        sorted(ifds) if ifds is not None else None,
+        bool(skip_blobs),
+    ))
+
+    metadata = _cache.get(key, variant)
+    if metadata is not None:
+        metrics.count("cache_hit")
+    else:
+        metrics.count("cache_miss")
+        metadata = _extract_exif(image_path, fields, ifds, skip_blobs)
+        # Failed / empty reads are not pinned: they may be transient, or
+        # readable by a later version (e.g. a newly supported format)
+        if metadata:
+            _cache.put(key, variant, metadata)
+    return metadata
+
+
+def _extract_exif(image_path, fields=None, ifds=None, skip_blobs=False):
+    """
+    Extract EXIF metadata for accurate GPS reading.
+    JPEG / TIFF go through the header-only reader; anything it
+    cannot handle (or fails to parse) falls back to piexif.
+
+    fields:     only return these tag names (e.g. DISPLAY_FIELDS)
+    ifds:       only parse these IFDs (default: inferred from fields)
+    skip_blobs: drop MakerNote-style UNDEFINED blobs and the thumbnail
+    """
+    if fields is not None:
+        fields = set(fields)
+        if ifds is None:
+            ifds = ifds_for_fields(fields)
+
     try:
-        exif_dict = piexif.load(image_path)  # TRUE EXIF extraction
-    except Exception as e:
-        print("[ERROR] Cannot load EXIF:", e)
-        return {}
+        exif_dict = load_exif(image_path, ifds, fields, skip_blobs)
+    except Exception:
+        # Only an error if piexif cannot read it either (counted below)
+        metrics.count("fallback")
+        exif_dict = None
+
+    if exif_dict is None:
+        try:
+            with metrics.stage("piexif"):
+                exif_dict = piexif.load(image_path)  # TRUE EXIF extraction
+        except Exception as e:
+            metrics.error(e)
+            print("[ERROR] Cannot load EXIF:", e, file=sys.stderr)
+            return {}
 
     metadata = {}
 
-    # Loop through all EXIF dictionaries
-    for ifd in ("0th", "Exif", "GPS", "1st"):
-        if ifd not in exif_dict:
+    # Loop through all requested EXIF dictionaries
+    for ifd in METADATA_IFDS:
+        if ifd not in exif_dict or (ifds is not None and ifd not in ifds):
             continue
 
+        table = IFD_TAGS[ifd]
         for tag_id, value in exif_dict[ifd].items():
-            tag_name = piexif.TAGS[ifd][tag_id]["name"]
+            tag_info = table.get(tag_id)
+            if tag_info is None:
+                continue
+            tag_name, tag_type, _ = tag_info
+            if fields is not None and tag_name not in fields:
+                continue
+            # The table type is what the tag should be; files may store
+            # it otherwise (e.g. SceneType as one SHORT → an int)
+            if (
+                skip_blobs
+                and tag_type == TYPE_UNDEFINED
+                and isinstance(value, (bytes, bytearray))
+                and len(value) > BLOB_LIMIT
+            ):
+                continue
             metadata[tag_name] = value
 
     return metadata
@@ -0,0 +1,253 @@
+import json
+import math
+
+import numpy as np
+
+
+EARTH_RADIUS_M = 6_371_008.8
+METERS_PER_DEG_LAT = math.pi * EARTH_RADIUS_M / 180.0
+
+# Grid cell size in degrees (~5.5 km of latitude)
+DEFAULT_CELL_DEG = 0.05
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """
+    Great-circle distance in metres (works on scalars or NumPy arrays).
+    """
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2.0) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2.0) ** 2
+    )
+    return 2.0 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def index_path_for(report_path):
+    """
+    report.json → report.geoindex.npz
+    """
+    base = report_path.rsplit(".", 1)[0] if "." in report_path else report_path
+    return base + ".geoindex.npz"
+
+
+def _iter_report(report_path):
+    """
+    (name, data) pairs from a JSON object report or an NDJSON report.
+    """
+    if report_path.lower().endswith((".ndjson", ".jsonl")):
+        with open(report_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    yield row.pop("Image", None), row
+    else:
+        with open(report_path, "r", encoding="utf-8") as f:
+            yield from json.load(f).items()
+
+
+class GeoIndex:
+    """
+    Uniform lat/lon grid over bulk GPS results.
+
+    Points are sorted by grid cell, so every query reads a handful of
+    contiguous slices (one per grid row) and filters them with vectorized
+    distance math. Saved as a plain .npz next to the report.
+    """
+
+    def __init__(self, names, lat, lon, cell_deg=DEFAULT_CELL_DEG):
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        names = np.asarray(names, dtype=str)
+
+        valid = (
+            ~np.isnan(lat) & ~np.isnan(lon)
+            & (np.abs(lat) <= 90.0) & (np.abs(lon) <= 180.0)
+        )
+        lat, lon, names = lat[valid], lon[valid], names[valid]
+
+        self.cell_deg = float(cell_deg)
+        self.n_rows = int(math.ceil(180.0 / self.cell_deg)) + 1
+        self.n_cols = int(math.ceil(360.0 / self.cell_deg)) + 1
+
+        keys = self._row(lat) * self.n_cols + self._col(lon)
+        order = np.argsort(keys, kind="stable")
+
+        self.keys = keys[order]
+        self.lat = lat[order]
+        self.lon = lon[order]
+        self.names = names[order]
+
+    def __len__(self):
+        return len(self.names)
+
+    # ---------- BUILD / PERSIST ----------
+    @classmethod
+    def from_records(cls, records, cell_deg=DEFAULT_CELL_DEG):
+        """
+        records: iterable of (name, data) with GPSLatitude / GPSLongitude.
+        """
+        names, lat, lon = [], [], []
+        for name, data in records:
+            la, lo = data.get("GPSLatitude"), data.get("GPSLongitude")
+            if isinstance(la, (int, float)) and isinstance(lo, (int, float)):
+                names.append(name)
+                lat.append(la)
+                lon.append(lo)
+        return cls(names, lat, lon, cell_deg)
+
+    @classmethod
+    def from_report(cls, report_path, cell_deg=DEFAULT_CELL_DEG):
+        return cls.from_records(_iter_report(report_path), cell_deg)
+
+    def save(self, path):
+        np.savez(
+            path,
+            cell_deg=self.cell_deg,
+            names=self.names,
+            lat=self.lat,
+            lon=self.lon,
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data["names"], data["lat"], data["lon"], float(data["cell_deg"]))
+
+    # ---------- GRID HELPERS ----------
+    def _row(self, lat):
+        return np.floor((np.asarray(lat) + 90.0) / self.cell_deg).astype(np.int64)
+
+    def _col(self, lon):
+        return np.floor((np.asarray(lon) + 180.0) / self.cell_deg).astype(np.int64)
+
+    def _col_ranges(self, min_lon, max_lon):
+        """
+        Column ranges covering [min_lon, max_lon], split at the antimeridian.
+        """
+        if max_lon - min_lon >= 360.0:
+            return [(0, self.n_cols - 1)]
+        if min_lon < -180.0:
+            return self._col_ranges(min_lon + 360.0, 180.0) + self._col_ranges(-180.0, max_lon)
+        if max_lon > 180.0:
+            return self._col_ranges(min_lon, 180.0) + self._col_ranges(-180.0, max_lon - 360.0)
+        return [(int(self._col(min_lon)), int(self._col(max_lon)))]
+
+    def _candidates(self, min_lat, max_lat, col_ranges):
+        """
+        Indices of points whose cells fall inside the row / column ranges.
+        """
+        row0 = max(int(self._row(max(min_lat, -90.0))), 0)
+        row1 = min(int(self._row(min(max_lat, 90.0))), self.n_rows - 1)
+
+        slices = []
+        for row in range(row0, row1 + 1):
+            base = row * self.n_cols
+            for c0, c1 in col_ranges:
+                lo = np.searchsorted(self.keys, base + c0, side="left")
+                hi = np.searchsorted(self.keys, base + c1, side="right")
+                if hi > lo:
+                    slices.append(np.arange(lo, hi))
+
+        if not slices:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(slices)
+
+    # ---------- QUERIES ----------
+    def bbox(self, min_lat, min_lon, max_lat, max_lon):
+        """
+        Names inside the box. min_lon > max_lon means the box crosses
+        the antimeridian.
+        """
+        if min_lon > max_lon:
+            ranges = self._col_ranges(min_lon, max_lon + 360.0)
+        else:
+            ranges = self._col_ranges(min_lon, max_lon)
+
+        idx = self._candidates(min_lat, max_lat, ranges)
+        lat, lon = self.lat[idx], self.lon[idx]
+
+        inside = (lat >= min_lat) & (lat <= max_lat)
+        if min_lon > max_lon:
+            inside &= (lon >= min_lon) | (lon <= max_lon)
+        else:
+            inside &= (lon >= min_lon) & (lon <= max_lon)
+
+        return self.names[idx[inside]].tolist()
+
+    def radius(self, lat, lon, meters):
+        """
+        [(name, distance_m)] within `meters` of (lat, lon), nearest first.
+        """
+        dlat = meters / METERS_PER_DEG_LAT
+        cos_lat = math.cos(math.radians(min(abs(lat) + dlat, 90.0)))
+        if cos_lat < 1e-6:
+            ranges = [(0, self.n_cols - 1)]
+        else:
+            dlon = meters / (METERS_PER_DEG_LAT * cos_lat)
+            ranges = self._col_ranges(lon - dlon, lon + dlon)
+
+        idx = self._candidates(lat - dlat, lat + dlat, ranges)
+        dist = haversine_m(lat, lon, self.lat[idx], self.lon[idx])
+
+        hit = dist <= meters
+        idx, dist = idx[hit], dist[hit]
+        order = np.argsort(dist, kind="stable")
+
+        return [(str(self.names[i]), float(d)) for i, d in zip(idx[order], dist[order])]
+
+    def nearest(self, lat, lon, k=10):
+        """
+        The k nearest [(name, distance_m)], nearest first.
+        Searches growing radii, then falls back to a full scan.
+        """
+        if len(self) == 0 or k <= 0:
+            return []
+
+        meters = self.cell_deg * METERS_PER_DEG_LAT
+        while meters < math.pi * EARTH_RADIUS_M:
+            found = self.radius(lat, lon, meters)
+            if len(found) >= k:
+                return found[:k]
+            meters *= 4
+
+        dist = haversine_m(lat, lon, self.lat, self.lon)
+        order = np.argsort(dist, kind="stable")[:k]
+        return [(str(self.names[i]), float(dist[i])) for i in order]
+
+
+if __name__ == "__main__":
+    import sys
+
+    usage = (
+        "Usage:\n"
+        "  python geo_index.py build <report.json|report.ndjson>\n"
+        "  python geo_index.py radius <index.npz> <lat> <lon> <meters>\n"
+        "  python geo_index.py bbox <index.npz> <min_lat> <min_lon> <max_lat> <max_lon>\n"
+        "  python geo_index.py nearest <index.npz> <lat> <lon> [k]"
+    )
+    if len(sys.argv) < 3:
+        print(usage)
+        sys.exit(1)
+
+    command, target, *numbers = sys.argv[1:]
+    numbers = [float(n) for n in numbers]
+
+    if command == "build":
+        index = GeoIndex.from_report(target)
+        out = index_path_for(target)
+        index.save(out)
+        print(f"Indexed {len(index)} GPS-tagged images → {out}")
+    elif command == "radius" and len(numbers) == 3:
+        for name, dist in GeoIndex.load(target).radius(*numbers):
+            print(f"{dist:12.1f} m  {name}")
+    elif command == "bbox" and len(numbers) == 4:
+        for name in GeoIndex.load(target).bbox(*numbers):
+            print(name)
+    elif command == "nearest" and len(numbers) in (2, 3):
+        k = int(numbers[2]) if len(numbers) == 3 else 10
+        for name, dist in GeoIndex.load(target).nearest(numbers[0], numbers[1], k):
+            print(f"{dist:12.1f} m  {name}")
+    else:
+        print(usage)
+        sys.exit(1)
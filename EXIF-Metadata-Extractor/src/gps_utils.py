@@ -1,4 +1,12 @@
-from PIL.ExifTags import GPSTAGS
+from array import array
+from datetime import date
+from itertools import chain, repeat, starmap
+from operator import eq, is_, is_not, itemgetter, truediv
+
+
+EPOCH_DATE = date(1970, 1, 1)
+
+NAN = float("nan")
 
 
 def extract_gps(exif):
@@ -68,3 +76,261 @@ def get_lat_long(gps):
         lon = -lon
 
     return lat, lon
+
+
+def _decode_ref(ref):
+    if isinstance(ref, bytes):
+        return ref.decode(errors="ignore")
+    return ref
+
+
+def get_altitude(exif):
+    """
+    Altitude in metres (negative below sea level).
+    Returns None if missing or corrupted.
+    """
+    if "GPSAltitude" not in exif:
+        return None
+    try:
+        alt = _safe_rational(exif["GPSAltitude"])
+    except (TypeError, ValueError):
+        return None
+    if alt is None:
+        return None
+
+    if exif.get("GPSAltitudeRef") in (1, b"\x01"):
+        alt = -alt
+    return alt
+
+
+def _epoch_day(date_stamp):
+    """
+    b"YYYY:MM:DD" → days since 1970-01-01, or None.
+    """
+    try:
+        text = _decode_ref(date_stamp).strip("\x00 ")
+        y, m, d = (int(part) for part in text.split(":"))
+        return (date(y, m, d) - EPOCH_DATE).days
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def get_gps_timestamp(exif):
+    """
+    GPSDateStamp + GPSTimeStamp as UTC seconds since the Unix epoch.
+    Returns None if either part is missing or corrupted.
+    """
+    if "GPSDateStamp" not in exif or "GPSTimeStamp" not in exif:
+        return None
+
+    days = _epoch_day(exif["GPSDateStamp"])
+    if days is None:
+        return None
+
+    try:
+        h, m, s = (_safe_rational(r) for r in exif["GPSTimeStamp"])
+    except (TypeError, ValueError):
+        return None
+    if h is None or m is None or s is None:
+        return None
+
+    return days * 86400.0 + h * 3600.0 + m * 60.0 + s
+
+
+# -------------------------------------------------
+# BATCH CONVERSION (NUMPY ARRAYS OUT)
+# -------------------------------------------------
+# Values converted per np.fromiter call; a chunk holding a zero
+# denominator or malformed pair is redone on the slower resuming path
+BATCH_CHUNK = 1024
+
+EMPTY_DMS = ((0, 1), (0, 1), (0, 1))
+
+# Stand-in for None records (masked out afterwards)
+_NO_GPS = {
+    "GPSLatitude": EMPTY_DMS, "GPSLatitudeRef": "",
+    "GPSLongitude": EMPTY_DMS, "GPSLongitudeRef": "",
+}
+
+_COORDS = itemgetter("GPSLatitude", "GPSLongitude")
+
+
+def _has_len(value, count):
+    try:
+        return len(value) == count
+    except TypeError:
+        return False
+
+
+def _pairs(chunk, count):
+    return chain.from_iterable(chunk) if count > 1 else iter(chunk)
+
+
+def _divide_resuming(pairs):
+    """
+    num / den per pair into an array buffer. A zero denominator or
+    malformed pair raises out of extend(); what was divided so far is
+    kept, the pair becomes NaN and the same iterator carries on.
+    """
+    out = array("d")
+    parts = starmap(truediv, pairs)
+    while True:
+        try:
+            out.extend(parts)
+            return out
+        except (ArithmeticError, TypeError):
+            out.append(NAN)
+
+
+def _rationals_batch(values, count):
+    """
+    Rational values → (n, count) float64 array of num / den.
+    count == 1: each value is a single (num, den) pair; otherwise a
+    tuple of `count` pairs (e.g. DMS). Zero denominators and malformed
+    values become NaN.
+
+    The division runs in C (starmap(truediv) into np.fromiter), so
+    well-formed chunks run no per-pair Python code.
+    """
+    import numpy as np
+
+    if count > 1:
+        # A short row followed by a long one would shift every later
+        # pair, so rows of the wrong shape are replaced up front
+        try:
+            well_formed = set(map(len, values)) <= {count}
+        except TypeError:
+            well_formed = False
+        if not well_formed:
+            bad = ((0, 0),) * count
+            values = [value if _has_len(value, count) else bad for value in values]
+
+    out = np.empty(len(values) * count, dtype=np.float64)
+    for start in range(0, len(values), BATCH_CHUNK):
+        chunk = values[start:start + BATCH_CHUNK]
+        size = len(chunk) * count
+        target = out[start * count:start * count + size]
+        try:
+            target[:] = np.fromiter(
+                starmap(truediv, _pairs(chunk, count)), dtype=np.float64, count=size
+            )
+        except (ArithmeticError, TypeError):
+            target[:] = np.frombuffer(_divide_resuming(_pairs(chunk, count)), dtype=np.float64)
+    return out.reshape(-1, count)
+
+
+def _ref_is(records, key, expected):
+    import numpy as np
+
+    refs = map(itemgetter(key), records)
+    return np.fromiter(map(eq, refs, repeat(expected)), dtype=bool, count=len(records))
+
+
+def _degrees_resuming(values):
+    """
+    _convert_to_degrees over many DMS values into an array buffer (NaN =
+    invalid). The arithmetic is inlined in one generator, so extend()
+    runs it without a Python call per value. Zero denominators are
+    checked inline (raising is far slower); a malformed value raises
+    out of it, is redone through the scalar function and the same
+    iterator carries on.
+    """
+    out = array("d")
+    rows = iter(values)
+    while True:
+        try:
+            # Same operation order as _convert_to_degrees → identical results
+            out.extend(
+                d0 / d1 + (m0 / m1) / 60.0 + (s0 / s1) / 3600.0
+                if d1 and m1 and s1 else NAN
+                for (d0, d1), (m0, m1), (s0, s1) in rows
+            )
+            return out
+        except (ArithmeticError, TypeError, ValueError):
+            try:
+                degrees = _convert_to_degrees(values[len(out)])
+            except (TypeError, ValueError, IndexError):
+                degrees = None
+            out.append(NAN if degrees is None else degrees)
+
+
+def get_lat_long_batch(gps_records):
+    """
+    get_lat_long over many extract_gps() results → (lat, lon) float64
+    arrays; None records and corrupt values (zero denominators,
+    malformed DMS) are NaN in both arrays.
+
+    The DMS → degrees step is one C-driven pass over the Python tuples
+    (see _degrees_resuming), not a numpy division: flattening the
+    tuples into arrays first costs more than the arithmetic it saves,
+    so this is about as fast as the scalar loop. Refs and masking are
+    numpy.
+    """
+    import numpy as np
+
+    n = len(gps_records)
+    records = gps_records
+    valid = np.ones(n, dtype=bool)
+    if None in gps_records:
+        valid = np.fromiter(map(is_not, gps_records, repeat(None)), dtype=bool, count=n)
+        records = [gps or _NO_GPS for gps in gps_records]
+
+    # [lat DMS, lon DMS, lat DMS, ...] → (n, 2) degrees in one pass
+    coords = list(chain.from_iterable(map(_COORDS, records)))
+    degrees = np.frombuffer(_degrees_resuming(coords), dtype=np.float64).reshape(n, 2)
+    lat, lon = degrees[:, 0], degrees[:, 1]
+
+    lat = np.where(_ref_is(records, "GPSLatitudeRef", "N"), lat, -lat)
+    lon = np.where(_ref_is(records, "GPSLongitudeRef", "E"), lon, -lon)
+
+    # get_lat_long drops both values if either one is invalid
+    valid &= ~np.isnan(lat) & ~np.isnan(lon)
+    lat[~valid] = np.nan
+    lon[~valid] = np.nan
+
+    return lat, lon
+
+
+def get_altitude_batch(exif_records):
+    """
+    Vectorized get_altitude over many EXIF dicts → float64 array (NaN = missing).
+    """
+    import numpy as np
+
+    raw = [exif.get("GPSAltitude") if exif else None for exif in exif_records]
+    # Missing values get a harmless placeholder (keeps the chunk on the
+    # fast path) and are masked to NaN afterwards
+    alt = _rationals_batch([r if r is not None else (0, 1) for r in raw], 1)[:, 0]
+    alt[np.fromiter(map(is_, raw, repeat(None)), dtype=bool, count=len(raw))] = np.nan
+
+    below = np.array(
+        [bool(exif) and exif.get("GPSAltitudeRef") in (1, b"\x01") for exif in exif_records],
+        dtype=bool
+    )
+    return np.where(below, -alt, alt)
+
+
+def get_gps_timestamp_batch(exif_records):
+    """
+    Vectorized get_gps_timestamp → float64 UTC epoch seconds (NaN = missing).
+    """
+    import numpy as np
+
+    days = np.array(
+        [
+            _epoch_day(exif["GPSDateStamp"])
+            if exif and "GPSDateStamp" in exif and "GPSTimeStamp" in exif
+            else None
+            for exif in exif_records
+        ],
+        dtype=np.float64
+    )
+
+    times = [
+        exif["GPSTimeStamp"] if exif and "GPSTimeStamp" in exif else EMPTY_DMS
+        for exif in exif_records
+    ]
+    # Missing stamps are already NaN in days
+    hms = _rationals_batch(times, 3)
+
+    return days * 86400.0 + hms[:, 0] * 3600.0 + hms[:, 1] * 60.0 + hms[:, 2]
@@ -1,16 +1,41 @@
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
-from PIL import Image
 import webbrowser
 import json
 import os
 import csv
-import piexif
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
+import queue
+import threading
+import time
+import importlib.util
 
-from extractor import extract_exif
+from extractor import extract_exif, DISPLAY_FIELDS, GPS_FIELDS, RISK_FIELDS
 from gps_utils import extract_gps, get_lat_long
+from privacy_risk import DEFAULT_ENGINE as RISK_ENGINE
+from bulk_engine import run_bulk, report_key
+from scanner import scan_images, IMAGE_EXTENSIONS
+from metadata_cache import default_cache_path
+from report_writers import open_report_writer, CSVStreamWriter
+from bulk_cleaner import run_clean, CleanStats
+from exif_strip import strip_metadata
+from results_store import ResultStore
+import metrics
+from tag_table import normalize_value
+
+# How often background results are drained into the UI (ms)
+POLL_MS = 100
+
+
+def read_display_exif(path):
+    """
+    Only the tags the main window shows or scores.
+    Safe to call from a worker thread.
+    """
+    return extract_exif(
+        path,
+        fields=DISPLAY_FIELDS + GPS_FIELDS + RISK_FIELDS,
+        skip_blobs=True
+    )
 
 
 class ModernEXIF_GUI(ctk.CTk):
@@ -30,6 +55,12 @@ class ModernEXIF_GUI(ctk.CTk):
         self.current_image_path = None
         self.safe_mode = ctk.BooleanVar(value=True)
 
+        # ---- BACKGROUND LOADING ----
+        # Each selection gets a new token; results for older tokens are dropped
+        self.load_token = 0
+        self.load_queue = queue.Queue()
+        self.polling = False
+
         self.build_ui()
         self.mainloop()
 
@@ -96,25 +127,66 @@ class ModernEXIF_GUI(ctk.CTk):
     # IMAGE HANDLING
     # -------------------------------------------------
     def load_image(self, path):
+        """
+        Decode the preview and parse EXIF on a worker thread.
+        A newer selection supersedes any load still in flight.
+        """
         self.current_image_path = path
+        self.load_token += 1
+        token = self.load_token
+
+        threading.Thread(
+            target=self._load_worker,
+            args=(token, path),
+            daemon=True
+        ).start()
+
+        if not self.polling:
+            self.polling = True
+            self.after(POLL_MS, self._poll_load_queue)
+
+    def _load_worker(self, token, path):
+        # ⚠️ Runs off the Tk thread: no widget access here
         try:
-            img = Image.open(path)
-            img.thumbnail((300, 300))
+            # PIL is only loaded once an image is opened
+            from preview import load_preview
+            img = load_preview(path, (300, 300))
+            exif = read_display_exif(path)
+            self.load_queue.put((token, path, img, exif, None))
+        except Exception as e:
+            self.load_queue.put((token, path, None, None, e))
+
+    def _poll_load_queue(self):
+        latest = None
+        while True:
+            try:
+                item = self.load_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item[0] == self.load_token:
+                latest = item
+
+        if latest is not None:
+            self.polling = False
+            self._show_loaded_image(*latest)
+        else:
+            self.after(POLL_MS, self._poll_load_queue)
 
-            ctk_img = ctk.CTkImage(
-                light_image=img,
-                dark_image=img,
-                size=(300, 300)
-            )
+    def _show_loaded_image(self, token, path, img, exif, error):
+        if error is not None:
+            messagebox.showerror("Error", f"Failed to load image:\n{error}")
+            return
 
-            self.preview_area.configure(image=ctk_img, text="")
-            self.preview_area.image = ctk_img
+        ctk_img = ctk.CTkImage(
+            light_image=img,
+            dark_image=img,
+            size=(300, 300)
+        )
 
-            # 🔥 THIS WAS THE MISSING LINK
-            self.extract_metadata(path)
+        self.preview_area.configure(image=ctk_img, text="")
+        self.preview_area.image = ctk_img
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load image:\n{e}")
+        self.show_metadata(exif)
 
     def select_image(self):
         path = filedialog.askopenfilename(
@@ -129,7 +201,7 @@ class ModernEXIF_GUI(ctk.CTk):
         # Handle only files (not folders)
         if os.path.isfile(path):
             ext = os.path.splitext(path)[1].lower()
-            if ext in (".jpg", ".jpeg", ".png", ".bmp", ".heic"):
+            if ext in IMAGE_EXTENSIONS:
                 self.load_image(path)
             else:
                 messagebox.showwarning(
@@ -184,8 +256,9 @@ class ModernEXIF_GUI(ctk.CTk):
     # METADATA EXTRACTION
     # -------------------------------------------------
     def extract_metadata(self, path):
-        exif = extract_exif(path)
+        self.show_metadata(read_display_exif(path))
 
+    def show_metadata(self, exif):
         # ---------- HARD RESET (prevents stale UI/state) ----------
         self.metadata_box.delete("1.0", "end")
         self.last_metadata.clear()
@@ -219,15 +292,10 @@ class ModernEXIF_GUI(ctk.CTk):
 
         for k in keys:
             if k in exif:
-                v = exif[k]
-
-                if isinstance(v, bytes):
-                    v = v.decode(errors="ignore")
-                elif isinstance(v, tuple) and len(v) == 2 and v[1] != 0:
-                    v = v[0] / v[1]
+                v = normalize_value(exif[k], k)
 
                 self.last_metadata[k] = v
-                self.metadata_box.insert("end", f"{k:20}: {v}\n")
+                self.metadata_box.insert("end", f"{k:20}: {'Invalid' if v is None else v}\n")
 
 
         # ---------- GPS METADATA ----------
@@ -252,7 +320,8 @@ class ModernEXIF_GUI(ctk.CTk):
 
 
         # ---------- PRIVACY RISK (ONLY NOW) ----------
-        self.calculate_privacy_risk(exif)
+        # Reuses the coordinates decoded above
+        self.calculate_privacy_risk(exif, self.current_coords)
 
         # ---------- EXPORTS ----------
         self.export_btn.configure(state="normal")
@@ -262,10 +331,11 @@ class ModernEXIF_GUI(ctk.CTk):
         # -------------------------------------------------
         # PRIVACY RISK SCORING
         # -------------------------------------------------
-    def calculate_privacy_risk(self, exif):
+    def calculate_privacy_risk(self, exif, coords=None):
         """
         Calculates privacy risk ONLY if valid EXIF metadata exists.
         Resets state completely if EXIF is empty or missing.
+        coords: (lat, lon) already decoded by show_metadata, or None.
         """
 
         # ---------- HARD RESET (prevents state leakage) ----------
@@ -273,83 +343,22 @@ class ModernEXIF_GUI(ctk.CTk):
 
         # EXIF missing or empty → ZERO risk
         if not exif or not isinstance(exif, dict) or len(exif) == 0:
-            self.privacy_label.configure(
-                text="🟢 Privacy Risk: 0/10 (LOW)"
-            )
-
-            self.map_btn.configure(state="disabled")
-
-            # Store explicit zero-risk state
-            self.last_metadata["PrivacyRiskScore"] = 0
-            self.last_metadata["PrivacyRiskLevel"] = "LOW"
-            self.last_metadata["PrivacyRiskReasons"] = [
-                "No EXIF metadata present"
-            ]
+            coords = None
 
-            return  # ⛔ STOP HERE — do NOT continue
+        # ---------- SHARED RULE-TABLE ENGINE ----------
+        score, level, reasons = RISK_ENGINE.score(exif, has_gps=coords is not None)
 
-
-        # ---------- ACTUAL RISK ANALYSIS ----------
-        score = 0
-        reasons = []
-
-        # --- GPS (highest risk) ---
-        gps = extract_gps(exif)
-        lat, lon = get_lat_long(gps) if gps else (None, None)
-        if lat is not None and lon is not None:
-            score += 6
-            reasons.append("Exact GPS location present")
-            self.current_coords = (lat, lon)
+        if coords is not None:
+            self.current_coords = coords
             self.map_btn.configure(state="normal")
         else:
             self.map_btn.configure(state="disabled")
 
-        # --- Device identity ---
-        if "Make" in exif or "Model" in exif:
-            score += 2
-            reasons.append("Camera make/model present")
-
-        # --- Time correlation ---
-        if "DateTimeOriginal" in exif:
-            score += 1
-            reasons.append("Original capture time present")
-
-        # --- Software fingerprint ---
-        if "Software" in exif:
-            score += 1
-            reasons.append("Editing software identified")
-
-        # --- Sensitive identifiers ---
-        sensitive_tags = {
-            "Artist",
-            "OwnerName",
-            "Copyright",
-            "BodySerialNumber",
-            "LensSerialNumber"
-        }
-
-        for tag in sensitive_tags:
-            if tag in exif:
-                score += 2
-                reasons.append(f"Sensitive identifier: {tag}")
-
-        # --- Clamp score ---
-        score = min(score, 10)
-
-        # --- Risk level ---
-        if score >= 7:
-            level = "HIGH"
-            emoji = "🔴"
-        elif score >= 4:
-            level = "MEDIUM"
-            emoji = "🟡"
-        else:
-            level = "LOW"
-            emoji = "🟢"
+        emoji = {"HIGH": "🔴", "MEDIUM": "🟡"}.get(level, "🟢")
 
         # ---------- FINAL UI + STATE UPDATE ----------
         self.privacy_label.configure(
-            text=f"{emoji} Privacy Risk: {score}/10 ({level})"
+            text=f"{emoji} Privacy Risk: {score}/{RISK_ENGINE.max_score} ({level})"
         )
 
         self.last_metadata["PrivacyRiskScore"] = score
@@ -366,19 +375,18 @@ class ModernEXIF_GUI(ctk.CTk):
             return
 
         report = {}
-        for file in os.listdir(folder):
-            if file.lower().endswith((".jpg", ".jpeg", ".png", ".bmp", ".heic")):
-                path = os.path.join(folder, file)
-                exif = extract_exif(path)
-                if exif:
-                    gps = extract_gps(exif)
-                    lat, lon = get_lat_long(gps) if gps else (None, None)
-                    report[file] = {
-                        "Make": exif.get("Make"),
-                        "Model": exif.get("Model"),
-                        "GPSLatitude": lat,
-                        "GPSLongitude": lon
-                    }
+        for path in scan_images(folder):
+            file = report_key(folder, path)
+            exif = extract_exif(path, fields=("Make", "Model") + GPS_FIELDS)
+            if exif:
+                gps = extract_gps(exif)
+                lat, lon = get_lat_long(gps) if gps else (None, None)
+                report[file] = {
+                    "Make": exif.get("Make"),
+                    "Model": exif.get("Model"),
+                    "GPSLatitude": lat,
+                    "GPSLongitude": lon
+                }
 
         save = filedialog.asksaveasfilename(defaultextension=".json")
         if save:
@@ -412,7 +420,8 @@ class ModernEXIF_GUI(ctk.CTk):
             # Save original snapshot BEFORE cleaning
             self.original_metadata = self.last_metadata.copy()
 
-            piexif.remove(self.current_image_path, save_path)
+            # Splices out the EXIF segment; pixels are never re-encoded
+            strip_metadata(self.current_image_path, save_path)
 
             # Read cleaned metadata
             cleaned_exif = extract_exif(save_path)
@@ -454,28 +463,276 @@ class ModernEXIF_GUI(ctk.CTk):
             )
             return
 
-        c = canvas.Canvas(path, pagesize=A4)
-        text = c.beginText(40, 800)
-        text.setFont("Helvetica", 10)
-        text.textLine("EXIF METADATA REPORT\n")
+        from pdf_report import export_metadata_pdf
+        export_metadata_pdf(
+            path,
+            os.path.basename(self.current_image_path or ""),
+            self.last_metadata
+        )
+        messagebox.showinfo("Success", "PDF exported")
 
-        for k, v in self.last_metadata.items():
-            text.textLine(f"{k}: {v}")
+class ResultsGrid(ctk.CTkFrame):
+    """
+    Virtualized results table over a ResultStore.
+
+    A fixed pool of canvas rows (one per visible line) is refilled from
+    the store on every scroll, so drawing cost does not depend on how
+    many results there are. Click a header to sort (again to reverse),
+    type to filter, double-click a row to open it in the main window.
+    """
+
+    # (store column, header, width in px)
+    COLUMNS = (
+        ("name", "Image", 380),
+        ("model", "Model", 160),
+        ("date", "Captured", 150),
+        ("risk", "Risk", 110),
+    )
+    ROW_HEIGHT = 20
+    FONT = ("Segoe UI", 11)
+    CHAR_WIDTH = 7  # rough px per character, for clipping cells
+
+    BG = "gray14"
+    ALT_BG = "gray17"
+    SELECTED_BG = "#1f6aa5"
+    TEXT = "gray90"
+    RISK_TEXT = {"HIGH": "#e05555", "MEDIUM": "#f0a030", "LOW": "#5cb85c", "ERROR": "gray55"}
+
+    # While results stream in, re-sort / re-filter at most this often
+    # (and at most ~10% of the time for very large result sets)
+    REQUERY_MS = 1000
+
+    def __init__(self, master, store, on_open, **kwargs):
+        super().__init__(master, **kwargs)
+        self.store = store
+        self.on_open = on_open
+
+        self.sort = None
+        self.descending = False
+        self.filter_text = ""
+        self.view = range(0)      # store row indices in display order
+        self.top = 0              # view position of the first visible row
+        self.selected = None      # store row index
+        self.pool = []            # (background rect, [cell text ids]) per visible row
+        self.next_query = 0.0
+        self.filter_job = None
+
+        # ---- FILTER BAR ----
+        bar = ctk.CTkFrame(self, fg_color="transparent")
+        bar.pack(fill="x")
+        self.filter_entry = ctk.CTkEntry(
+            bar,
+            placeholder_text="Filter by name, model or risk level",
+            width=360
+        )
+        self.filter_entry.pack(side="left")
+        self.filter_entry.bind("<KeyRelease>", self._on_filter_key)
+        self.count_label = ctk.CTkLabel(bar, text="0 results")
+        self.count_label.pack(side="left", padx=10)
+
+        # ---- HEADER ----
+        header = ctk.CTkFrame(self, fg_color="transparent")
+        header.pack(fill="x", pady=(6, 0))
+        self.header_buttons = {}
+        for key, title, width in self.COLUMNS:
+            btn = ctk.CTkButton(
+                header,
+                text=title,
+                width=width,
+                height=24,
+                anchor="w",
+                corner_radius=0,
+                fg_color="gray25",
+                hover_color="gray30",
+                command=lambda k=key: self.sort_by(k)
+            )
+            btn.pack(side="left")
+            self.header_buttons[key] = btn
+
+        # ---- ROWS ----
+        body = ctk.CTkFrame(self, fg_color="transparent")
+        body.pack(fill="both", expand=True)
+        self.canvas = ctk.CTkCanvas(body, bg=self.BG, highlightthickness=0)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar = ctk.CTkScrollbar(body, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.canvas.bind("<Configure>", self._on_resize)
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+        self.canvas.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.canvas.bind("<Button-5>", lambda e: self.scroll(3))
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<Double-Button-1>", self._on_double_click)
+
+    # ---------- DATA ----------
+    def refresh(self, force=False):
+        """
+        Pick up new rows. Unsorted / unfiltered views are a plain range
+        and always current; otherwise re-querying is throttled.
+        """
+        if self.sort is None and not self.filter_text:
+            self.view = self.store.query()
+        else:
+            start = time.monotonic()
+            if not force and start < self.next_query:
+                return
+            self.view = self.store.query(self.sort, self.descending, self.filter_text)
+            took = time.monotonic() - start
+            self.next_query = start + max(self.REQUERY_MS / 1000, took * 10)
+        self.redraw()
+
+    def reset(self):
+        self.selected = None
+        self.top = 0
+        self.refresh(force=True)
+
+    def sort_by(self, key):
+        if self.sort == key:
+            self.descending = not self.descending
+        else:
+            # Highest risk / newest first is the useful default
+            self.sort = key
+            self.descending = key in ("risk", "date")
+
+        for column, title, _ in self.COLUMNS:
+            arrow = (" ▼" if self.descending else " ▲") if column == key else ""
+            self.header_buttons[column].configure(text=title + arrow)
+        self.top = 0
+        self.refresh(force=True)
+
+    def _on_filter_key(self, event=None):
+        # Debounced: filtering 500k rows on every keystroke would lag typing
+        if self.filter_job is not None:
+            self.after_cancel(self.filter_job)
+        self.filter_job = self.after(250, self._apply_filter)
+
+    def _apply_filter(self):
+        self.filter_job = None
+        self.filter_text = self.filter_entry.get()
+        self.top = 0
+        self.refresh(force=True)
+
+    # ---------- DRAWING ----------
+    def _visible_rows(self):
+        # The last pooled row is usually cut off by the canvas edge
+        return max(len(self.pool) - 1, 1)
+
+    def _on_resize(self, event):
+        rows = event.height // self.ROW_HEIGHT + 1
+
+        while len(self.pool) < rows:
+            y = len(self.pool) * self.ROW_HEIGHT
+            rect = self.canvas.create_rectangle(
+                0, y, 10000, y + self.ROW_HEIGHT, width=0, fill=self.BG
+            )
+            cells = []
+            x = 6
+            for _, _, width in self.COLUMNS:
+                cells.append(self.canvas.create_text(
+                    x, y + self.ROW_HEIGHT / 2, anchor="w",
+                    fill=self.TEXT, font=self.FONT, text=""
+                ))
+                x += width
+            self.pool.append((rect, cells))
+
+        while len(self.pool) > rows:
+            rect, cells = self.pool.pop()
+            self.canvas.delete(rect, *cells)
+
+        self.redraw()
+
+    def redraw(self):
+        total = len(self.view)
+        self.top = max(0, min(self.top, total - self._visible_rows()))
+
+        for slot, (rect, cells) in enumerate(self.pool):
+            pos = self.top + slot
+            if pos >= total:
+                self.canvas.itemconfigure(rect, fill=self.BG)
+                for cell in cells:
+                    self.canvas.itemconfigure(cell, text="")
+                continue
+
+            i = self.view[pos]
+            if i == self.selected:
+                bg = self.SELECTED_BG
+            else:
+                bg = self.ALT_BG if pos % 2 else self.BG
+            self.canvas.itemconfigure(rect, fill=bg)
+
+            for cell, text, (_, _, width) in zip(cells, self.store.row(i), self.COLUMNS):
+                limit = width // self.CHAR_WIDTH - 1
+                if len(text) > limit:
+                    text = text[:limit - 1] + "…"
+                self.canvas.itemconfigure(cell, text=text)
+            self.canvas.itemconfigure(
+                cells[-1], fill=self.RISK_TEXT.get(self.store.levels[i], self.TEXT)
+            )
+
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + self._visible_rows()) / total))
+        else:
+            self.scrollbar.set(0, 1)
+
+        stored = len(self.store)
+        self.count_label.configure(
+            text=f"{total:,} results" if total == stored else f"{total:,} of {stored:,} results"
+        )
+
+    # ---------- SCROLLING / SELECTION ----------
+    def scroll(self, rows):
+        self.top += rows
+        self.redraw()
+
+    def _on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self.view))
+            self.redraw()
+        elif args[0] == "scroll":
+            step = int(args[1])
+            self.scroll(step * self._visible_rows() if args[2] == "pages" else step)
+
+    def _on_wheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+
+    def _row_at(self, event):
+        pos = self.top + event.y // self.ROW_HEIGHT
+        return self.view[pos] if pos < len(self.view) else None
+
+    def _on_click(self, event):
+        self.selected = self._row_at(event)
+        self.redraw()
+
+    def _on_double_click(self, event):
+        i = self._row_at(event)
+        if i is not None:
+            self.on_open(self.store.path(i))
 
-        c.drawText(text)
-        c.showPage()
-        c.save()
-        messagebox.showinfo("Success", "PDF exported")
 
 class BulkUploadWindow(ctk.CTkToplevel):
     def __init__(self, parent):
         super().__init__(parent)
         self.title("Bulk Upload – Folder Processing")
-        self.geometry("800x550")
+        self.geometry("900x820")
         self.parent = parent
-        self.resizable(False, False)
+        self.minsize(900, 700)
+
+        # ---- BACKGROUND JOB STATE ----
+        self.worker = None
+        self.cancel_event = threading.Event()
+        self.result_queue = queue.Queue()
+        self.save_path = ""
+        self.image_count = 0
+        self.total_count = 0
+        self.scan_done = False
+        self.cache_hits = 0
+        self.clean_stats = None
+        self.clean_root = ""
+        self.run_stats = None
+        self.results = ResultStore()
 
         self.build_ui()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
 
     def build_ui(self):
         ctk.CTkLabel(
@@ -484,116 +741,393 @@ class BulkUploadWindow(ctk.CTkToplevel):
             font=("Segoe UI", 22, "bold")
         ).pack(pady=15)
 
-        ctk.CTkButton(
-            self,
+        buttons = ctk.CTkFrame(self, fg_color="transparent")
+        buttons.pack(pady=10)
+
+        self.select_btn = ctk.CTkButton(
+            buttons,
             text="Select Folder",
             command=self.process_folder,
             width=220,
             height=40
-        ).pack(pady=10)
+        )
+        self.select_btn.pack(side="left", padx=8)
 
+        self.clean_btn = ctk.CTkButton(
+            buttons,
+            text="Clean Folder (Strip Metadata)",
+            command=self.clean_folder,
+            width=220,
+            height=40
+        )
+        self.clean_btn.pack(side="left", padx=8)
+
+        self.cancel_btn = ctk.CTkButton(
+            buttons,
+            text="Cancel",
+            command=self.cancel_processing,
+            width=120,
+            height=40,
+            state="disabled"
+        )
+        self.cancel_btn.pack(side="left", padx=8)
+
+        # ---- PDF REPORT OPTIONS ----
+        pdf_options = ctk.CTkFrame(self, fg_color="transparent")
+        pdf_options.pack()
+
+        self.pdf_report = ctk.BooleanVar(value=False)
+        self.pdf_thumbnails = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(
+            pdf_options,
+            text="Also write PDF report",
+            variable=self.pdf_report
+        ).pack(side="left", padx=8)
+        ctk.CTkCheckBox(
+            pdf_options,
+            text="Thumbnails in PDF",
+            variable=self.pdf_thumbnails
+        ).pack(side="left", padx=8)
+
+        self.progress = ctk.CTkProgressBar(self, width=820)
+        self.progress.set(0)
+        self.progress.pack(padx=20, pady=(5, 0))
+
+        self.progress_label = ctk.CTkLabel(self, text="Idle")
+        self.progress_label.pack(pady=(2, 0))
+
+        # One row per image: rendered on demand, sortable, filterable
+        self.grid_view = ResultsGrid(
+            self,
+            self.results,
+            on_open=self.open_result,
+            fg_color="transparent"
+        )
+        self.grid_view.pack(padx=20, pady=(10, 0), fill="both", expand=True)
+
+        # Run summaries and problems only; per-image rows live in the grid
         self.status_box = ctk.CTkTextbox(
             self,
-            width=720,
-            height=360,
+            width=820,
+            height=140,
             font=("Consolas", 13)
         )
-        self.status_box.pack(padx=20, pady=15)
+        self.status_box.pack(padx=20, pady=10, fill="x")
 
+    # -------------------------------------------------
+    # BACKGROUND PROCESSING
+    # -------------------------------------------------
     def process_folder(self):
+        if self.worker and self.worker.is_alive():
+            return
+
         folder = filedialog.askdirectory()
         if not folder:
             return
 
+        # Reports are streamed while the folder is processed,
+        # so the destination is chosen up front
+        filetypes = [
+            ("JSON", "*.json"),
+            ("NDJSON (one record per line)", "*.ndjson"),
+        ]
+        # Offered only when the optional pyarrow dependency is installed
+        if importlib.util.find_spec("pyarrow") is not None:
+            filetypes.append(("Parquet (typed columns)", "*.parquet"))
+
+        self.save_path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=filetypes,
+            title="Save Consolidated Bulk Metadata"
+        )
+
         self.status_box.delete("1.0", "end")
         self.status_box.insert("end", f"📁 Selected Folder:\n{folder}\n\n")
 
-        bulk_report = {}
-        image_count = 0
+        self.clean_stats = None
+        self.run_stats = None
+        self.results.clear()
+        self.results.root = folder
+        self.grid_view.reset()
 
-        for file in sorted(os.listdir(folder)):
-            if not file.lower().endswith((".jpg", ".jpeg", ".png", ".bmp", ".heic")):
-                continue
+        # Tk variables are read here: the worker thread must not touch them
+        pdf_options = {
+            "enabled": self.pdf_report.get(),
+            "thumbnails": self.pdf_thumbnails.get(),
+        }
+        self._start_job(self._bulk_worker, folder, self.save_path, pdf_options)
+
+    def clean_folder(self):
+        """
+        Strip metadata from every image under a folder into a mirrored
+        output folder. Originals are never touched.
+        """
+        if self.worker and self.worker.is_alive():
+            return
+
+        if self.parent.safe_mode.get():
+            messagebox.showwarning(
+                "Safe Mode Enabled",
+                "Disable Safe Mode to remove metadata."
+            )
+            return
+
+        folder = filedialog.askdirectory(title="Folder to Clean")
+        if not folder:
+            return
+        output = filedialog.askdirectory(title="Output Folder for Clean Copies")
+        if not output:
+            return
+
+        self.status_box.delete("1.0", "end")
+        self.status_box.insert("end", f"🧹 Cleaning:\n{folder}\n→ {output}\n\n")
+
+        self.save_path = ""
+        self.clean_stats = CleanStats()
+        self.clean_root = folder
+        self._start_job(self._clean_worker, folder, output)
+
+    def _start_job(self, target, *args):
+        self.image_count = 0
+        self.total_count = 0
+        self.scan_done = False
+        self.cache_hits = 0
+        self.cancel_event = threading.Event()
+        self.result_queue = queue.Queue()
+
+        self.progress.set(0)
+        self.progress_label.configure(text="Scanning folder...")
+        self.select_btn.configure(state="disabled")
+        self.clean_btn.configure(state="disabled")
+        self.cancel_btn.configure(state="normal")
+
+        self.worker = threading.Thread(
+            target=target,
+            args=(*args, self.cancel_event, self.result_queue),
+            daemon=True
+        )
+        self.worker.start()
+        self.after(POLL_MS, self._poll_results)
 
-            image_count += 1
-            path = os.path.join(folder, file)
-            self.status_box.insert("end", f"🔍 Processing: {file}\n")
+    def _bulk_worker(self, folder, save_path, pdf_options, cancel_event, results):
+        # ⚠️ Runs off the Tk thread: only talks to the UI through the queue
+        writers = []
+        metrics.enable().reset()
+        try:
+            if save_path:
+                base = os.path.splitext(save_path)[0]
+                writers.append(open_report_writer(save_path))
+                writers.append(CSVStreamWriter(base + ".csv"))
+                if pdf_options["enabled"]:
+                    # Paginated as records arrive; pages go straight to disk
+                    from pdf_report import BulkPDFWriter
+                    writers.append(BulkPDFWriter(
+                        base + ".pdf",
+                        title=f"EXIF Metadata Report – {os.path.basename(folder)}",
+                        root=folder,
+                        thumbnails=pdf_options["thumbnails"]
+                    ))
+
+            # Extraction starts while the folder tree is still being walked
+            records = run_bulk(
+                self._count_discovered(scan_images(folder), results),
+                cache_path=default_cache_path()
+            )
+            try:
+                for record in records:
+                    if cancel_event.is_set():
+                        break
+
+                    # Written straight to disk: nothing accumulates in memory
+                    file = report_key(folder, record.path)
+                    with metrics.stage("write"):
+                        for writer in writers:
+                            writer.write(file, record)
+
+                    results.put(("record", (file, record.cached, ResultStore.grid_row(record))))
+            finally:
+                records.close()
+                for writer in writers:
+                    writer.close()
+        except Exception as e:
+            results.put(("error", str(e)))
+        finally:
+            # The collector is process-wide: never leave it on after the run
+            results.put(("stats", metrics.get_metrics().snapshot()))
+            metrics.disable()
+
+        results.put(("done", cancel_event.is_set()))
+
+    def _clean_worker(self, folder, output, cancel_event, results):
+        # ⚠️ Runs off the Tk thread: only talks to the UI through the queue
+        try:
+            records = run_clean(
+                folder, output,
+                paths=self._count_discovered(scan_images(folder), results)
+            )
+            try:
+                for record in records:
+                    if cancel_event.is_set():
+                        break
+                    results.put(("cleaned", record))
+            finally:
+                records.close()
+        except Exception as e:
+            results.put(("error", str(e)))
+
+        results.put(("done", cancel_event.is_set()))
+
+    @staticmethod
+    def _count_discovered(paths, results, every=256):
+        """
+        Pass paths through while reporting how many have been found.
+        """
+        count = 0
+        for path in paths:
+            count += 1
+            if count % every == 0:
+                results.put(("found", count))
+            yield path
+        results.put(("total", count))
+
+    def _poll_results(self):
+        """
+        Drain everything queued since the last tick and update the UI once.
+        """
+        if not self.winfo_exists():
+            return
+
+        lines = []
+        finished = None
+        new_rows = False
+
+        while True:
+            try:
+                kind, payload = self.result_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == "found":
+                self.total_count = payload
+            elif kind == "total":
+                self.total_count = payload
+                self.scan_done = True
+            elif kind == "record":
+                file, cached, row = payload
+                self.image_count += 1
+                self.cache_hits += cached
+                self.results.add(file, *row)
+                new_rows = True
+            elif kind == "cleaned":
+                self.image_count += 1
+                self.clean_stats.add(payload)
+                file = report_key(self.clean_root, payload["path"])
+                # Cleaned / copied files are only counted; the rest are listed
+                if payload["status"] == "failed":
+                    lines.append(f"❌ Failed: {file} ({payload['reason']})\n")
+                elif payload["status"] == "skipped":
+                    lines.append(f"⏭️ Skipped: {file} ({payload['reason']})\n")
+            elif kind == "error":
+                lines.append(f"\n❌ Error: {payload}\n")
+            elif kind == "stats":
+                self.run_stats = payload
+            elif kind == "done":
+                finished = payload
+
+        if lines:
+            self.status_box.insert("end", "".join(lines))
             self.status_box.see("end")
-            self.update_idletasks()
+        if new_rows:
+            self.grid_view.refresh()
+
+        if self.total_count:
+            self.progress.set(self.image_count / self.total_count)
+        self.progress_label.configure(
+            text=f"{self.image_count} / {self.total_count}"
+                 f"{'' if self.scan_done else '+'} images"
+        )
 
-            exif = extract_exif(path)
+        if finished is None:
+            self.after(POLL_MS, self._poll_results)
+        else:
+            self._finish_processing(cancelled=finished)
 
-            if not exif:
-                bulk_report[file] = {"Error": "No EXIF metadata found"}
-                continue
+    def cancel_processing(self):
+        self.cancel_event.set()
+        self.cancel_btn.configure(state="disabled")
+        self.progress_label.configure(text="Cancelling...")
+
+    def on_close(self):
+        self.cancel_event.set()
+        self.destroy()
+
+    def open_result(self, path):
+        """
+        Grid double-click: show the image in the main window.
+        """
+        self.parent.load_image(path)
+        self.parent.lift()
 
-            image_data = {}
-
-            # ---- FULL EXIF ----
-            for key, val in exif.items():
-                if isinstance(val, bytes):
-                    val = val.decode(errors="ignore")
-                if isinstance(val, tuple) and len(val) == 2 and val[1] != 0:
-                    val = val[0] / val[1]
-                image_data[key] = val
-
-            # ---- GPS ----
-            gps = extract_gps(exif)
-            lat, lon = get_lat_long(gps) if gps else (None, None)
-            image_data["GPSLatitude"] = lat
-            image_data["GPSLongitude"] = lon
-
-            # ---- PRIVACY RISK SCORE ----
-            score = 0
-            if gps:
-                score += 5
-            if "Model" in exif:
-                score += 2
-            if "DateTimeOriginal" in exif:
-                score += 2
-            if "Software" in exif:
-                score += 1
-
-            level = "LOW"
-            if score >= 7:
-                level = "HIGH"
-            elif score >= 4:
-                level = "MEDIUM"
-
-            image_data["PrivacyRiskScore"] = score
-            image_data["PrivacyRiskLevel"] = level
-
-            bulk_report[file] = image_data
+    def _finish_processing(self, cancelled):
+        self.grid_view.refresh(force=True)
+        self.select_btn.configure(state="normal")
+        self.clean_btn.configure(state="normal")
+        self.cancel_btn.configure(state="disabled")
+
+        if self.clean_stats is not None:
+            self._show_clean_summary(cancelled)
+            return
+
+        if cancelled:
+            self.status_box.insert(
+                "end",
+                f"\n⛔ Cancelled after {self.image_count} images "
+                f"(partial report kept)\n"
+            )
+            return
 
         self.status_box.insert(
             "end",
-            f"\n✅ Total Images Processed: {image_count}\n"
-        )
-
-        save_path = filedialog.asksaveasfilename(
-            defaultextension=".json",
-            title="Save Consolidated Bulk Metadata"
+            f"\n✅ Total Images Processed: {self.image_count}\n"
+            f"🗄️ Cache: {self.cache_hits} hits / {self.image_count - self.cache_hits} misses\n"
         )
 
-        if save_path:
-            with open(save_path, "w", encoding="utf-8") as f:
-                json.dump(bulk_report, f, indent=4)
+        if self.run_stats:
+            # Where the time went (stage totals are summed across workers)
+            self.status_box.insert(
+                "end",
+                f"\n⏱️ Stage timings\n{metrics.format_summary(self.run_stats)}\n"
+            )
+        self.status_box.see("end")
 
+        if self.save_path:
             messagebox.showinfo(
                 "Bulk Upload Complete",
-                f"Processed {image_count} images\n\nConsolidated JSON exported successfully!"
+                f"Processed {self.image_count} images\n\nConsolidated report exported successfully!"
             )
-            csv_path = save_path.replace(".json", ".csv")
 
-            with open(csv_path, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                headers_written = False
+    def _show_clean_summary(self, cancelled):
+        summary = self.clean_stats.summary()
+        self.status_box.insert(
+            "end",
+            f"\n{'⛔ Cancelled' if cancelled else '✅ Done'}\n"
+            f"🧹 Cleaned: {summary['cleaned']}\n"
+            f"📄 Copied as-is: {summary['copied']}\n"
+            f"⏭️ Skipped (unsupported format): {summary['skipped']}\n"
+            f"❌ Failed: {summary['failed']}\n"
+            f"💾 Bytes saved: {summary['bytes_saved']:,}\n"
+            f"⚡ Throughput: {summary['files_per_sec']} files/s, "
+            f"{summary['mb_per_sec']} MB/s\n"
+        )
+        self.status_box.see("end")
 
-                for img, data in bulk_report.items():
-                    if not headers_written:
-                        writer.writerow(["Image"] + list(data.keys()))
-                        headers_written = True
-                    writer.writerow([img] + list(data.values()))
+        if not cancelled:
+            messagebox.showinfo(
+                "Clean Complete",
+                f"Cleaned {summary['cleaned']} images\n"
+                f"Copied {summary['copied']} as-is, skipped {summary['skipped']}, "
+                f"failed {summary['failed']}"
+            )
 
 if __name__ == "__main__":
     ModernEXIF_GUI()
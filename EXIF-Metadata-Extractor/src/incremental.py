@@ -0,0 +1,377 @@
+import os
+import csv
+import json
+import time
+import struct
+import select
+import ctypes
+import ctypes.util
+
+from bulk_engine import IMAGE_EXTENSIONS, report_key, run_bulk
+from records import as_dict
+from scanner import scan_entries
+
+
+# 2: keyed by path relative to the folder (subfolders included)
+MANIFEST_VERSION = 2
+
+
+# -------------------------------------------------
+# PATH HELPERS
+# -------------------------------------------------
+def _companion_paths(report_path):
+    """
+    report.json → report.manifest.json, report.delta.json, report.delta.csv
+    """
+    base = report_path[:-5] if report_path.endswith(".json") else report_path
+    return base + ".manifest.json", base + ".delta.json", base + ".delta.csv"
+
+
+def _load_json(path, default):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def _write_json(path, data, indent=4):
+    # Write to a temp file first so a crash never leaves a half-written report
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        # ImageRecord entries are serialized through their dict view
+        json.dump(data, f, indent=indent, default=as_dict)
+    os.replace(tmp, path)
+
+
+def _is_image(name):
+    return name.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def _full_path(folder, name):
+    # Report keys always use "/" (see bulk_engine.report_key)
+    return os.path.join(folder, *name.split("/"))
+
+
+def snapshot(folder):
+    """
+    {relative path: [size, mtime_ns]} for images under folder, keyed
+    like the bulk report (bulk_engine.report_key).
+    """
+    files = {}
+    for entry in scan_entries(folder):
+        try:
+            st = entry.stat()
+        except OSError:
+            continue
+        files[report_key(folder, entry.path)] = [st.st_size, st.st_mtime_ns]
+    return files
+
+
+# -------------------------------------------------
+# INCREMENTAL REPORT
+# -------------------------------------------------
+class IncrementalReport:
+    """
+    Keeps a bulk JSON report up to date across runs.
+
+    A manifest of (size, mtime_ns) per file is stored next to the report.
+    Each refresh only extracts new / modified files, drops deleted ones,
+    and writes a delta JSON + CSV alongside the merged full report.
+    """
+
+    def __init__(self, folder, report_path, workers=None, cache_path=None):
+        self.folder = folder
+        self.report_path = report_path
+        self.workers = workers
+        self.cache_path = cache_path
+
+        self.manifest_path, self.delta_json_path, self.delta_csv_path = \
+            _companion_paths(report_path)
+
+        manifest = _load_json(self.manifest_path, {})
+        if (
+            manifest.get("version") != MANIFEST_VERSION
+            or manifest.get("folder") != os.path.abspath(folder)
+        ):
+            manifest = {}
+
+        self.files = manifest.get("files", {})
+        self.report = _load_json(report_path, {}) if self.files else {}
+
+        # Stats captured by the last scan()/check(), committed by update()
+        self._seen = {}
+
+    # ---------- CHANGE DETECTION ----------
+    def scan(self):
+        """
+        Full directory comparison against the manifest.
+        Returns (added, modified, deleted) relative path lists.
+        """
+        current = snapshot(self.folder)
+        return self._diff(current, set(current) | set(self.files))
+
+    def check(self, names):
+        """
+        Compare only the given relative paths (e.g. from watch events).
+        """
+        current = {}
+        for name in names:
+            if not _is_image(name):
+                continue
+            try:
+                st = os.stat(_full_path(self.folder, name))
+            except OSError:
+                continue
+            current[name] = [st.st_size, st.st_mtime_ns]
+        return self._diff(current, set(names))
+
+    def _diff(self, current, names):
+        added, modified, deleted = [], [], []
+        for name in sorted(names):
+            now = current.get(name)
+            before = self.files.get(name)
+            if now is None:
+                if before is not None:
+                    deleted.append(name)
+            elif before is None:
+                added.append(name)
+            elif list(before) != now:
+                modified.append(name)
+
+        self._seen = current
+        return added, modified, deleted
+
+    # ---------- UPDATE ----------
+    def update(self, added, modified, deleted):
+        """
+        Extract changed files, merge into the full report and write
+        report, delta and manifest. Returns the delta dict.
+        """
+        delta = {"added": {}, "modified": {}, "deleted": list(deleted)}
+
+        changed = added + modified
+        paths = [_full_path(self.folder, name) for name in changed]
+        kinds = {name: "added" for name in added}
+        kinds.update({name: "modified" for name in modified})
+
+        for record in run_bulk(paths, self.workers, cache_path=self.cache_path):
+            name = report_key(self.folder, record.path)
+            self.report[name] = record
+            delta[kinds[name]][name] = record
+            self.files[name] = self._seen[name]
+
+        for name in deleted:
+            self.report.pop(name, None)
+            self.files.pop(name, None)
+
+        if changed or deleted or not os.path.exists(self.report_path):
+            self._write(delta)
+
+        return delta
+
+    def refresh(self):
+        return self.update(*self.scan())
+
+    def _write(self, delta):
+        _write_json(self.report_path, dict(sorted(self.report.items())))
+        _write_json(self.delta_json_path, delta)
+        self._write_delta_csv(delta)
+        _write_json(self.manifest_path, {
+            "version": MANIFEST_VERSION,
+            "folder": os.path.abspath(self.folder),
+            "files": self.files,
+        }, indent=None)
+
+    def _write_delta_csv(self, delta):
+        rows = []
+        for change in ("added", "modified"):
+            for name, data in delta[change].items():
+                rows.append((change, name, data))
+        for name in delta["deleted"]:
+            rows.append(("deleted", name, {}))
+
+        columns = []
+        for _, _, data in rows:
+            for key in data:
+                if key not in columns:
+                    columns.append(key)
+
+        with open(self.delta_csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Change", "Image"] + columns)
+            for change, name, data in rows:
+                writer.writerow([change, name] + [data.get(c, "") for c in columns])
+
+
+# -------------------------------------------------
+# WATCH MODE
+# -------------------------------------------------
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class _Inotify:
+    """
+    inotify watches on a folder and all of its subfolders.
+    """
+
+    def __init__(self, libc, fd, folder):
+        self.libc = libc
+        self.fd = fd
+        self.folder = folder
+        self.dirs = {}  # watch descriptor → relative dir ("" for the root)
+
+    def add_watches(self):
+        """
+        Watch every folder under the root. Re-adding an existing watch
+        returns its old descriptor, so this is safe after each rescan.
+        """
+        for dirpath, _, _ in os.walk(self.folder):
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(dirpath), WATCH_MASK)
+            if wd >= 0:
+                rel = report_key(self.folder, dirpath)
+                self.dirs[wd] = "" if rel == "." else rel
+
+    def read_events(self):
+        """
+        Drain pending events → (set of relative paths, rescan needed).
+        A rescan is needed when the kernel queue overflowed (events were
+        dropped) or a folder was created, moved or deleted.
+        """
+        names = set()
+        rescan = False
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+
+            pos = 0
+            while pos + _EVENT_HEADER.size <= len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, pos)
+                pos += _EVENT_HEADER.size
+                name = data[pos:pos + length].rstrip(b"\0")
+                pos += length
+
+                if mask & IN_Q_OVERFLOW:
+                    rescan = True
+                elif mask & IN_IGNORED:
+                    self.dirs.pop(wd, None)
+                elif mask & IN_ISDIR:
+                    rescan = True
+                elif name and not mask & IN_CREATE and wd in self.dirs:
+                    # New files are picked up on IN_CLOSE_WRITE, once complete
+                    rel_dir = self.dirs[wd]
+                    name = os.fsdecode(name)
+                    names.add(f"{rel_dir}/{name}" if rel_dir else name)
+        return names, rescan
+
+    def close(self):
+        os.close(self.fd)
+
+
+def _open_inotify(folder):
+    """
+    Returns an _Inotify watching folder recursively, or None if unavailable.
+    """
+    if not hasattr(os, "uname") or os.uname().sysname != "Linux":
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        inotify = _Inotify(libc, fd, folder)
+        inotify.add_watches()
+        if not inotify.dirs:
+            inotify.close()
+            return None
+        return inotify
+    except (OSError, AttributeError):
+        return None
+
+
+def watch(folder, report_path, interval=2.0, workers=None, cache_path=None,
+          on_delta=None):
+    """
+    Keep report_path up to date as images land in folder (or any subfolder).
+    Uses inotify on Linux; otherwise rescans every `interval` seconds.
+    Events are debounced for `interval` seconds. Runs until interrupted.
+    """
+    incremental = IncrementalReport(folder, report_path, workers, cache_path)
+    delta = incremental.refresh()
+    if on_delta:
+        on_delta(delta)
+
+    inotify = _open_inotify(folder)
+    try:
+        while True:
+            if inotify is None:
+                time.sleep(interval)
+                delta = incremental.refresh()
+            else:
+                select.select([inotify.fd], [], [], None)
+                names, rescan = inotify.read_events()
+
+                # Debounce: collect everything that lands in the next interval
+                deadline = time.monotonic() + interval
+                while (remaining := deadline - time.monotonic()) > 0:
+                    ready, _, _ = select.select([inotify.fd], [], [], remaining)
+                    if ready:
+                        more, more_rescan = inotify.read_events()
+                        names |= more
+                        rescan |= more_rescan
+
+                if rescan:
+                    # Dropped events or folder changes: compare everything
+                    inotify.add_watches()
+                    delta = incremental.refresh()
+                else:
+                    delta = incremental.update(*incremental.check(names))
+
+            if on_delta and (delta["added"] or delta["modified"] or delta["deleted"]):
+                on_delta(delta)
+    finally:
+        if inotify is not None:
+            inotify.close()
+
+
+def _print_delta(delta):
+    print(
+        f"[DELTA] added: {len(delta['added'])}  "
+        f"modified: {len(delta['modified'])}  "
+        f"deleted: {len(delta['deleted'])}"
+    )
+
+
+if __name__ == "__main__":
+    import sys
+
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if len(args) != 2:
+        print("Usage: python incremental.py <folder> <report.json> [--watch]")
+        sys.exit(1)
+
+    from metadata_cache import default_cache_path
+
+    folder, report_path = args
+    if "--watch" in sys.argv:
+        try:
+            watch(folder, report_path, cache_path=default_cache_path(), on_delta=_print_delta)
+        except KeyboardInterrupt:
+            pass
+    else:
+        report = IncrementalReport(folder, report_path, cache_path=default_cache_path())
+        _print_delta(report.refresh())
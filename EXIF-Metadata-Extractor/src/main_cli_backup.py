@@ -1,5 +1,6 @@
-from extractor import extract_exif
+from extractor import extract_exif, enable_cache
 from gps_utils import extract_gps, get_lat_long
+from tag_table import normalize_value
 import webbrowser
 
 
@@ -21,22 +22,11 @@ def print_clean_metadata(exif):
 
     for key in important_keys:
         if key in exif:
-            value = exif[key]
-
-            # Decode bytes e.g., b'Apple' → Apple
-            if isinstance(value, bytes):
-                value = value.decode(errors="ignore")
-
-            # Convert rational tuples like (72,1) → 72.0
-            if (
-                isinstance(value, tuple)
-                and len(value) == 2
-                and all(isinstance(n, int) for n in value)
-            ):
-                if value[1] != 0:
-                    value = value[0] / value[1]
-                else:
-                    value = "Invalid"
+            value = normalize_value(exif[key], key)
+
+            # Corrupt rationals (zero denominator) normalize to None
+            if value is None:
+                value = "Invalid"
 
             print(f"{key:20}: {value}")
 
@@ -52,9 +42,14 @@ def run_app():
 
     image_path = input("Enter image path: ")
 
+    cache = enable_cache()
+
     print("\nExtracting EXIF metadata...\n")
     exif = extract_exif(image_path)
 
+    stats = cache.stats()
+    print(f"[CACHE] hits: {stats['hits']}  misses: {stats['misses']}")
+
     if not exif:
         print("\n[INFO] No EXIF metadata found. Exiting.\n")
         return
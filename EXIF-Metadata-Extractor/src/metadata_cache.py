@@ -0,0 +1,189 @@
+import os
+import time
+import pickle
+import sqlite3
+import hashlib
+import threading
+
+
+# Bump whenever the cached value format (or extract_exif output) changes:
+# every existing entry is dropped on the next open
+SCHEMA_VERSION = 2
+
+DEFAULT_MAX_ENTRIES = 200_000
+
+# How many writes between size-cap checks
+EVICT_CHECK_EVERY = 256
+
+
+def default_cache_path():
+    """
+    ~/.cache/exif-extractor/metadata.sqlite (override with EXIF_CACHE_PATH)
+    """
+    path = os.environ.get("EXIF_CACHE_PATH")
+    if path:
+        return path
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "exif-extractor", "metadata.sqlite")
+
+
+def content_hash(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_key(path, strict=False):
+    """
+    (absolute path, size, mtime_ns, content hash or None)
+    """
+    st = os.stat(path)
+    digest = content_hash(path) if strict else None
+    return os.path.abspath(path), st.st_size, st.st_mtime_ns, digest
+
+
+class MetadataCache:
+    """
+    SQLite cache of extract_exif results keyed by (path, size, mtime_ns).
+
+    - strict=True also compares a SHA-1 of the file contents
+    - max_entries caps the table; least recently used rows are evicted
+    - a schema version mismatch wipes the table
+
+    Values are pickled; the cache file is local, per-user data.
+    """
+
+    def __init__(self, db_path=None, max_entries=DEFAULT_MAX_ENTRIES, strict=False):
+        self.db_path = db_path or default_cache_path()
+        self.max_entries = max_entries
+        self.strict = strict
+
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+
+    def _init_schema(self):
+        with self._lock, self.conn:
+            version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                self.conn.execute("DROP TABLE IF EXISTS metadata")
+
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS metadata (
+                    path         TEXT NOT NULL,
+                    variant      TEXT NOT NULL,
+                    size         INTEGER NOT NULL,
+                    mtime_ns     INTEGER NOT NULL,
+                    content_hash TEXT,
+                    last_used    REAL NOT NULL,
+                    data         BLOB NOT NULL,
+                    PRIMARY KEY (path, variant)
+                )
+                """
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_metadata_last_used ON metadata (last_used)"
+            )
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    # -------------------------------------------------
+    # LOOKUP / STORE
+    # -------------------------------------------------
+    def get(self, key, variant):
+        """
+        Returns the cached metadata for key, or None on a miss.
+        key comes from file_key(); variant identifies the projection.
+        """
+        path, size, mtime_ns, digest = key
+
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT size, mtime_ns, content_hash, data FROM metadata "
+                "WHERE path = ? AND variant = ?",
+                (path, variant)
+            ).fetchone()
+
+            if (
+                row is None
+                or row[0] != size
+                or row[1] != mtime_ns
+                or (self.strict and row[2] != digest)
+            ):
+                self.misses += 1
+                return None
+
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE metadata SET last_used = ? WHERE path = ? AND variant = ?",
+                    (time.time(), path, variant)
+                )
+            self.hits += 1
+
+        return pickle.loads(row[3])
+
+    def put(self, key, variant, metadata):
+        path, size, mtime_ns, digest = key
+        data = pickle.dumps(metadata, protocol=pickle.HIGHEST_PROTOCOL)
+
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO metadata "
+                    "(path, variant, size, mtime_ns, content_hash, last_used, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (path, variant, size, mtime_ns, digest, time.time(), data)
+                )
+
+            self._writes += 1
+            if self._writes % EVICT_CHECK_EVERY == 0:
+                self._evict()
+
+    def _evict(self):
+        """
+        Drop least recently used rows down to 90% of max_entries.
+        Caller holds the lock.
+        """
+        count = self.conn.execute("SELECT COUNT(*) FROM metadata").fetchone()[0]
+        if count <= self.max_entries:
+            return
+
+        excess = count - int(self.max_entries * 0.9)
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM metadata WHERE rowid IN ("
+                "SELECT rowid FROM metadata ORDER BY last_used LIMIT ?)",
+                (excess,)
+            )
+
+    # -------------------------------------------------
+    # MAINTENANCE / STATS
+    # -------------------------------------------------
+    def prune(self):
+        with self._lock:
+            self._evict()
+
+    def clear(self):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM metadata")
+
+    def stats(self):
+        with self._lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM metadata").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,282 @@
+import os
+import heapq
+import threading
+import time
+from collections import Counter
+from contextlib import nullcontext
+
+
+# Pipeline stages, in display order
+STAGES = ("scan", "io", "parse", "piexif", "gps", "risk", "write")
+
+DEFAULT_SLOWEST = 10
+
+_NULL = nullcontext()
+
+# Process-wide collector (None → instrumentation disabled)
+_metrics = None
+
+
+class Metrics:
+    """
+    Per-stage timers, file / byte counters, error counts by exception
+    type and the slowest N files. Thread-safe; snapshots from worker
+    processes are combined with merge().
+    """
+
+    def __init__(self, slowest=DEFAULT_SLOWEST):
+        self.slowest_n = slowest
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.started = time.monotonic()
+            self.stage_seconds = Counter()
+            self.stage_calls = Counter()
+            self.counters = Counter()
+            self.errors = Counter()
+            self.slowest = []  # min-heap of (seconds, path)
+
+    # ---------- RECORDING ----------
+    def add_stage(self, name, seconds):
+        with self.lock:
+            self.stage_seconds[name] += seconds
+            self.stage_calls[name] += 1
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] += n
+
+    def error(self, exc):
+        name = exc if isinstance(exc, str) else type(exc).__name__
+        with self.lock:
+            self.errors[name] += 1
+
+    def file_done(self, path, seconds, nbytes=0):
+        with self.lock:
+            self.counters["files"] += 1
+            self.counters["bytes"] += nbytes
+            self._push_slow(seconds, path)
+
+    def _push_slow(self, seconds, path):
+        # Caller holds the lock
+        if len(self.slowest) < self.slowest_n:
+            heapq.heappush(self.slowest, (seconds, path))
+        elif seconds > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, (seconds, path))
+
+    # ---------- EXPORT ----------
+    def snapshot(self):
+        """
+        Plain (picklable / JSON-able) copy of everything recorded.
+        """
+        with self.lock:
+            return {
+                "elapsed": round(time.monotonic() - self.started, 6),
+                "stages": {
+                    name: {
+                        "seconds": round(self.stage_seconds[name], 6),
+                        "calls": self.stage_calls[name],
+                    }
+                    for name in _ordered(self.stage_seconds)
+                },
+                "counters": dict(self.counters),
+                "errors": dict(self.errors),
+                "slowest": [
+                    {"path": path, "seconds": round(seconds, 6)}
+                    for seconds, path in sorted(self.slowest, reverse=True)
+                ],
+            }
+
+    def merge(self, snapshot):
+        """
+        Add a snapshot (e.g. from a worker process) into this collector.
+        """
+        with self.lock:
+            for name, stage in snapshot["stages"].items():
+                self.stage_seconds[name] += stage["seconds"]
+                self.stage_calls[name] += stage["calls"]
+            self.counters.update(snapshot["counters"])
+            self.errors.update(snapshot["errors"])
+            for item in snapshot["slowest"]:
+                self._push_slow(item["seconds"], item["path"])
+
+
+def _ordered(names):
+    known = [name for name in STAGES if name in names]
+    return known + sorted(name for name in names if name not in STAGES)
+
+
+class _Timer:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.add_stage(self.name, time.perf_counter() - self.start)
+
+
+# -------------------------------------------------
+# MODULE API (no-ops while disabled)
+# -------------------------------------------------
+def enable(slowest=DEFAULT_SLOWEST):
+    global _metrics
+    if _metrics is None:
+        _metrics = Metrics(slowest)
+    return _metrics
+
+
+def disable():
+    global _metrics
+    _metrics = None
+
+
+def enabled():
+    return _metrics is not None
+
+
+def get_metrics():
+    return _metrics
+
+
+def stage(name):
+    """
+    with stage("parse"): ...  — times the block when enabled.
+    """
+    if _metrics is None:
+        return _NULL
+    return _Timer(_metrics, name)
+
+
+def count(name, n=1):
+    if _metrics is not None:
+        _metrics.count(name, n)
+
+
+def error(exc):
+    if _metrics is not None:
+        _metrics.error(exc)
+
+
+def track_file(path, func, *args):
+    """
+    func(*args), recorded as one processed file (time + size) when enabled.
+    """
+    if _metrics is None:
+        return func(*args)
+
+    start = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        try:
+            nbytes = os.path.getsize(path)
+        except OSError:
+            nbytes = 0
+        _metrics.file_done(path, time.perf_counter() - start, nbytes)
+
+
+def collect(func, chunk):
+    """
+    Worker-side wrapper used by the bulk pool: run func(chunk) with
+    instrumentation on and return (results, snapshot) so the parent
+    can merge the worker's numbers.
+    """
+    metrics = enable()
+    metrics.reset()
+    results = func(chunk)
+    return results, metrics.snapshot()
+
+
+# -------------------------------------------------
+# REPORTS
+# -------------------------------------------------
+def format_summary(snapshot):
+    """
+    Short multi-line text summary for status panes.
+    """
+    lines = []
+    total = sum(stage["seconds"] for stage in snapshot["stages"].values()) or 1.0
+    for name, stage in snapshot["stages"].items():
+        share = stage["seconds"] / total
+        lines.append(f"{name:<7} {stage['seconds']:9.3f} s  {share:6.1%}  ({stage['calls']} calls)")
+
+    counters = snapshot["counters"]
+    lines.append(
+        f"files {counters.get('files', 0)}, "
+        f"{counters.get('bytes', 0) / 1e6:.1f} MB in {snapshot['elapsed']:.2f} s"
+    )
+    if counters.get("cache_hit") or counters.get("cache_miss"):
+        lines.append(
+            f"cache {counters.get('cache_hit', 0)} hit(s), "
+            f"{counters.get('cache_miss', 0)} miss(es)"
+        )
+    if counters.get("fallback"):
+        lines.append(f"fallback {counters['fallback']} file(s) re-read with piexif")
+    if snapshot["errors"]:
+        lines.append("errors: " + ", ".join(
+            f"{name} × {n}" for name, n in sorted(snapshot["errors"].items())
+        ))
+    for item in snapshot["slowest"][:5]:
+        lines.append(f"slow    {item['seconds'] * 1000:8.1f} ms  {item['path']}")
+    return "\n".join(lines)
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def to_prometheus(snapshot, prefix="exif_extractor"):
+    """
+    Prometheus text exposition format (for the node_exporter
+    textfile collector).
+    """
+    out = []
+
+    def metric(name, kind, help_text, samples):
+        out.append(f"# HELP {prefix}_{name} {help_text}")
+        out.append(f"# TYPE {prefix}_{name} {kind}")
+        for labels, value in samples:
+            label_text = ",".join(f'{k}="{_label(v)}"' for k, v in labels.items())
+            out.append(f"{prefix}_{name}{{{label_text}}} {value}" if labels
+                       else f"{prefix}_{name} {value}")
+
+    stages = snapshot["stages"]
+    metric("stage_seconds_total", "counter", "Time spent per pipeline stage.",
+           [({"stage": n}, s["seconds"]) for n, s in stages.items()])
+    metric("stage_calls_total", "counter", "Timed calls per pipeline stage.",
+           [({"stage": n}, s["calls"]) for n, s in stages.items()])
+    metric("files_total", "counter", "Files processed.",
+           [({}, snapshot["counters"].get("files", 0))])
+    metric("bytes_total", "counter", "Bytes of processed files.",
+           [({}, snapshot["counters"].get("bytes", 0))])
+    metric("fallbacks_total", "counter", "Native parser failures re-read with piexif.",
+           [({}, snapshot["counters"].get("fallback", 0))])
+    metric("cache_lookups_total", "counter", "Metadata cache lookups by result.",
+           [({"result": "hit"}, snapshot["counters"].get("cache_hit", 0)),
+            ({"result": "miss"}, snapshot["counters"].get("cache_miss", 0))])
+    metric("errors_total", "counter", "Errors by exception type.",
+           [({"type": n}, c) for n, c in snapshot["errors"].items()])
+    metric("slowest_file_seconds", "gauge", "Slowest files of the run.",
+           [({"path": i["path"]}, i["seconds"]) for i in snapshot["slowest"]])
+    metric("run_seconds", "gauge", "Wall time of the run.",
+           [({}, snapshot["elapsed"])])
+
+    return "\n".join(out) + "\n"
+
+
+def write_prometheus(path, snapshot, prefix="exif_extractor"):
+    """
+    Atomically (re)write a Prometheus text file.
+    """
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(to_prometheus(snapshot, prefix))
+    os.replace(tmp, path)
@@ -0,0 +1,299 @@
+import os
+import re
+import struct
+import threading
+
+
+# Searched in order for text Helvetica cannot show (CJK, Cyrillic, ...);
+# EXIF_PDF_FONT overrides. TrueType outlines only (.ttf / .ttc).
+UNICODE_FONT_PATHS = (
+    # Windows
+    "C:/Windows/Fonts/arialuni.ttf",
+    "C:/Windows/Fonts/msyh.ttc",
+    "C:/Windows/Fonts/simsun.ttc",
+    "C:/Windows/Fonts/msgothic.ttc",
+    "C:/Windows/Fonts/malgun.ttf",
+    # macOS
+    "/Library/Fonts/Arial Unicode.ttf",
+    "/System/Library/Fonts/Supplemental/Arial Unicode.ttf",
+    # Linux
+    "/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf",
+    "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",
+    "/usr/share/fonts/truetype/wqy/wqy-zenhei.ttc",
+    "/usr/share/fonts/truetype/arphic/uming.ttc",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+)
+
+TRUETYPE_VERSIONS = (b"\x00\x01\x00\x00", b"true")
+TTC_TAG = b"ttcf"
+
+# OS/2 fsType: the licence forbids embedding
+FS_TYPE_RESTRICTED = 0x0002
+
+# Composite glyph component flags
+ARG_1_AND_2_ARE_WORDS = 0x0001
+WE_HAVE_A_SCALE = 0x0008
+MORE_COMPONENTS = 0x0020
+WE_HAVE_AN_X_AND_Y_SCALE = 0x0040
+WE_HAVE_A_TWO_BY_TWO = 0x0080
+
+# Tables a PDF viewer needs from an embedded TrueType font
+EMBED_TABLES = ("head", "hhea", "hmtx", "maxp", "loca", "glyf", "cvt ", "fpgm", "prep", "OS/2")
+
+
+def _u16(buf, pos):
+    return struct.unpack_from(">H", buf, pos)[0]
+
+
+def _i16(buf, pos):
+    return struct.unpack_from(">h", buf, pos)[0]
+
+
+def _u32(buf, pos):
+    return struct.unpack_from(">I", buf, pos)[0]
+
+
+# -------------------------------------------------
+# TRUETYPE FILE
+# -------------------------------------------------
+class TrueTypeFont:
+    """
+    Just enough of a TrueType font (a .ttf, or the first font of a
+    .ttc) to embed it in a PDF as a CIDFontType2: character → glyph
+    lookup, advance widths and a glyph subset of the outlines.
+    Glyph ids double as PDF character codes (Identity-H).
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+
+        offset = _u32(data, 12) if data[:4] == TTC_TAG else 0
+        if data[offset:offset + 4] not in TRUETYPE_VERSIONS:
+            raise ValueError("Not a TrueType font")
+
+        self.tables = {}
+        for i in range(_u16(data, offset + 4)):
+            tag, _, start, length = struct.unpack_from(">4sIII", data, offset + 12 + 16 * i)
+            self.tables[tag.decode("latin-1")] = data[start:start + length]
+        if "glyf" not in self.tables:
+            raise ValueError("No TrueType outlines")
+
+        os2 = self.tables.get("OS/2", b"")
+        if len(os2) >= 10 and _u16(os2, 8) & FS_TYPE_RESTRICTED:
+            raise ValueError("Font licence does not allow embedding")
+
+        self.name = re.sub(r"[^A-Za-z0-9-]", "", os.path.splitext(os.path.basename(path))[0])
+
+        head = self.tables["head"]
+        hhea = self.tables["hhea"]
+        self.units = _u16(head, 18)
+        self.bbox = [self._scale(_i16(head, 36 + 2 * i)) for i in range(4)]
+        self.long_loca = _i16(head, 50) == 1
+        self.ascent = self._scale(_i16(hhea, 4))
+        self.descent = self._scale(_i16(hhea, 6))
+        self.cap_height = self._scale(_i16(os2, 88)) if len(os2) >= 90 else self.ascent
+        self.num_glyphs = _u16(self.tables["maxp"], 4)
+
+        metrics = _u16(hhea, 34)
+        hmtx = self.tables["hmtx"]
+        self.advances = [_u16(hmtx, 4 * i) for i in range(metrics)]
+
+        self.cmap = self._read_cmap(self.tables["cmap"])
+
+    def _scale(self, value):
+        return round(value * 1000 / self.units)
+
+    # ---------- LOOKUP ----------
+    def glyph(self, ch):
+        """
+        Glyph id for a character (0 = .notdef, not in the font).
+        """
+        return self.cmap.get(ord(ch), 0)
+
+    def advance(self, gid):
+        """
+        Advance width in 1/1000 em.
+        """
+        if gid < len(self.advances):
+            return self._scale(self.advances[gid])
+        return self._scale(self.advances[-1])
+
+    def char_width(self, ch):
+        return self.advance(self.glyph(ch))
+
+    @staticmethod
+    def _read_cmap(cmap):
+        """
+        Unicode → glyph id from the best Unicode subtable
+        (format 12 covers all planes, format 4 the BMP only).
+        """
+        best = None
+        for i in range(_u16(cmap, 2)):
+            platform, encoding, offset = struct.unpack_from(">HHI", cmap, 4 + 8 * i)
+            if not (platform == 0 or (platform == 3 and encoding in (1, 10))):
+                continue
+            fmt = _u16(cmap, offset)
+            if fmt == 12 or (fmt == 4 and best is None):
+                best = (fmt, offset)
+
+        if best is None:
+            raise ValueError("No Unicode cmap")
+
+        fmt, offset = best
+        table = {}
+        if fmt == 12:
+            for i in range(_u32(cmap, offset + 12)):
+                start, end, gid = struct.unpack_from(">III", cmap, offset + 16 + 12 * i)
+                for code in range(start, end + 1):
+                    table[code] = gid + code - start
+            return table
+
+        segments = _u16(cmap, offset + 6) // 2
+        ends = offset + 14
+        starts = ends + 2 * segments + 2
+        deltas = starts + 2 * segments
+        ranges = deltas + 2 * segments
+        for i in range(segments):
+            end = _u16(cmap, ends + 2 * i)
+            start = _u16(cmap, starts + 2 * i)
+            delta = _u16(cmap, deltas + 2 * i)
+            range_offset = _u16(cmap, ranges + 2 * i)
+            for code in range(start, min(end, 0xFFFE) + 1):
+                if range_offset == 0:
+                    gid = (code + delta) & 0xFFFF
+                else:
+                    gid = _u16(cmap, ranges + 2 * i + range_offset + 2 * (code - start))
+                    if gid:
+                        gid = (gid + delta) & 0xFFFF
+                if gid:
+                    table[code] = gid
+        return table
+
+    # ---------- SUBSET ----------
+    def _glyph_data(self, gid):
+        loca = self.tables["loca"]
+        if self.long_loca:
+            start, end = struct.unpack_from(">II", loca, 4 * gid)
+        else:
+            start, end = (2 * v for v in struct.unpack_from(">HH", loca, 2 * gid))
+        return self.tables["glyf"][start:end]
+
+    @staticmethod
+    def _components(glyph):
+        """
+        Glyph ids a composite glyph is built from.
+        """
+        if len(glyph) < 10 or _i16(glyph, 0) >= 0:
+            return
+        pos = 10
+        while True:
+            flags, gid = struct.unpack_from(">HH", glyph, pos)
+            yield gid
+            pos += 8 if flags & ARG_1_AND_2_ARE_WORDS else 6
+            if flags & WE_HAVE_A_SCALE:
+                pos += 2
+            elif flags & WE_HAVE_AN_X_AND_Y_SCALE:
+                pos += 4
+            elif flags & WE_HAVE_A_TWO_BY_TWO:
+                pos += 8
+            if not flags & MORE_COMPONENTS:
+                return
+
+    def subset(self, gids):
+        """
+        Font file with the outlines of gids only (plus .notdef and the
+        parts of composite glyphs). Every other glyph is left empty, so
+        glyph ids stay the same and no cmap is needed.
+        """
+        keep = {0}
+        todo = list(gids)
+        while todo:
+            gid = todo.pop()
+            if gid in keep or gid >= self.num_glyphs:
+                continue
+            keep.add(gid)
+            todo.extend(self._components(self._glyph_data(gid)))
+
+        glyf = bytearray()
+        offsets = []
+        for gid in range(self.num_glyphs):
+            offsets.append(len(glyf))
+            if gid in keep:
+                glyf += self._glyph_data(gid)
+                glyf += b"\0" * (-len(glyf) % 4)
+        offsets.append(len(glyf))
+
+        # Long loca offsets; checksumAdjustment is not checked by viewers
+        head = bytearray(self.tables["head"])
+        head[8:12] = b"\0\0\0\0"
+        struct.pack_into(">h", head, 50, 1)
+
+        tables = {
+            tag: self.tables[tag] for tag in EMBED_TABLES if tag in self.tables
+        }
+        tables.update(
+            head=bytes(head),
+            loca=struct.pack(f">{len(offsets)}I", *offsets),
+            glyf=bytes(glyf),
+        )
+        return _sfnt(tables)
+
+
+def _checksum(data):
+    return sum(struct.unpack(f">{len(data) // 4}I", data)) & 0xFFFFFFFF
+
+
+def _sfnt(tables):
+    """
+    Assemble a TrueType file from {tag: table bytes}.
+    """
+    tags = sorted(tables)
+    count = len(tags)
+    power = 1 << (count.bit_length() - 1)
+    out = [struct.pack(
+        ">4sHHHH", TRUETYPE_VERSIONS[0], count,
+        power * 16, power.bit_length() - 1, (count - power) * 16
+    )]
+
+    offset = 12 + 16 * count
+    bodies = []
+    for tag in tags:
+        data = tables[tag]
+        padded = data + b"\0" * (-len(data) % 4)
+        out.append(struct.pack(">4sIII", tag.encode("latin-1"), _checksum(padded), offset, len(data)))
+        bodies.append(padded)
+        offset += len(padded)
+
+    return b"".join(out + bodies)
+
+
+# -------------------------------------------------
+# LOOKUP
+# -------------------------------------------------
+_unicode_font = None
+_searched = False
+_font_lock = threading.Lock()
+
+
+def unicode_font():
+    """
+    The first usable font from EXIF_PDF_FONT / UNICODE_FONT_PATHS,
+    loaded once per process; None if there is none.
+    """
+    global _unicode_font, _searched
+    with _font_lock:
+        if _searched:
+            return _unicode_font
+
+        override = os.environ.get("EXIF_PDF_FONT")
+        for path in ((override,) if override else ()) + UNICODE_FONT_PATHS:
+            if not os.path.exists(path):
+                continue
+            try:
+                _unicode_font = TrueTypeFont(path)
+                break
+            except (OSError, ValueError, KeyError, IndexError, struct.error):
+                continue
+        _searched = True
+        return _unicode_font
@@ -0,0 +1,534 @@
+import io
+import os
+import time
+import zlib
+import struct
+from collections import Counter
+
+from pdf_fonts import unicode_font
+
+
+# A4 in points
+PAGE_WIDTH = 595.28
+PAGE_HEIGHT = 841.89
+PAGE_MARGIN = 40
+
+FONT_SIZE = 8
+ROW_HEIGHT = 11
+HEADER_HEIGHT = 16
+FIELD_WIDTH = 150
+# Long values wrap onto at most this many lines
+MAX_VALUE_LINES = 3
+THUMB_SIZE = 72
+THUMB_QUALITY = 75
+
+RISK_LEVELS = ("HIGH", "MEDIUM", "LOW")
+RISK_COLORS = {
+    "HIGH": (0.85, 0.2, 0.2),
+    "MEDIUM": (0.95, 0.65, 0.1),
+    "LOW": (0.3, 0.7, 0.3),
+}
+NO_RISK_COLOR = (0.35, 0.35, 0.4)
+
+# Standard 14 fonts: nothing to embed
+FONTS = {"F1": "Helvetica", "F2": "Helvetica-Bold"}
+# Embedded TrueType (see pdf_fonts) for text outside WinAnsi; no bold face
+UNICODE_FONT = "F3"
+# Glyph → text entries per ToUnicode bfchar block (the CMap limit)
+BFCHAR_BLOCK = 100
+
+# Helvetica advance widths (1/1000 em) for ASCII 32..126
+_HELVETICA_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+CHAR_WIDTHS = {chr(32 + i): w for i, w in enumerate(_HELVETICA_WIDTHS)}
+DEFAULT_CHAR_WIDTH = 556
+# Helvetica-Bold runs ~5% wider; close enough for fitting headings
+BOLD_FACTOR = 1.05
+
+
+def is_winansi(text):
+    """
+    True if Helvetica (WinAnsiEncoding) can show text as is.
+    """
+    try:
+        text.encode("cp1252")
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def _char_widths(text):
+    """
+    ch → advance (1/1000 em) in the font text will be drawn with.
+    """
+    font = None if is_winansi(text) else unicode_font()
+    if font is None:
+        return lambda ch: CHAR_WIDTHS.get(ch, DEFAULT_CHAR_WIDTH)
+    return font.char_width
+
+
+def text_width(text, size, bold=False):
+    width = sum(map(_char_widths(text), text)) * size / 1000
+    return width * BOLD_FACTOR if bold else width
+
+
+def wrap_text(text, size, width, max_lines=MAX_VALUE_LINES):
+    """
+    Split text into lines no wider than width (character wrap);
+    an ellipsis marks anything cut after max_lines.
+    """
+    if text_width(text, size) <= width:
+        return [text]
+
+    char_width = _char_widths(text)
+    lines = []
+    line = []
+    used = 0.0
+    limit = width * 1000 / size
+    for ch in text:
+        w = char_width(ch)
+        if used + w > limit and line:
+            lines.append("".join(line))
+            if len(lines) == max_lines:
+                lines[-1] = lines[-1][:-3] + "..."
+                return lines
+            line, used = [], 0.0
+        line.append(ch)
+        used += w
+    lines.append("".join(line))
+    return lines
+
+
+def _pdf_string(text):
+    raw = str(text).encode("cp1252", errors="replace")
+    return b"(" + raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _pdf_text_string(text):
+    """
+    Document text (e.g. /Title): UTF-16 when WinAnsi is not enough.
+    """
+    text = str(text)
+    if is_winansi(text):
+        return _pdf_string(text)
+    return b"<feff%s>" % text.encode("utf-16-be").hex().encode()
+
+
+def _to_unicode_cmap(glyphs):
+    """
+    ToUnicode CMap for {glyph id: text}, so embedded-font text can be
+    searched and copied.
+    """
+    lines = [
+        b"/CIDInit /ProcSet findresource begin",
+        b"12 dict begin",
+        b"begincmap",
+        b"/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def",
+        b"/CMapName /Adobe-Identity-UCS def",
+        b"/CMapType 2 def",
+        b"1 begincodespacerange",
+        b"<0000> <FFFF>",
+        b"endcodespacerange",
+    ]
+    items = sorted(glyphs.items())
+    for start in range(0, len(items), BFCHAR_BLOCK):
+        block = items[start:start + BFCHAR_BLOCK]
+        lines.append(b"%d beginbfchar" % len(block))
+        for gid, text in block:
+            lines.append(b"<%04x> <%s>" % (gid, text.encode("utf-16-be").hex().encode()))
+        lines.append(b"endbfchar")
+    lines += [
+        b"endcmap",
+        b"CMapName currentdict /CMap defineresource pop",
+        b"end",
+        b"end",
+    ]
+    return b"\n".join(lines)
+
+
+# -------------------------------------------------
+# LOW-LEVEL PDF FILE (objects written as they are made)
+# -------------------------------------------------
+class _PDFFile:
+    """
+    Minimal PDF writer: objects go to disk immediately and only their
+    byte offsets are kept, so memory does not grow with page count.
+    """
+
+    def __init__(self, path):
+        self.f = open(path, "wb")
+        self.offsets = []  # object id - 1 → byte offset (None until written)
+        self.f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def reserve(self):
+        self.offsets.append(None)
+        return len(self.offsets)
+
+    def write_object(self, obj_id, body):
+        self.offsets[obj_id - 1] = self.f.tell()
+        self.f.write(b"%d 0 obj\n" % obj_id + body + b"\nendobj\n")
+
+    def add_object(self, body):
+        obj_id = self.reserve()
+        self.write_object(obj_id, body)
+        return obj_id
+
+    def add_stream(self, data, entries=b"", compress=True):
+        if compress:
+            data = zlib.compress(data, 6)
+            entries += b" /Filter /FlateDecode"
+        return self.add_object(
+            b"<< /Length %d%s >>\nstream\n" % (len(data), entries) + data + b"\nendstream"
+        )
+
+    def close(self, root_id, info_id):
+        xref = self.f.tell()
+        self.f.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(self.offsets) + 1))
+        for offset in self.offsets:
+            self.f.write(b"%010d 00000 n \n" % (offset or 0))
+        self.f.write(
+            b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (len(self.offsets) + 1, root_id, info_id, xref)
+        )
+        self.f.close()
+
+
+# -------------------------------------------------
+# REPORT
+# -------------------------------------------------
+class BulkPDFWriter:
+    """
+    Paginated PDF report: a summary page (image count, privacy risk
+    distribution, GPS / errors) followed by one metadata table per
+    image. Tables that do not fit continue on the next page.
+
+    Text outside WinAnsi (CJK file names, Cyrillic tags, ...) is drawn
+    with an embedded TrueType subset (see pdf_fonts).
+
+    Same write()/close() interface as the report_writers classes, so it
+    consumes bulk records as a stream. Each finished page is compressed
+    and written straight to disk, and records are dropped once drawn:
+    memory stays at one page plus running totals for any number of
+    images. The summary page is written last but listed first.
+
+    root:       folder the report keys are relative to (for thumbnails)
+    thumbnails: draw a small preview next to each table (needs root)
+    summary:    False for a plain single-image report
+    """
+
+    def __init__(self, path, title="EXIF Metadata Report", root=None, thumbnails=False,
+                 summary=True):
+        self.path = path
+        self.title = title
+        self.root = root
+        self.thumbnails = thumbnails and root is not None
+        self.summary = summary
+        self.count = 0
+
+        self.risk_levels = Counter()
+        self.scores = 0
+        self.with_gps = 0
+        self.errors = 0
+
+        self.pdf = _PDFFile(path)
+        self.pages_id = self.pdf.reserve()
+        self.font_ids = {
+            name: self.pdf.add_object(
+                b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>"
+                % base.encode()
+            )
+            for name, base in FONTS.items()
+        }
+        self.page_ids = []
+        self.page_number = 1 if summary else 0
+        # Embedded font: reserved on first use, written at close() once
+        # every glyph it has to carry is known
+        self.unicode_id = None
+        self.glyphs = {}  # glyph id → text, for the subset and ToUnicode
+
+        self.ops = None
+        self.images = {}
+        self.y = 0
+        self._new_page()
+
+    # ---------- DRAWING ----------
+    def _text(self, x, y, text, size=FONT_SIZE, bold=False):
+        text = str(text)
+        font = None if is_winansi(text) else unicode_font()
+        if font is None:
+            self.ops.append(
+                b"BT /%s %g Tf %.2f %.2f Td %s Tj ET"
+                % (b"F2" if bold else b"F1", size, x, y, _pdf_string(text))
+            )
+            return
+
+        if self.unicode_id is None:
+            self.unicode_id = self.pdf.reserve()
+            self.font_ids[UNICODE_FONT] = self.unicode_id
+        codes = [font.glyph(ch) for ch in text]
+        for gid, ch in zip(codes, text):
+            if gid:
+                self.glyphs.setdefault(gid, ch)
+        self.ops.append(
+            b"BT /%s %g Tf %.2f %.2f Td <%s> Tj ET"
+            % (UNICODE_FONT.encode(), size, x, y,
+               struct.pack(f">{len(codes)}H", *codes).hex().encode())
+        )
+
+    def _text_right(self, x, y, text, size=FONT_SIZE, bold=False):
+        self._text(x - text_width(text, size, bold), y, text, size, bold)
+
+    def _rect(self, x, y, w, h, color):
+        self.ops.append(b"%.3f %.3f %.3f rg %.2f %.2f %.2f %.2f re f 0 g" % (*color, x, y, w, h))
+
+    def _image(self, img, x, y):
+        """
+        Embed a PIL image as a JPEG XObject and draw it at (x, y).
+        """
+        buf = io.BytesIO()
+        img.convert("RGB").save(buf, "JPEG", quality=THUMB_QUALITY)
+        w, h = img.size
+        obj_id = self.pdf.add_stream(
+            buf.getvalue(),
+            b" /Type /XObject /Subtype /Image /Width %d /Height %d"
+            b" /ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /DCTDecode" % (w, h),
+            compress=False
+        )
+        name = b"Im%d" % obj_id
+        self.images[name] = obj_id
+        self.ops.append(b"q %d 0 0 %d %.2f %.2f cm /%s Do Q" % (w, h, x, y, name))
+
+    # ---------- PAGES ----------
+    def _new_page(self):
+        if self.ops is not None:
+            self._end_page()
+        self.ops = []
+        self.images = {}
+        self.page_number += 1
+
+        self._text(PAGE_MARGIN, PAGE_HEIGHT - PAGE_MARGIN, self.title, 12, bold=True)
+        self._text_right(PAGE_WIDTH - PAGE_MARGIN, PAGE_MARGIN / 2, f"Page {self.page_number}")
+        self.y = PAGE_HEIGHT - PAGE_MARGIN - 20
+
+    def _end_page(self):
+        content_id = self.pdf.add_stream(b"\n".join(self.ops))
+        fonts = b" ".join(b"/%s %d 0 R" % (n.encode(), i) for n, i in self.font_ids.items())
+        images = b" ".join(b"/%s %d 0 R" % (n, i) for n, i in self.images.items())
+        self.page_ids.append(self.pdf.add_object(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %.2f %.2f]"
+            b" /Resources << /Font << %s >> /XObject << %s >> >> /Contents %d 0 R >>"
+            % (self.pages_id, PAGE_WIDTH, PAGE_HEIGHT, fonts, images, content_id)
+        ))
+        self.ops = None
+
+    def _fits(self, space):
+        return self.y - space >= PAGE_MARGIN
+
+    def _heading(self, image, data, continued=False):
+        level = data.get("PrivacyRiskLevel")
+        width = PAGE_WIDTH - 2 * PAGE_MARGIN
+        self._rect(PAGE_MARGIN, self.y - HEADER_HEIGHT + 4, width, HEADER_HEIGHT,
+                   RISK_COLORS.get(level, NO_RISK_COLOR))
+
+        label = f"{image}  (continued)" if continued else str(image)
+        risk = "" if level is None or continued else f"Risk {data.get('PrivacyRiskScore')} {level}"
+        room = width - 12 - text_width(risk, 9, bold=True)
+        label = wrap_text(label, 9 * BOLD_FACTOR, room, max_lines=1)[0]
+
+        self.ops.append(b"1 g")
+        self._text(PAGE_MARGIN + 4, self.y - 8, label, 9, bold=True)
+        if risk:
+            self._text_right(PAGE_WIDTH - PAGE_MARGIN - 4, self.y - 8, risk, 9, bold=True)
+        self.ops.append(b"0 g")
+        self.y -= HEADER_HEIGHT + 2
+
+    def _thumbnail(self, image):
+        """
+        Draw a preview at the right edge; returns the width it takes.
+        """
+        from preview import load_preview
+
+        try:
+            img = load_preview(os.path.join(self.root, image), (THUMB_SIZE, THUMB_SIZE))
+        except Exception:
+            return 0
+
+        w, h = img.size
+        self._image(img, PAGE_WIDTH - PAGE_MARGIN - w, self.y - h)
+        return w + 8
+
+    # ---------- STREAM ----------
+    def write(self, image, data):
+        self._tally(data)
+
+        value_width = PAGE_WIDTH - 2 * PAGE_MARGIN - FIELD_WIDTH - 8
+        if self.thumbnails:
+            value_width -= THUMB_SIZE + 8
+        rows = [
+            (str(name), wrap_text("" if value is None else str(value), FONT_SIZE, value_width))
+            for name, value in data.items()
+        ]
+
+        first_row = ROW_HEIGHT * len(rows[0][1]) if rows else ROW_HEIGHT
+        needed = HEADER_HEIGHT + max(first_row, THUMB_SIZE if self.thumbnails else 0) + 2
+        if not self._fits(needed):
+            self._new_page()
+
+        self._heading(image, data)
+        page = self.page_number
+        thumb_bottom = self.y
+        if self.thumbnails:
+            self._thumbnail(image)
+            thumb_bottom -= THUMB_SIZE
+
+        for i, (name, lines) in enumerate(rows):
+            height = ROW_HEIGHT * len(lines)
+            if not self._fits(height):
+                self._new_page()
+                self._heading(image, data, continued=True)
+
+            if i % 2:
+                self._rect(PAGE_MARGIN, self.y - height + 3,
+                           FIELD_WIDTH + value_width, height, (0.94, 0.94, 0.96))
+            self._text(PAGE_MARGIN + 4, self.y - 6, name[:40])
+            for n, line in enumerate(lines):
+                self._text(PAGE_MARGIN + FIELD_WIDTH, self.y - 6 - n * ROW_HEIGHT, line)
+            self.y -= height
+
+        if self.page_number == page:
+            # Short tables still leave room for the thumbnail
+            self.y = min(self.y, thumb_bottom)
+        self.y -= 10
+        self.count += 1
+
+    def _tally(self, data):
+        if "Error" in data:
+            self.errors += 1
+            return
+        level = data.get("PrivacyRiskLevel")
+        if level is not None:
+            self.risk_levels[level] += 1
+            self.scores += data.get("PrivacyRiskScore") or 0
+        if data.get("GPSLatitude") is not None:
+            self.with_gps += 1
+
+    # ---------- SUMMARY ----------
+    def _draw_summary(self):
+        saved_number = self.page_number
+        self.ops = []
+        self.images = {}
+        self.page_number = 1
+
+        self._text(PAGE_MARGIN, PAGE_HEIGHT - PAGE_MARGIN, self.title, 12, bold=True)
+        self._text_right(PAGE_WIDTH - PAGE_MARGIN, PAGE_MARGIN / 2, "Page 1")
+
+        x = PAGE_MARGIN
+        y = PAGE_HEIGHT - PAGE_MARGIN - 40
+        self._text(x, y, "Summary", 16, bold=True)
+        y -= 30
+
+        scored = sum(self.risk_levels.values())
+        average = self.scores / scored if scored else 0
+        for label, value in (
+            ("Images", self.count),
+            ("With GPS location", self.with_gps),
+            ("Without EXIF / unreadable", self.errors),
+            ("Average risk score", f"{average:.1f}"),
+            ("Generated", time.strftime("%Y-%m-%d %H:%M")),
+        ):
+            self._text(x, y, label, 10)
+            self._text(x + 180, y, value, 10)
+            y -= 16
+
+        y -= 20
+        self._text(x, y, "Privacy risk distribution", 12, bold=True)
+        y -= 24
+
+        bar_width = PAGE_WIDTH - 2 * PAGE_MARGIN - 200
+        levels = list(RISK_LEVELS) + sorted(set(self.risk_levels) - set(RISK_LEVELS))
+        for level in levels:
+            n = self.risk_levels[level]
+            share = n / scored if scored else 0
+            self._text(x, y, level, 10)
+            self._rect(x + 70, y - 2, max(bar_width * share, 1), 12,
+                       RISK_COLORS.get(level, NO_RISK_COLOR))
+            self._text(x + 80 + bar_width, y, f"{n}  ({share:.0%})", 10)
+            y -= 22
+
+        self._end_page()
+        self.page_number = saved_number
+        # Written last, listed first
+        self.page_ids.insert(0, self.page_ids.pop())
+
+    def _write_unicode_font(self):
+        """
+        Type0 / Identity-H font over a glyph subset of the TrueType
+        file, with a ToUnicode map for search and copy.
+        """
+        font = unicode_font()
+        pdf = self.pdf
+        name = b"EXIFSB+" + font.name.encode()
+
+        data = font.subset(self.glyphs)
+        file_id = pdf.add_stream(data, b" /Length1 %d" % len(data))
+        descriptor_id = pdf.add_object(
+            b"<< /Type /FontDescriptor /FontName /%s /Flags 4 /FontBBox [%d %d %d %d]"
+            b" /ItalicAngle 0 /Ascent %d /Descent %d /CapHeight %d /StemV 80"
+            b" /FontFile2 %d 0 R >>"
+            % (name, *font.bbox, font.ascent, font.descent, font.cap_height, file_id)
+        )
+        widths = b" ".join(b"%d [%d]" % (gid, font.advance(gid)) for gid in sorted(self.glyphs))
+        cid_font_id = pdf.add_object(
+            b"<< /Type /Font /Subtype /CIDFontType2 /BaseFont /%s"
+            b" /CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >>"
+            b" /FontDescriptor %d 0 R /DW %d /W [%s] /CIDToGIDMap /Identity >>"
+            % (name, descriptor_id, font.advance(0), widths)
+        )
+        cmap_id = pdf.add_stream(_to_unicode_cmap(self.glyphs))
+        pdf.write_object(
+            self.unicode_id,
+            b"<< /Type /Font /Subtype /Type0 /BaseFont /%s /Encoding /Identity-H"
+            b" /DescendantFonts [%d 0 R] /ToUnicode %d 0 R >>" % (name, cid_font_id, cmap_id)
+        )
+
+    def close(self):
+        if self.pdf is None:
+            return
+        self._end_page()
+        if self.summary:
+            self._draw_summary()
+        if self.unicode_id is not None:
+            self._write_unicode_font()
+
+        pdf = self.pdf
+        kids = b" ".join(b"%d 0 R" % page_id for page_id in self.page_ids)
+        pdf.write_object(
+            self.pages_id,
+            b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self.page_ids))
+        )
+        root_id = pdf.add_object(b"<< /Type /Catalog /Pages %d 0 R >>" % self.pages_id)
+        info_id = pdf.add_object(
+            b"<< /Title %s /Producer (EXIF Metadata Extractor) >>" % _pdf_text_string(self.title)
+        )
+        pdf.close(root_id, info_id)
+        self.pdf = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def export_metadata_pdf(path, image, metadata, title="EXIF Metadata Report"):
+    """
+    Single-image report (GUI export): one paginated table.
+    """
+    with BulkPDFWriter(path, title=title, summary=False) as writer:
+        writer.write(image, metadata)
@@ -0,0 +1,163 @@
+import io
+import os
+import threading
+from collections import OrderedDict
+
+from PIL import Image
+
+from exif_reader import load_exif
+
+
+PREVIEW_SIZE = (300, 300)
+
+# Embedded thumbnails smaller than this fraction of the preview box
+# look too blurry when scaled up, so a real decode is used instead
+MIN_THUMB_FRACTION = 0.5
+
+CACHE_SIZE = 32
+
+HEIF_EXTENSIONS = (".heic", ".heif")
+_heif_registered = False
+
+
+class _PreviewCache:
+    """
+    Small thread-safe LRU of decoded previews keyed by
+    (path, size, mtime_ns, preview size).
+    """
+
+    def __init__(self, capacity=CACHE_SIZE):
+        self.capacity = capacity
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            img = self.items.get(key)
+            if img is not None:
+                self.items.move_to_end(key)
+            return img
+
+    def put(self, key, img):
+        with self.lock:
+            self.items[key] = img
+            self.items.move_to_end(key)
+            while len(self.items) > self.capacity:
+                self.items.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+
+
+_cache = _PreviewCache()
+
+
+def _big_enough(img_size, size):
+    return max(img_size) >= MIN_THUMB_FRACTION * min(size)
+
+
+def _from_exif_thumbnail(path, size):
+    """
+    IFD1 JPEG thumbnail from the EXIF block (JPEG / TIFF only).
+    """
+    try:
+        exif_dict = load_exif(path, ifds=("1st",))
+    except Exception:
+        return None
+
+    thumb = exif_dict.get("thumbnail") if exif_dict else None
+    if not thumb:
+        return None
+
+    try:
+        img = Image.open(io.BytesIO(thumb))
+        img.load()
+    except Exception:
+        return None
+
+    return img if _big_enough(img.size, size) else None
+
+
+def _from_heif_thumbnail(path, size):
+    """
+    Smallest embedded HEIF thumbnail that is still big enough.
+    """
+    try:
+        import pillow_heif
+
+        heif = pillow_heif.open_heif(path)
+        image = heif[getattr(heif, "primary_index", 0)]
+        sizes = image.info.get("thumbnails") or []
+
+        for index in sorted(range(len(sizes)), key=lambda i: sizes[i]):
+            if sizes[index] >= MIN_THUMB_FRACTION * min(size):
+                return image.get_thumbnail(index).to_pillow()
+    except Exception:
+        return None
+
+    return None
+
+
+def ensure_heif_opener():
+    """
+    Register the HEIC plugin with Pillow on first use, so sessions that
+    never open a HEIC file don't pay for loading libheif.
+    """
+    global _heif_registered
+    if not _heif_registered:
+        from pillow_heif import register_heif_opener
+        register_heif_opener()
+        _heif_registered = True
+
+
+def _decode(path, size):
+    """
+    Decode the image itself. JPEGs use draft() so libjpeg scales by
+    1/2, 1/4 or 1/8 during decoding instead of producing full resolution.
+    """
+    if path.lower().endswith(HEIF_EXTENSIONS):
+        ensure_heif_opener()
+
+    img = Image.open(path)
+    if img.format == "JPEG":
+        img.draft("RGB", size)
+    img.load()
+    return img
+
+
+def load_preview(path, size=PREVIEW_SIZE):
+    """
+    Returns a PIL image no larger than size for the preview pane.
+
+    Order: LRU cache → embedded EXIF thumbnail → embedded HEIF thumbnail
+    → JPEG draft (DCT-scaled) decode → full decode.
+    """
+    try:
+        st = os.stat(path)
+        key = (os.path.abspath(path), st.st_size, st.st_mtime_ns, tuple(size))
+    except OSError:
+        key = None
+
+    if key is not None:
+        cached = _cache.get(key)
+        if cached is not None:
+            return cached
+
+    img = _from_exif_thumbnail(path, size)
+
+    if img is None and path.lower().endswith(HEIF_EXTENSIONS):
+        img = _from_heif_thumbnail(path, size)
+
+    if img is None:
+        img = _decode(path, size)
+
+    img.thumbnail(size)
+
+    if key is not None:
+        _cache.put(key, img)
+    return img
+
+
+def clear_cache():
+    _cache.clear()
@@ -0,0 +1,174 @@
+import json
+from collections import namedtuple
+
+
+# Pseudo-tag: "valid GPS coordinates were decoded"
+GPS_TAG = "<gps>"
+
+# A rule fires when any of its tags is present.
+# per_tag=True adds the weight once for every tag present instead.
+Rule = namedtuple("Rule", "name tags weight reason per_tag")
+
+DEFAULT_RULES = (
+    Rule("gps", (GPS_TAG,), 6, "Exact GPS location present", False),
+    Rule("device", ("Make", "Model"), 2, "Camera make/model present", False),
+    Rule("time", ("DateTimeOriginal",), 1, "Original capture time present", False),
+    Rule("software", ("Software",), 1, "Editing software identified", False),
+    Rule(
+        "sensitive",
+        ("Artist", "CameraOwnerName", "OwnerName", "Copyright",
+         "BodySerialNumber", "LensSerialNumber"),
+        2, "Sensitive identifier: {tag}", True
+    ),
+)
+
+# (level, minimum score), highest first; anything below is LOW
+DEFAULT_THRESHOLDS = (("HIGH", 7), ("MEDIUM", 4))
+DEFAULT_MAX_SCORE = 10
+
+# Tags the default rules look at (for extract_exif field projection)
+RISK_FIELDS = tuple(
+    tag for rule in DEFAULT_RULES for tag in rule.tags if tag != GPS_TAG
+)
+
+
+class RiskEngine:
+    """
+    Table-driven privacy risk scoring.
+
+    score()       – one EXIF dict → (score, level, reasons)
+    score_batch() – many EXIF dicts → (scores, levels) NumPy arrays
+    score_masks() – same, from precomputed tag-presence columns
+
+    Weights and thresholds come from the rule table, so the GUI and the
+    bulk report always agree.
+    """
+
+    def __init__(self, rules=DEFAULT_RULES, thresholds=DEFAULT_THRESHOLDS,
+                 max_score=DEFAULT_MAX_SCORE):
+        self.rules = tuple(rules)
+        self.thresholds = tuple(sorted(thresholds, key=lambda t: -t[1]))
+        self.max_score = max_score
+
+        # Every tag referenced by any rule, in a fixed column order
+        self.tags = []
+        for rule in self.rules:
+            for tag in rule.tags:
+                if tag not in self.tags:
+                    self.tags.append(tag)
+        self.columns = {tag: i for i, tag in enumerate(self.tags)}
+
+    # ---------- CONFIGURATION ----------
+    @classmethod
+    def from_config(cls, config):
+        """
+        config: dict or JSON file path, e.g.
+        {"weights": {"gps": 5}, "thresholds": {"HIGH": 8, "MEDIUM": 4}, "max_score": 10}
+        """
+        if isinstance(config, str):
+            with open(config, "r", encoding="utf-8") as f:
+                config = json.load(f)
+
+        weights = config.get("weights", {})
+        rules = [
+            rule._replace(weight=weights.get(rule.name, rule.weight))
+            for rule in DEFAULT_RULES
+        ]
+        thresholds = tuple(config.get("thresholds", dict(DEFAULT_THRESHOLDS)).items())
+        return cls(rules, thresholds, config.get("max_score", DEFAULT_MAX_SCORE))
+
+    def level_for(self, score):
+        for level, minimum in self.thresholds:
+            if score >= minimum:
+                return level
+        return "LOW"
+
+    # ---------- SINGLE RECORD ----------
+    def score(self, exif, has_gps=False):
+        """
+        has_gps: valid coordinates were already decoded (avoids a
+        second extract_gps / get_lat_long pass).
+        Returns (score, level, reasons).
+        """
+        if not exif:
+            return 0, "LOW", ["No EXIF metadata present"]
+
+        score = 0
+        reasons = []
+
+        for rule in self.rules:
+            present = [
+                tag for tag in rule.tags
+                if (has_gps if tag == GPS_TAG else tag in exif)
+            ]
+            if not present:
+                continue
+
+            if rule.per_tag:
+                score += rule.weight * len(present)
+                reasons.extend(rule.reason.format(tag=tag) for tag in present)
+            else:
+                score += rule.weight
+                reasons.append(rule.reason)
+
+        score = min(score, self.max_score)
+        return score, self.level_for(score), reasons
+
+    # ---------- BATCH ----------
+    def presence_masks(self, exif_records, has_gps):
+        """
+        Boolean tag-presence matrix, shape (n_records, n_tags).
+
+        One pass over the records: images from the same camera share a
+        key set, so each distinct key tuple is checked against the tags
+        once and every other record costs a single dict lookup.
+        """
+        import numpy as np
+
+        patterns = {}  # key tuple → row index into rows
+        rows = []
+        index = np.empty(len(exif_records), dtype=np.intp)
+        for i, exif in enumerate(exif_records):
+            keys = tuple(exif) if exif else ()
+            row = patterns.get(keys)
+            if row is None:
+                row = patterns[keys] = len(rows)
+                present = set(keys)
+                rows.append([tag in present for tag in self.tags])
+            index[i] = row
+
+        masks = np.array(rows, dtype=bool).reshape(len(rows), len(self.tags))[index]
+        if GPS_TAG in self.columns:
+            masks[:, self.columns[GPS_TAG]] = np.asarray(has_gps, dtype=bool)
+        return masks
+
+    def score_masks(self, masks):
+        """
+        Vectorized scoring over a presence matrix → (scores, levels).
+        """
+        import numpy as np
+
+        scores = np.zeros(masks.shape[0], dtype=np.int64)
+        for rule in self.rules:
+            cols = masks[:, [self.columns[tag] for tag in rule.tags]]
+            if rule.per_tag:
+                scores += rule.weight * cols.sum(axis=1)
+            else:
+                scores += rule.weight * cols.any(axis=1)
+
+        scores = np.minimum(scores, self.max_score)
+
+        levels = np.full(scores.shape, "LOW", dtype=object)
+        for level, minimum in reversed(self.thresholds):
+            levels[scores >= minimum] = level
+
+        return scores, levels
+
+    def score_batch(self, exif_records, has_gps):
+        """
+        Score many EXIF dicts at once; has_gps is a bool per record.
+        """
+        return self.score_masks(self.presence_masks(exif_records, has_gps))
+
+
+DEFAULT_ENGINE = RiskEngine()
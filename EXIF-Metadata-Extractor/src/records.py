@@ -0,0 +1,209 @@
+import sys
+
+
+# Tag / report name → typed attribute, in output order
+HOT_FIELDS = {
+    "Make": "make",
+    "Model": "model",
+    "DateTimeOriginal": "datetime",
+    "ExposureTime": "exposure",
+    "FNumber": "fnumber",
+    "ISOSpeedRatings": "iso",
+    "FocalLength": "focal_length",
+}
+# Always present (possibly None) on records without an error
+DERIVED_FIELDS = {
+    "GPSLatitude": "lat",
+    "GPSLongitude": "lon",
+    "PrivacyRiskScore": "risk_score",
+    "PrivacyRiskLevel": "risk_level",
+}
+
+# Few distinct values, repeated across millions of images
+INTERNED_ATTRS = ("make", "model", "risk_level")
+
+# Shared overflow key tuples: images from the same camera carry the
+# same tag set, so they all point at one tuple of interned names
+MAX_KEY_TUPLES = 4096
+_key_tuples = {}
+
+
+class _Unset:
+    """
+    Default of hot-field slots for tags the image does not have; None
+    is a real value (the tag is present but empty).
+    """
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return "UNSET"
+
+    def __reduce__(self):
+        # Unpickles as this module's singleton
+        return "UNSET"
+
+
+UNSET = _Unset()
+
+
+def _shared_keys(names):
+    keys = tuple(sys.intern(name) for name in names)
+    shared = _key_tuples.get(keys)
+    if shared is not None:
+        return shared
+    if len(_key_tuples) < MAX_KEY_TUPLES:
+        _key_tuples[keys] = keys
+    return keys
+
+
+class ImageRecord:
+    """
+    Compact bulk result for one image.
+
+    Hot fields are typed slots (make, model, datetime, exposure, fnumber,
+    iso, focal_length, lat, lon, risk_score, risk_level); every other
+    tag lives in a parallel (keys, values) overflow whose key tuple is
+    shared between records with the same tag set.
+
+    Hot slots of tags the image does not have hold UNSET; a tag that is
+    present with a None value keeps its key (null in JSON / CSV).
+
+    Also behaves as a read-only mapping with the same keys and order as
+    the old per-image report dict, so writers can consume it directly.
+    """
+
+    __slots__ = (
+        "path", "cached", "error",
+        "make", "model", "datetime", "exposure", "fnumber", "iso", "focal_length",
+        "lat", "lon", "risk_score", "risk_level",
+        "extra_keys", "extra_values",
+    )
+
+    def __init__(self, path, cached=False, error=None):
+        self.path = path
+        self.cached = cached
+        self.error = error
+        self.make = self.model = self.datetime = UNSET
+        self.exposure = self.fnumber = self.iso = self.focal_length = UNSET
+        self.lat = self.lon = None
+        self.risk_score = None
+        self.risk_level = None
+        self.extra_keys = ()
+        self.extra_values = ()
+
+    # ---------- BUILD ----------
+    @classmethod
+    def from_metadata(cls, path, metadata, cached=False):
+        """
+        metadata: {tag name: normalized value}; raw GPSLatitude /
+        GPSLongitude are dropped in favour of the decimal lat / lon slots.
+        """
+        record = cls(path, cached)
+        names, values = [], []
+        for name, value in metadata.items():
+            if name in DERIVED_FIELDS:
+                continue
+            attr = HOT_FIELDS.get(name)
+            if attr is None:
+                names.append(name)
+                values.append(value)
+            else:
+                if attr in INTERNED_ATTRS and isinstance(value, str):
+                    value = sys.intern(value)
+                setattr(record, attr, value)
+
+        if names:
+            record.extra_keys = _shared_keys(names)
+            record.extra_values = tuple(values)
+        return record
+
+    def set_risk(self, score, level):
+        self.risk_score = int(score)
+        self.risk_level = sys.intern(str(level))
+
+    # ---------- PICKLING (worker → parent) ----------
+    def __reduce__(self):
+        return _restore, tuple(getattr(self, slot) for slot in self.__slots__)
+
+    # ---------- MAPPING VIEW ----------
+    def keys(self):
+        if self.error is not None:
+            return ["Error"]
+        keys = [name for name, attr in HOT_FIELDS.items() if getattr(self, attr) is not UNSET]
+        keys.extend(self.extra_keys)
+        keys.extend(DERIVED_FIELDS)
+        return keys
+
+    def __getitem__(self, name):
+        if self.error is not None:
+            if name == "Error":
+                return self.error
+            raise KeyError(name)
+
+        attr = HOT_FIELDS.get(name)
+        if attr is not None:
+            value = getattr(self, attr)
+            if value is UNSET:
+                raise KeyError(name)
+            return value
+
+        attr = DERIVED_FIELDS.get(name)
+        if attr is not None:
+            return getattr(self, attr)
+
+        try:
+            return self.extra_values[self.extra_keys.index(name)]
+        except ValueError:
+            raise KeyError(name) from None
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def __contains__(self, name):
+        try:
+            self[name]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def items(self):
+        return [(name, self[name]) for name in self.keys()]
+
+    def values(self):
+        return [self[name] for name in self.keys()]
+
+    def as_dict(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"ImageRecord({self.path!r}, {self.as_dict()!r})"
+
+
+def _restore(*values):
+    record = ImageRecord.__new__(ImageRecord)
+    for slot, value in zip(ImageRecord.__slots__, values):
+        setattr(record, slot, value)
+    # Re-share key tuples and strings in the receiving process
+    record.extra_keys = _shared_keys(record.extra_keys) if record.extra_keys else ()
+    for attr in INTERNED_ATTRS:
+        value = getattr(record, attr)
+        if isinstance(value, str):
+            setattr(record, attr, sys.intern(value))
+    return record
+
+
+def as_dict(data):
+    """
+    Plain dict for a report entry (ImageRecord or dict).
+    """
+    return data if isinstance(data, dict) else data.as_dict()
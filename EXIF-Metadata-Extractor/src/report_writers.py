@@ -0,0 +1,162 @@
+import csv
+import json
+import time
+
+from records import as_dict
+
+
+# Flush to disk at least this often (seconds) ...
+FLUSH_INTERVAL = 1.0
+# ... or after this many records, whichever comes first
+FLUSH_EVERY = 500
+
+
+class _StreamWriter:
+    """
+    Base for writers that emit one bulk record at a time.
+    Records are written as they arrive and flushed periodically,
+    so memory stays flat and a crash keeps everything written so far.
+
+    path may also be an open text stream (e.g. sys.stdout); it is
+    flushed but not closed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._since_flush = 0
+        self._last_flush = time.monotonic()
+        self._owns_file = not hasattr(path, "write")
+        self.f = open(path, "w", newline="", encoding="utf-8") if self._owns_file else path
+        self._closed = False
+
+    def write(self, image, data):
+        self._write(image, data)
+        self.count += 1
+        self._since_flush += 1
+
+        now = time.monotonic()
+        if self._since_flush >= FLUSH_EVERY or now - self._last_flush >= FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        self.f.flush()
+        self._since_flush = 0
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._finish()
+            if self._owns_file:
+                self.f.close()
+            else:
+                self.f.flush()
+
+    def _write(self, image, data):
+        raise NotImplementedError
+
+    def _finish(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class NDJSONWriter(_StreamWriter):
+    """
+    One JSON object per line: {"Image": name, ...metadata}
+    """
+
+    def _write(self, image, data):
+        self.f.write(json.dumps({"Image": image, **data}, default=str))
+        self.f.write("\n")
+
+
+class JSONStreamWriter(_StreamWriter):
+    """
+    Streams a valid JSON document.
+
+    mode="object": {"name": {...}, ...}  (same layout as the bulk report)
+    mode="array":  [{"Image": name, ...}, ...]
+    """
+
+    def __init__(self, path, mode="object"):
+        super().__init__(path)
+        self.mode = mode
+        self.f.write("{\n" if mode == "object" else "[\n")
+
+    def _write(self, image, data):
+        if self.count:
+            self.f.write(",\n")
+
+        if self.mode == "object":
+            self.f.write(f"    {json.dumps(image)}: ")
+            self.f.write(json.dumps(as_dict(data), indent=4, default=str).replace("\n", "\n    "))
+        else:
+            self.f.write("    ")
+            self.f.write(json.dumps({"Image": image, **data}, default=str))
+
+    def _finish(self):
+        self.f.write("\n}\n" if self.mode == "object" else "\n]\n")
+
+
+# Header used when no columns are given. It is fixed, so it never depends
+# on which file comes first; every other tag goes to EXTRA_COLUMN as JSON
+DEFAULT_CSV_COLUMNS = (
+    "Make", "Model", "DateTimeOriginal",
+    "ExposureTime", "FNumber", "ISOSpeedRatings", "FocalLength",
+    "Software",
+    "GPSLatitude", "GPSLongitude",
+    "PrivacyRiskScore", "PrivacyRiskLevel",
+    "Error",
+)
+EXTRA_COLUMN = "Extra"
+
+
+class CSVStreamWriter(_StreamWriter):
+    """
+    Bulk CSV: header comes from columns, or DEFAULT_CSV_COLUMNS plus an
+    "Extra" column holding the remaining tags as a JSON object.
+    extra: add the Extra column (default: only with the default columns)
+    """
+
+    def __init__(self, path, columns=None, extra=None):
+        super().__init__(path)
+        self.writer = csv.writer(self.f)
+        self.extra = columns is None if extra is None else extra
+        self.columns = list(DEFAULT_CSV_COLUMNS if columns is None else columns)
+        self._known = set(self.columns)
+        header = ["Image"] + self.columns
+        if self.extra:
+            header.append(EXTRA_COLUMN)
+        self.writer.writerow(header)
+
+    def _write(self, image, data):
+        row = [image] + [data.get(c, "") for c in self.columns]
+        if self.extra:
+            extra = {k: v for k, v in data.items() if k not in self._known}
+            row.append(json.dumps(extra, default=str) if extra else "")
+        self.writer.writerow(row)
+
+
+def open_report_writer(path):
+    """
+    Pick a writer from the file extension
+    (.ndjson / .jsonl / .csv / .parquet / .arrow / .feather / .pdf / .json).
+    """
+    lower = path.lower()
+    if lower.endswith(".pdf"):
+        from pdf_report import BulkPDFWriter
+        return BulkPDFWriter(path)
+    if lower.endswith((".parquet", ".arrow", ".feather")):
+        from columnar_export import ColumnarWriter
+        return ColumnarWriter(path)
+    if lower.endswith((".ndjson", ".jsonl")):
+        return NDJSONWriter(path)
+    if lower.endswith(".csv"):
+        return CSVStreamWriter(path)
+    return JSONStreamWriter(path)
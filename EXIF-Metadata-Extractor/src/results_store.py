@@ -0,0 +1,133 @@
+import os
+import sys
+from array import array
+
+
+# Sortable grid columns → how they are stored
+COLUMNS = ("name", "model", "date", "risk")
+
+NO_SCORE = -1
+NO_DATE = 0
+
+
+def _date_key(value):
+    """
+    "2019:11:24 20:37:31" → 20191124203731 (sorts like the date; 0 if unreadable)
+    """
+    if not isinstance(value, str):
+        return NO_DATE
+    digits = "".join(ch for ch in value[:19] if ch.isdigit())
+    return int(digits) if len(digits) == 14 else NO_DATE
+
+
+def format_date(key):
+    if key == NO_DATE:
+        return ""
+    text = str(key)
+    return f"{text[0:4]}-{text[4:6]}-{text[6:8]} {text[8:10]}:{text[10:12]}:{text[12:14]}"
+
+
+class ResultStore:
+    """
+    Column store for the bulk results grid: only what the grid shows
+    (name, model, capture date, risk) is kept, ~100 bytes per image,
+    so 500k rows fit comfortably in memory. Full metadata stays in the
+    on-disk report; opening a row re-reads the image itself.
+
+    query() returns the row indices to display for a sort / filter;
+    sort orders are cached until more rows arrive.
+    """
+
+    def __init__(self, root=""):
+        self.root = root
+        self.names = []
+        self.models = []
+        self.dates = array("q")
+        self.scores = array("h")
+        self.levels = []
+        self._orders = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    # ---------- BUILD ----------
+    def add(self, name, model=None, date=None, score=None, level=None):
+        self.names.append(name)
+        self.models.append(sys.intern(model) if isinstance(model, str) else "")
+        self.dates.append(_date_key(date))
+        self.scores.append(NO_SCORE if score is None else int(score))
+        self.levels.append(sys.intern(level) if isinstance(level, str) else "")
+
+    @staticmethod
+    def grid_row(data):
+        """
+        Grid fields of a bulk record / report dict (picklable, so workers
+        can send just this): (model, date, score, level)
+        """
+        return (
+            data.get("Model"),
+            data.get("DateTimeOriginal"),
+            data.get("PrivacyRiskScore"),
+            data.get("PrivacyRiskLevel") or ("ERROR" if "Error" in data else None),
+        )
+
+    def clear(self):
+        self.__init__(self.root)
+
+    # ---------- READ ----------
+    def path(self, i):
+        return os.path.join(self.root, self.names[i])
+
+    def row(self, i):
+        """
+        Display strings for row i: (name, model, date, risk)
+        """
+        score = self.scores[i]
+        risk = f"{score:>2}  {self.levels[i]}" if score != NO_SCORE else self.levels[i]
+        return self.names[i], self.models[i], format_date(self.dates[i]), risk
+
+    # ---------- SORT / FILTER ----------
+    def _sort_key(self, column):
+        if column == "risk":
+            return self.scores.__getitem__
+        if column == "date":
+            return self.dates.__getitem__
+        if column == "model":
+            models = self.models
+            return lambda i: models[i].casefold()
+        names = self.names
+        return lambda i: names[i].casefold()
+
+    def order(self, column):
+        """
+        Row indices sorted ascending by column (cached per row count).
+        """
+        cached = self._orders.get(column)
+        if cached is not None and cached[0] == len(self):
+            return cached[1]
+        order = array("l", sorted(range(len(self)), key=self._sort_key(column)))
+        self._orders[column] = (len(self), order)
+        return order
+
+    def query(self, sort=None, descending=False, text=""):
+        """
+        Row indices to display. Without sort or filter this is a plain
+        range, so following a running job costs nothing per row.
+        """
+        text = text.strip().casefold()
+        if sort is None and not text:
+            return range(len(self))
+
+        rows = self.order(sort) if sort else range(len(self))
+        if descending:
+            rows = rows[::-1]
+
+        if text:
+            names, models, levels = self.names, self.models, self.levels
+            rows = array("l", [
+                i for i in rows
+                if text in names[i].casefold()
+                or text in models[i].casefold()
+                or text in levels[i].casefold()
+            ])
+        return rows
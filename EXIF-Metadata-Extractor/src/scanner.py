@@ -0,0 +1,167 @@
+import os
+import queue
+import threading
+from fnmatch import fnmatch
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import stage
+
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".heic", ".tif", ".tiff")
+
+DEFAULT_WALKERS = 8
+
+# Directory entries read per batch: files are handed out after every
+# batch, so a huge flat folder is never held in memory as a whole
+SCAN_BATCH = 256
+
+
+def _matches(rel_path, name, patterns):
+    return any(fnmatch(rel_path, p) or fnmatch(name, p) for p in patterns)
+
+
+def _filter_entries(entries, rel_dir, depth, options):
+    """
+    Split one batch of directory entries into
+    (matching file entries, [(sub_path, sub_rel, depth)]).
+    Uses the d_type cached by os.scandir, so no extra stat calls.
+    """
+    include, exclude, max_depth, extensions, follow_symlinks = options
+    files = []
+    subdirs = []
+
+    for entry in entries:
+        rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+
+        try:
+            if entry.is_dir(follow_symlinks=follow_symlinks):
+                if max_depth is not None and depth >= max_depth:
+                    continue
+                if exclude and _matches(rel, entry.name, exclude):
+                    continue
+                subdirs.append((entry.path, rel, depth + 1))
+                continue
+
+            if not entry.is_file(follow_symlinks=follow_symlinks):
+                continue
+        except OSError:
+            continue
+
+        if extensions and not entry.name.lower().endswith(extensions):
+            continue
+        if include and not _matches(rel, entry.name, include):
+            continue
+        if exclude and _matches(rel, entry.name, exclude):
+            continue
+        files.append(entry)
+
+    return files, subdirs
+
+
+def _scan_dir(path, rel_dir, depth, options):
+    """
+    Read one directory lazily, in the order os.scandir returns entries.
+    Yields (file entries, subdirs) per batch of SCAN_BATCH entries.
+    """
+    try:
+        it = os.scandir(path)
+    except OSError:
+        return
+
+    with it:
+        while True:
+            try:
+                with stage("scan"):
+                    entries = list(islice(it, SCAN_BATCH))
+            except OSError:
+                return
+            if not entries:
+                return
+            yield _filter_entries(entries, rel_dir, depth, options)
+
+
+def _put(out, item, stop):
+    # Bounded queue: wait for the consumer, but give up once it has left
+    while not stop.is_set():
+        try:
+            out.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            pass
+
+
+def _walker(directory, options, out, stop):
+    """
+    Thread body: stream one directory's batches to the consumer,
+    then report that the directory is done.
+    """
+    try:
+        for files, subdirs in _scan_dir(*directory, options):
+            if stop.is_set():
+                return
+            _put(out, (files, subdirs, False), stop)
+    finally:
+        _put(out, ((), (), True), stop)
+
+
+def scan_entries(root, include=None, exclude=None, max_depth=None,
+                 extensions=IMAGE_EXTENSIONS, workers=DEFAULT_WALKERS,
+                 follow_symlinks=False):
+    """
+    Recursively yield os.DirEntry objects for images under root.
+
+    include / exclude: glob patterns matched against the path relative
+                       to root ("a/b.jpg") or the bare name; excluded
+                       directories are not descended into
+    max_depth:         0 = root only, 1 = one level of subfolders, ...
+    workers:           directories are read in parallel by this many threads
+
+    Entries are yielded while directories are still being read, so
+    callers can start processing before the walk finishes and memory
+    stays bounded for huge flat folders. Order follows os.scandir and,
+    with several workers, whichever directory is read first.
+    """
+    options = (
+        tuple(include or ()),
+        tuple(exclude or ()),
+        max_depth,
+        extensions,
+        follow_symlinks,
+    )
+
+    if workers <= 1:
+        stack = [(root, "", 0)]
+        while stack:
+            found = []
+            for files, subdirs in _scan_dir(*stack.pop(), options):
+                yield from files
+                found.extend(subdirs)
+            stack.extend(reversed(found))
+        return
+
+    out = queue.Queue(maxsize=workers * 4)
+    stop = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        pool.submit(_walker, (root, "", 0), options, out, stop)
+        pending = 1
+        while pending:
+            files, subdirs, done = out.get()
+            for sub in subdirs:
+                pool.submit(_walker, sub, options, out, stop)
+                pending += 1
+            pending -= done
+            yield from files
+    finally:
+        # Also runs when the caller stops early: release blocked walkers
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def scan_images(root, **options):
+    """
+    Recursively yield image paths under root (see scan_entries).
+    """
+    for entry in scan_entries(root, **options):
+        yield entry.path
@@ -0,0 +1,113 @@
+import piexif
+
+
+# IFDs whose tags make up the flat metadata dict (name clashes resolve
+# in this order, e.g. 0th ImageWidth wins over 1st ImageWidth)
+TABLE_IFDS = ("0th", "Exif", "GPS", "Interop", "1st")
+
+TYPE_BYTE = piexif.TYPES.Byte
+TYPE_ASCII = piexif.TYPES.Ascii
+TYPE_RATIONAL = piexif.TYPES.Rational
+TYPE_UNDEFINED = piexif.TYPES.Undefined
+TYPE_SRATIONAL = piexif.TYPES.SRational
+
+
+# -------------------------------------------------
+# NORMALIZERS (raw piexif value → JSON friendly value)
+# -------------------------------------------------
+def _identity(val):
+    return val
+
+
+def _ascii(val):
+    """
+    b"Canon\\x00" → "Canon"
+    """
+    if val.__class__ is bytes:
+        return val.decode("utf-8", "ignore").rstrip("\x00")
+    return val
+
+
+def _rational(val):
+    """
+    (num, den) → float, ((n, d), ...) → [float, ...];
+    a zero denominator (corrupt value) becomes None.
+    Signed rationals arrive already signed, so both types share this.
+    """
+    if val.__class__ is not tuple or not val:
+        return val
+    if val[0].__class__ is not tuple:
+        if len(val) != 2:
+            return val
+        num, den = val
+        return num / den if den else None
+    try:
+        return [num / den if den else None for num, den in val]
+    except (TypeError, ValueError):
+        return val
+
+
+def _undefined(val):
+    """
+    Printable UNDEFINED data (ExifVersion b"0230") → str,
+    binary data (ComponentsConfiguration, MakerNote) → hex string.
+    """
+    if val.__class__ is not bytes:
+        return val
+    text = val.rstrip(b"\x00").decode("latin-1")
+    return text if text.isprintable() and text.isascii() else val.hex()
+
+
+def _guess(val):
+    """
+    Fallback for tags missing from the table: same rules, picked by shape.
+    """
+    if val.__class__ is bytes:
+        return _ascii(val)
+    return _rational(val)
+
+
+TYPE_NORMALIZERS = {
+    TYPE_ASCII: _ascii,
+    TYPE_RATIONAL: _rational,
+    TYPE_SRATIONAL: _rational,
+    TYPE_UNDEFINED: _undefined,
+}
+
+
+# -------------------------------------------------
+# TABLES (built once at import)
+# -------------------------------------------------
+def _build_tables():
+    by_id = {}
+    by_ifd = {}
+    by_name = {}
+    for ifd in TABLE_IFDS:
+        by_ifd[ifd] = {}
+        for tag_id, info in piexif.TAGS[ifd].items():
+            entry = (info["name"], info["type"], TYPE_NORMALIZERS.get(info["type"], _identity))
+            by_id[(ifd, tag_id)] = by_ifd[ifd][tag_id] = entry
+            by_name.setdefault(entry[0], entry[2])
+    return by_id, by_ifd, by_name
+
+
+# (ifd, tag_id) → (name, type, normalizer)
+# IFD_TAGS[ifd][tag_id] holds the same entries for per-IFD loops
+TAG_TABLE, IFD_TAGS, _NAME_NORMALIZERS = _build_tables()
+
+
+def normalize_value(val, name=None):
+    """
+    Make a raw EXIF value JSON friendly, using the tag's declared type
+    when name is known: bytes → str, rationals → float (None when the
+    denominator is 0), rational arrays → [float, ...].
+    """
+    return _NAME_NORMALIZERS.get(name, _guess)(val)
+
+
+def normalize_metadata(metadata):
+    """
+    {tag name: raw value} → {tag name: normalized value}
+    """
+    get = _NAME_NORMALIZERS.get
+    return {name: get(name, _guess)(val) for name, val in metadata.items()}
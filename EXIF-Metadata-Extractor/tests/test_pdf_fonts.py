@@ -0,0 +1,204 @@
+"""
+Round trip for the embedded PDF font: subset a real TrueType font,
+write a report through pdf_report and read it back with pypdf.
+
+Needs a font that covers one of the sample texts (EXIF_PDF_FONT, the
+UNICODE_FONT_PATHS list or the usual system font folders) and pypdf;
+skipped otherwise.
+
+Usage: python -m pytest tests   (or python -m unittest discover tests)
+"""
+import glob
+import os
+import struct
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC)
+
+import pdf_fonts
+from pdf_fonts import TrueTypeFont, UNICODE_FONT_PATHS
+from pdf_report import export_metadata_pdf, UNICODE_FONT
+
+try:
+    from pypdf import PdfReader
+except ImportError:
+    PdfReader = None
+
+
+# Tried in order; the first one the font fully covers is used
+SAMPLE_TEXTS = (
+    "東京タワー 夜景",
+    "Съёмка на закате",
+    "Zażółć gęślą jaźń",
+)
+
+FONT_GLOBS = (
+    "/usr/share/fonts/**/*.tt[fc]",
+    "/usr/local/share/fonts/**/*.tt[fc]",
+    os.path.expanduser("~/.fonts/**/*.tt[fc]"),
+    os.path.expanduser("~/.local/share/fonts/**/*.tt[fc]"),
+    "/Library/Fonts/*.tt[fc]",
+    "/System/Library/Fonts/**/*.tt[fc]",
+    "C:/Windows/Fonts/*.tt[fc]",
+)
+
+
+def _candidate_paths():
+    override = os.environ.get("EXIF_PDF_FONT")
+    if override:
+        yield override
+    yield from UNICODE_FONT_PATHS
+    for pattern in FONT_GLOBS:
+        yield from sorted(glob.glob(pattern, recursive=True))
+
+
+def find_font():
+    """
+    (path, TrueTypeFont, text) for the first font that covers a sample text.
+    """
+    for path in _candidate_paths():
+        if not os.path.exists(path):
+            continue
+        try:
+            font = TrueTypeFont(path)
+        except (OSError, ValueError, KeyError, IndexError, struct.error):
+            continue
+        for text in SAMPLE_TEXTS:
+            if all(font.glyph(ch) for ch in text if not ch.isspace()):
+                return path, font, text
+    return None, None, None
+
+
+def read_tables(data):
+    """
+    {tag: table bytes} of a single TrueType file.
+    """
+    tables = {}
+    for i in range(struct.unpack_from(">H", data, 4)[0]):
+        tag, _, start, length = struct.unpack_from(">4sIII", data, 12 + 16 * i)
+        tables[tag.decode("latin-1")] = data[start:start + length]
+    return tables
+
+
+def subset_glyph(tables, gid):
+    """
+    Glyph data of a subset (always long loca offsets).
+    """
+    start, end = struct.unpack_from(">II", tables["loca"], 4 * gid)
+    return tables["glyf"][start:end]
+
+
+FONT_PATH, FONT, TEXT = find_font()
+
+
+@unittest.skipIf(FONT is None, "no TrueType font covering a sample text")
+class SubsetTest(unittest.TestCase):
+
+    def setUp(self):
+        self.gids = {FONT.glyph(ch) for ch in TEXT} - {0}
+        self.tables = read_tables(FONT.subset(self.gids))
+
+    def test_keeps_only_used_outlines(self):
+        # .notdef, the used glyphs and everything composites refer to
+        expected = {0}
+        todo = list(self.gids)
+        while todo:
+            gid = todo.pop()
+            if gid not in expected:
+                expected.add(gid)
+                todo.extend(FONT._components(FONT._glyph_data(gid)))
+
+        kept = set()
+        for gid in range(FONT.num_glyphs):
+            glyph = subset_glyph(self.tables, gid)
+            if glyph:
+                kept.add(gid)
+                # Subset glyphs are padded to 4 bytes
+                original = FONT._glyph_data(gid)
+                self.assertEqual(glyph[:len(original)], original, f"glyph {gid}")
+
+        # Blank glyphs (e.g. space) have no outline in either font
+        self.assertEqual(kept, {gid for gid in expected if FONT._glyph_data(gid)})
+
+    def test_glyph_ids_and_metrics_unchanged(self):
+        self.assertEqual(struct.unpack_from(">H", self.tables["maxp"], 4)[0], FONT.num_glyphs)
+        self.assertEqual(self.tables["hmtx"], FONT.tables["hmtx"])
+        self.assertEqual(struct.unpack_from(">h", self.tables["head"], 50)[0], 1)
+        self.assertEqual(len(self.tables["loca"]), 4 * (FONT.num_glyphs + 1))
+
+
+@unittest.skipIf(FONT is None, "no TrueType font covering a sample text")
+@unittest.skipIf(PdfReader is None, "pypdf is not installed")
+class PdfRoundTripTest(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".pdf")
+        os.close(handle)
+        with mock.patch.multiple(pdf_fonts, _unicode_font=FONT, _searched=True):
+            export_metadata_pdf(self.path, TEXT + ".jpg", {"Artist": TEXT, "Make": "Canon"})
+        self.reader = PdfReader(self.path)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def _font(self):
+        fonts = self.reader.pages[0]["/Resources"]["/Font"]
+        return fonts["/" + UNICODE_FONT].get_object()
+
+    def test_text_extracts(self):
+        text = "".join(page.extract_text() for page in self.reader.pages)
+        self.assertIn(TEXT, text)
+        self.assertIn("Canon", text)
+
+    def test_embedded_glyphs_match_font(self):
+        type0 = self._font()
+        self.assertEqual(type0["/Subtype"], "/Type0")
+        self.assertEqual(type0["/Encoding"], "/Identity-H")
+
+        cid_font = type0["/DescendantFonts"][0].get_object()
+        embedded = read_tables(cid_font["/FontDescriptor"]["/FontFile2"].get_data())
+        for ch in TEXT:
+            gid = FONT.glyph(ch)
+            original = FONT._glyph_data(gid)
+            self.assertEqual(subset_glyph(embedded, gid)[:len(original)], original, repr(ch))
+
+    def test_widths_match_font(self):
+        cid_font = self._font()["/DescendantFonts"][0].get_object()
+        widths = list(cid_font["/W"])
+        # "gid [width]" pairs
+        for gid, width in zip(widths[::2], widths[1::2]):
+            self.assertEqual(width[0], FONT.advance(gid))
+        # The file name column adds ".jpg" to the same font
+        self.assertTrue({FONT.glyph(ch) for ch in TEXT} - {0} <= set(widths[::2]))
+
+
+class UnicodeFontLookupTest(unittest.TestCase):
+
+    @unittest.skipIf(FONT is None, "no TrueType font covering a sample text")
+    def test_concurrent_callers_wait_for_search(self):
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+
+        def slow_load(path):
+            # Keep the search open long enough for the others to arrive
+            time.sleep(0.05)
+            return TrueTypeFont(path)
+
+        env = {"EXIF_PDF_FONT": FONT_PATH}
+        with mock.patch.dict(os.environ, env), \
+                mock.patch.multiple(pdf_fonts, _unicode_font=None, _searched=False,
+                                    TrueTypeFont=slow_load):
+            with ThreadPoolExecutor(8) as pool:
+                found = list(pool.map(lambda _: pdf_fonts.unicode_font(), range(32)))
+
+        # Nobody sees the search as done before the font is loaded
+        self.assertNotIn(None, found)
+        self.assertEqual(len({id(font) for font in found}), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()